@@ -1,47 +1,24 @@
-import pdfplumber
-import pytesseract
-import re  # ✅ FIXED: Import Regular Expressions
 import os
-from pdf2image import convert_from_path
+import ocr
+from pdf_text import extract_details_from_pages, iter_page_text
+from resume_details import extract_details  # Name, Email, Phone
 
 # Function to extract text using OCR (for scanned PDFs)
-def ocr_extract_text(pdf_path):
-    images = convert_from_path(pdf_path)
-    text = ""
-    for img in images:
-        text += pytesseract.image_to_string(img) + "\n"
-    return text
+# Only pages without a text layer are OCR'd, in parallel, and results are
+# cached by file hash (see ocr.py for OCR_DPI / OCR_LANG / OCR_WORKERS)
+def ocr_extract_text(pdf_path, page_texts=None):
+    return ocr.ocr_extract_text(pdf_path, page_texts=page_texts)
 
 # Function to extract text from a PDF (with OCR fallback)
 def extract_text_from_pdf(pdf_path):
-    with pdfplumber.open(pdf_path) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() + "\n" if page.extract_text() else ""
+    page_texts = list(iter_page_text(pdf_path))
 
-    # If no text was extracted, try OCR
-    if not text.strip():
-        print(f"🔍 Running OCR on {pdf_path} (Scanned PDF detected)")
-        text = ocr_extract_text(pdf_path)
+    # If some pages have no text layer, OCR just those pages
+    if not all(text.strip() for text in page_texts):
+        print(f"🔍 Running OCR on {pdf_path} (Scanned pages detected)")
+        return ocr_extract_text(pdf_path, page_texts)
 
-    return text
-
-# Function to extract Name, Email, Phone
-def extract_details(text):
-    email_pattern = r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+"
-    phone_pattern = r"\+?\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}"
-
-    email = re.findall(email_pattern, text)  # ✅ FIXED: re is now imported
-    phone = re.findall(phone_pattern, text)
-
-    name_lines = text.split("\n")[:5]
-    name = "N/A"
-    for line in name_lines:
-        if len(line.split()) >= 2:
-            name = line.strip()
-            break
-
-    return {"Name": name, "Email": email[0] if email else "N/A", "Phone": phone[0] if phone else "N/A"}
+    return "".join(text + "\n" for text in page_texts)
 
 # Function to extract details from all PDFs in a folder
 def extract_details_from_folder(folder_path):
@@ -60,18 +37,24 @@ def extract_details_from_folder(folder_path):
     extracted_data = []
     for file in pdf_files:
         file_path = os.path.join(folder_path, file)
-        pdf_text = extract_text_from_pdf(file_path)
-        details = extract_details(pdf_text)
+        # Read pages only until the details are settled
+        details, pdf_text = extract_details_from_pages(iter_page_text(file_path), extract_details)
+        if not pdf_text.strip():
+            print(f"🔍 Running OCR on {file_path} (Scanned PDF detected)")
+            details = extract_details(ocr_extract_text(file_path))
         extracted_data.append(details)
 
     print("✅ Extraction complete!")
     return extracted_data
 
-# Extract details from all resumes in 'Resume' folder
-resume_data = extract_details_from_folder("./Resume")
-
-# Print extracted data
-if resume_data:
-    for i, data in enumerate(resume_data, 1):
-        print(f"\n📄 Resume {i}:")
-        print(data)
+# Guarded so OCR worker processes can import this module without
+# re-running the folder scan
+if __name__ == "__main__":
+    # Extract details from all resumes in 'Resume' folder
+    resume_data = extract_details_from_folder("./Resume")
+
+    # Print extracted data
+    if resume_data:
+        for i, data in enumerate(resume_data, 1):
+            print(f"\n📄 Resume {i}:")
+            print(data)
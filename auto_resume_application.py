@@ -4,11 +4,43 @@ import os
 from email.header import decode_header
 import datetime
 from dotenv import load_dotenv
+from imap_incremental import IncrementalFetcher, MailboxState
 
 # Load environment variables
 load_dotenv()
 
-def fetch_attachments(email_address, password, search_criteria='(SUBJECT "Job Application")', folder="Resume"):
+def save_attachment(folder, filename, content):
+    """Save an attachment under a cleaned, timestamped filename"""
+    filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.'))
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    new_filename = f"{timestamp}_{filename}"
+    
+    filepath = os.path.join(folder, new_filename)
+    with open(filepath, "wb") as f:
+        f.write(content)
+    
+    print(f"Saved attachment: {new_filename}")
+    return filepath
+
+def fetch_new_attachments(mail, email_address, search_criteria, folder):
+    """
+    Save attachments only from messages that arrived since the last run.
+    
+    The last seen UID (and the mailbox UIDVALIDITY) is kept in
+    <folder>/imap_state.json, and only the attachment parts are downloaded.
+    """
+    state = MailboxState(os.path.join(folder, "imap_state.json"))
+    fetcher = IncrementalFetcher(mail, state, email_address, mailbox="inbox")
+    fetcher.select()
+    
+    saved = 0
+    for uid, filename, content in fetcher.iter_attachments(search_criteria):
+        save_attachment(folder, filename, content)
+        saved += 1
+    print(f"Saved {saved} attachments from new emails")
+
+def fetch_attachments(email_address, password, search_criteria='(SUBJECT "Job Application")', folder="Resume",
+                      incremental=False):
     """
     Fetch attachments from emails matching search criteria and save them to specified folder.
     
@@ -17,6 +49,7 @@ def fetch_attachments(email_address, password, search_criteria='(SUBJECT "Job Ap
     password (str): Your email password or app-specific password
     search_criteria (str): IMAP search criteria to filter emails
     folder (str): Local folder to save attachments
+    incremental (bool): Only look at emails newer than the last run
     """
     
     # Create folder if it doesn't exist
@@ -30,6 +63,12 @@ def fetch_attachments(email_address, password, search_criteria='(SUBJECT "Job Ap
         mail.login(email_address, password)
         print("Successfully logged in")
         
+        if incremental:
+            fetch_new_attachments(mail, email_address, search_criteria, folder)
+            mail.close()
+            mail.logout()
+            return
+        
         # Select inbox
         mail.select("inbox")
         print("Searching for matching emails...")
@@ -76,17 +115,7 @@ def fetch_attachments(email_address, password, search_criteria='(SUBJECT "Job Ap
                     filename = part.get_filename()
                     if filename:
                         attachments_found = True
-                        # Clean filename and add timestamp
-                        filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.'))
-                        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                        new_filename = f"{timestamp}_{filename}"
-                        
-                        # Save attachment
-                        filepath = os.path.join(folder, new_filename)
-                        with open(filepath, "wb") as f:
-                            f.write(part.get_payload(decode=True))
-                        
-                        print(f"Saved attachment: {new_filename}")
+                        save_attachment(folder, filename, part.get_payload(decode=True))
                 
                 if not attachments_found:
                     print("No attachments found in this email")
@@ -127,5 +156,6 @@ if __name__ == "__main__":
         email_address=EMAIL,
         password=PASSWORD,
         search_criteria=SEARCH_OPTIONS['job_applications'],  # Choose the search criteria you want
-        folder="Resume"
+        folder="Resume",
+        incremental=os.getenv("IMAP_INCREMENTAL", "true").lower() == "true"
     )
@@ -0,0 +1,123 @@
+"""Throughput benchmark for resume detail extraction
+
+Compares resume_details.extract_details / extract_details_batch against the
+per-module implementations they replaced (copied verbatim below), and checks
+that every implementation returns the same answers.
+
+    python benchmarks/bench_details.py --resumes 5000 --workers 4
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_details import PHONE_AREA_CODE_RE, extract_details, extract_details_batch  # noqa: E402
+
+
+# -- previous implementations (final.py / Extract.py / drive_to_sheet.py) -------
+
+def legacy_extract_details(text):
+    email_pattern = r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+"
+    phone_pattern = r"\+?\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}"
+
+    email = re.findall(email_pattern, text)
+    phone = re.findall(phone_pattern, text)
+
+    name_lines = text.split("\n")[:5]
+    name = "N/A"
+    for line in name_lines:
+        if len(line.split()) >= 2:
+            name = line.strip()
+            break
+
+    return {"Name": name, "Email": email[0] if email else "N/A", "Phone": phone[0] if phone else "N/A"}
+
+
+# -- previous implementation (notification.py) ------------------------------------
+
+def legacy_extract_details_notification(text):
+    email_pattern = r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+"
+    phone_pattern = r"\+?\d{1,3}[-.\s]?\(?\d{2,5}\)?[-.\s]?\d{3,4}[-.\s]?\d{3,4}"
+
+    email = re.findall(email_pattern, text)
+    phone = re.findall(phone_pattern, text)
+
+    name = "N/A"
+    name_lines = text.split("\n")[:5]
+    for line in name_lines:
+        words = line.strip().split()
+        if len(words) >= 2 and all(w[0].isupper() for w in words if w.isalpha()):
+            if "Resume" not in line and "Curriculum Vitae" not in line:
+                name = line.strip()
+                break
+
+    return {"Name": name, "Email": email[0] if email else "N/A", "Phone": phone[0] if phone else "N/A"}
+
+
+def extract_details_notification(text):
+    return extract_details(text, phone_re=PHONE_AREA_CODE_RE, strict_name=True)
+
+
+# -- synthetic corpus ----------------------------------------------------------
+
+FIRST = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Lucas", "Ananya", "Omar", "Sofia"]
+LAST = ["Sharma", "Patel", "Smith", "Garcia", "Chen", "Khan", "Müller", "Iyer", "Haddad", "Rossi"]
+FILLER = ("Designed and shipped data pipelines processing 2.5M events/day with Python and SQL. "
+          "Led a team of 4 engineers; reduced p99 latency by 38% across 12 services. ")
+
+
+def make_resume(rng, body_lines):
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    user = name.lower().replace(" ", ".")
+    if rng.random() < 0.7:
+        phone = f"+1 {rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+    else:  # not matched by the default pattern, so the whole text is scanned
+        phone = f"+91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}"
+    lines = [name, "Software Engineer", f"Email: {user}@example.com | Phone: {phone}"]
+    lines += [FILLER * rng.randint(1, 3) for _ in range(body_lines)]
+    if rng.random() < 0.1:
+        lines.insert(0, "Curriculum Vitae")
+    return "\n".join(lines)
+
+
+def run(label, fn, texts):
+    start = time.perf_counter()
+    results = fn(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<42} {len(texts) / elapsed:>12,.0f} resumes/s   {elapsed * 1000:>9.1f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--body-lines", type=int, default=60, help="filler lines per resume")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [make_resume(rng, args.body_lines) for _ in range(args.resumes)]
+    avg_kb = sum(map(len, texts)) / len(texts) / 1024
+    print(f"Corpus: {len(texts)} resumes, {avg_kb:.1f} KB average\n")
+
+    expected = run("legacy extract_details", lambda t: [legacy_extract_details(x) for x in t], texts)
+    got = run("resume_details.extract_details", lambda t: [extract_details(x) for x in t], texts)
+    batch = run(f"extract_details_batch ({args.workers} workers)",
+                lambda t: extract_details_batch(t, max_workers=args.workers), texts)
+    expected_n = run("legacy notification.extract_details",
+                     lambda t: [legacy_extract_details_notification(x) for x in t], texts)
+    got_n = run("resume_details (notification options)",
+                lambda t: [extract_details_notification(x) for x in t], texts)
+
+    assert got == expected and batch == expected, "default extractor disagrees with the legacy one"
+    assert got_n == expected_n, "notification extractor disagrees with the legacy one"
+    print("\n✅ All implementations returned identical results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Extraction benchmark over a synthetic resume corpus
+
+Runs the PDF extraction paths over every kind of synthetic resume (see
+synthetic_corpus.py) and reports, per kind and path: per-file latency
+percentiles, document pages per second, peak RSS and accuracy of the
+extracted Name / Email / Phone against the corpus ground truth.
+
+Paths:
+    text     pdf_text.extract_text (full text layer; what the processor's
+             extract_text_from_pdf returns)
+    details  early-exit extract_details_from_pages + resume_details
+    ocr      Extract-style OCR fallback for scanned PDFs (needs tesseract
+             and poppler; skipped otherwise). A fresh OCR cache is used for
+             every file, so OCR always runs
+
+Every (kind, path) case runs in a fresh process, so peak RSS is that case's
+own high-water mark.
+
+    python benchmarks/bench_extraction.py --count 20 --json results.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic_corpus import KINDS, build_corpus  # noqa: E402
+
+FIELDS = ("Name", "Email", "Phone")
+PATHS = {
+    "single": ("text", "details"),
+    "multi": ("text", "details"),
+    "large": ("text", "details"),
+    "scanned": ("details", "ocr"),
+}
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def ocr_available():
+    try:
+        import pdf2image  # noqa: F401
+        import pytesseract  # noqa: F401
+    except ImportError:
+        return False
+    return bool(shutil.which("tesseract") and shutil.which("pdftoppm"))
+
+
+def run_case(path_name, files, repeat):
+    """Runs inside a fresh process: [(seconds, details or None)] per file, and peak RSS"""
+    from pdf_text import extract_details_from_pages, extract_text, iter_page_text
+    from resume_details import extract_details
+
+    if path_name == "ocr":
+        import ocr
+
+    def one(file_path):
+        if path_name == "text":
+            extract_text(file_path)
+            return None
+        if path_name == "details":
+            details, _ = extract_details_from_pages(iter_page_text(file_path), extract_details)
+            return details
+        page_texts = list(iter_page_text(file_path))
+        with tempfile.TemporaryDirectory() as cache_dir:
+            text = ocr.ocr_extract_text(file_path, page_texts, cache=ocr.OCRCache(cache_dir))
+        return extract_details(text)
+
+    baseline = _peak_rss_mb()
+    results = []
+    for file_path in files:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            details = one(file_path)
+            timings.append(time.perf_counter() - start)
+        results.append((min(timings), details))  # best of repeat: least noise
+    return results, baseline, _peak_rss_mb()
+
+
+def percentile(sorted_values, q):
+    index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(kind, path_name, entries, results, rss_before, rss_peak):
+    latencies = sorted(seconds for seconds, _ in results)
+    pages = sum(entry["pages"] for entry in entries)
+    row = {
+        "kind": kind,
+        "path": path_name,
+        "files": len(entries),
+        "pages": pages,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "pages_per_sec": pages / sum(latencies),
+        "rss_baseline_mb": rss_before,
+        "rss_peak_mb": rss_peak,
+    }
+    if results[0][1] is not None:
+        for field in FIELDS:
+            hits = sum(details[field] == entry[field] for entry, (_, details) in zip(entries, results))
+            row[f"{field.lower()}_accuracy"] = hits / len(entries)
+    return row
+
+
+def print_table(rows):
+    print(f"{'kind':<8} {'path':<8} {'files':>5} {'pages':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'pages/s':>8} {'peak MB':>8}   accuracy (name/email/phone)")
+    for row in rows:
+        accuracy = "-"
+        if "name_accuracy" in row:
+            accuracy = " / ".join(f"{row[f'{field.lower()}_accuracy']:.0%}" for field in FIELDS)
+        print(f"{row['kind']:<8} {row['path']:<8} {row['files']:>5} {row['pages']:>6} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+              f"{row['pages_per_sec']:>8.1f} {row['rss_peak_mb']:>8.1f}   {accuracy}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="corpus directory (built there if it has no ground_truth.json; "
+                                         "a temporary one otherwise)")
+    parser.add_argument("--count", type=int, default=20, help="resumes per kind when building the corpus")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--paths", nargs="+", choices=("text", "details", "ocr"), default=["text", "details", "ocr"])
+    parser.add_argument("--repeat", type=int, default=1, help="runs per file; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the results here, for comparing runs")
+    args = parser.parse_args()
+
+    temp_dir = None
+    corpus = args.corpus
+    if corpus is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        corpus = temp_dir.name
+    truth_path = os.path.join(corpus, "ground_truth.json")
+    if os.path.exists(truth_path):
+        with open(truth_path) as f:
+            truth = json.load(f)
+    else:
+        print(f"📂 Building corpus in {corpus} (seed {args.seed})...")
+        truth = build_corpus(corpus, args.count, args.kinds, args.seed)
+
+    paths = list(args.paths)
+    if "ocr" in paths and not ocr_available():
+        print("⚠️ tesseract / poppler not found; skipping the ocr path")
+        paths.remove("ocr")
+
+    # A fresh interpreter per case keeps peak RSS figures independent
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for kind in args.kinds:
+        entries = [entry for entry in truth if entry["kind"] == kind]
+        if not entries:
+            continue
+        for path_name in PATHS[kind]:
+            if path_name not in paths:
+                continue
+            files = [os.path.join(corpus, entry["file"]) for entry in entries]
+            with context.Pool(1) as pool:
+                results, rss_before, rss_peak = pool.apply(run_case, (path_name, files, args.repeat))
+            rows.append(summarize(kind, path_name, entries, results, rss_before, rss_peak))
+
+    print()
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seed": args.seed, "repeat": args.repeat, "results": rows}, f, indent=2)
+        print(f"\n📝 Results written to {args.json}")
+
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""Local stand-ins for Gmail IMAP, Google Drive and Google Sheets
+
+Used by load_test.py to drive the real ResumeProcessor without touching
+Google. The Drive and Sheets stubs add configurable latency and quota
+errors so retry and batching behaviour shows up in the numbers.
+
+FakeIMAPServer speaks just enough plain-text IMAP4rev1 for imaplib and the
+processor: LOGIN, SELECT (with UIDVALIDITY), SEARCH / UID SEARCH with
+SUBJECT and UID ranges, FETCH RFC822, UID FETCH BODYSTRUCTURE and
+BODY.PEEK[n], CLOSE, LOGOUT.
+"""
+import base64
+import itertools
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import httplib2
+from googleapiclient.errors import HttpError
+from gspread.exceptions import APIError
+
+
+class Faults:
+    """Latency and error injection shared by the Drive and Sheets stubs
+
+    Every call sleeps latency seconds (+/- jitter, as a fraction) and then
+    fails with a quota error with probability error_rate.
+    """
+
+    def __init__(self, latency=0.05, jitter=0.5, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def hit(self):
+        """Simulate one round trip; True if it should fail with a quota error"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * (1 + self.jitter * (2 * self._rng.random() - 1))
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        time.sleep(max(delay, 0))
+        return fail
+
+
+# -- IMAP -------------------------------------------------------------------------
+
+class Mailbox:
+    """Thread-safe message store; each message gets the next UID"""
+
+    def __init__(self, uidvalidity=1):
+        self.uidvalidity = uidvalidity
+        self._lock = threading.Lock()
+        self._messages = []  # (uid, subject, raw bytes, attachment parts)
+        self._next_uid = itertools.count(1)
+        self.arrivals = {}  # applicant email -> time the message landed
+
+    def add(self, subject, body, attachments, applicant_email=None):
+        """Store a message with (filename, pdf bytes) attachments; returns its UID"""
+        message = MIMEMultipart()
+        message["Subject"] = subject
+        message["From"] = "candidate@example.com"
+        message["To"] = "jobs@example.com"
+        message.attach(MIMEText(body, "plain"))
+        parts = []
+        for filename, content in attachments:
+            part = MIMEApplication(content, _subtype="pdf", Name=filename)
+            part["Content-Disposition"] = f'attachment; filename="{filename}"'
+            message.attach(part)
+            parts.append((filename, base64.encodebytes(content)))
+        raw = message.as_bytes()
+        with self._lock:
+            uid = next(self._next_uid)
+            self._messages.append((uid, subject, raw, body, parts))
+            if applicant_email:
+                self.arrivals[applicant_email] = time.monotonic()
+        return uid
+
+    def messages(self):
+        with self._lock:
+            return list(self._messages)
+
+
+def _bodystructure(body, parts):
+    text = f'("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" {len(body)} {body.count(chr(10)) + 1} NIL NIL NIL NIL)'
+    attachments = "".join(
+        f'("APPLICATION" "PDF" ("NAME" "{name}") NIL NIL "BASE64" {len(encoded)} NIL '
+        f'("ATTACHMENT" ("FILENAME" "{name}")) NIL NIL)'
+        for name, encoded in parts
+    )
+    return f'({text}{attachments} "MIXED" ("BOUNDARY" "fake") NIL NIL NIL)'
+
+
+class _IMAPHandler(socketserver.StreamRequestHandler):
+    def send(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def send_literal(self, prefix, data, suffix=")"):
+        self.wfile.write(f"{prefix} {{{len(data)}}}\r\n".encode() + data + suffix.encode() + b"\r\n")
+
+    def handle(self):
+        mailbox = self.server.mailbox
+        self.send("* OK [CAPABILITY IMAP4rev1] fake IMAP ready")
+        for raw_line in self.rfile:
+            line = raw_line.decode(errors="replace").rstrip("\r\n")
+            if not line:
+                continue
+            tag, _, rest = line.partition(" ")
+            command, _, args = rest.partition(" ")
+            command = command.upper()
+            use_uid = command == "UID"
+            if use_uid:
+                command, _, args = args.partition(" ")
+                command = command.upper()
+
+            if command == "CAPABILITY":
+                self.send("* CAPABILITY IMAP4rev1")
+            elif command == "LOGIN":
+                pass
+            elif command in ("SELECT", "EXAMINE"):
+                messages = mailbox.messages()
+                self.send(f"* {len(messages)} EXISTS")
+                self.send(f"* OK [UIDVALIDITY {mailbox.uidvalidity}] UIDs valid")
+                self.send(f"{tag} OK [READ-WRITE] SELECT completed")
+                continue
+            elif command == "SEARCH":
+                self.send("* SEARCH " + " ".join(str(n) for n in self._search(args, use_uid)))
+            elif command == "FETCH":
+                self._fetch(args, use_uid)
+            elif command == "LOGOUT":
+                self.send("* BYE fake IMAP closing")
+                self.send(f"{tag} OK LOGOUT completed")
+                return
+            elif command not in ("CLOSE", "NOOP"):
+                self.send(f"{tag} BAD unsupported command")
+                continue
+            self.send(f"{tag} OK {command} completed")
+
+    def _search(self, args, use_uid):
+        subject = re.search(r'SUBJECT "([^"]*)"', args, re.I)
+        uid_range = re.search(r"UID (\d+):(\*|\d+)", args, re.I)
+        found = []
+        messages = self.server.mailbox.messages()
+        for seq, (uid, msg_subject, *_rest) in enumerate(messages, 1):
+            if subject and subject.group(1).lower() not in msg_subject.lower():
+                continue
+            if uid_range:
+                low = int(uid_range.group(1))
+                high = messages[-1][0] if uid_range.group(2) == "*" else int(uid_range.group(2))
+                if not (low <= uid <= high or (uid_range.group(2) == "*" and uid == messages[-1][0])):
+                    continue
+            found.append(uid if use_uid else seq)
+        return found
+
+    def _fetch(self, args, use_uid):
+        which, _, items = args.partition(" ")
+        messages = self.server.mailbox.messages()
+        by_key = {(uid if use_uid else seq): (seq, uid, raw, body, parts)
+                  for seq, (uid, _, raw, body, parts) in enumerate(messages, 1)}
+        entry = by_key.get(int(which))
+        if entry is None:
+            return
+        seq, uid, raw, body, parts = entry
+        items = items.upper()
+        if "BODYSTRUCTURE" in items:
+            self.send(f"* {seq} FETCH (UID {uid} BODYSTRUCTURE {_bodystructure(body, parts)})")
+        elif "BODY.PEEK[" in items:
+            section = int(re.search(r"BODY\.PEEK\[(\d+)\]", items).group(1))
+            data = body.encode() if section == 1 else parts[section - 2][1]
+            self.send_literal(f"* {seq} FETCH (UID {uid} BODY[{section}]", data)
+        elif "RFC822" in items:
+            self.send_literal(f"* {seq} FETCH (UID {uid} RFC822", raw)
+
+
+class FakeIMAPServer(socketserver.ThreadingTCPServer):
+    """Plain-text IMAP server on localhost serving one Mailbox"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, mailbox, host="127.0.0.1", port=0):
+        super().__init__((host, port), _IMAPHandler)
+        self.mailbox = mailbox
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="fake-imap", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+# -- Drive ------------------------------------------------------------------------
+
+def _http_error(status, reason):
+    content = json.dumps({"error": {"code": status, "message": reason,
+                                    "errors": [{"reason": "rateLimitExceeded"}]}}).encode()
+    return HttpError(httplib2.Response({"status": status}), content)
+
+
+class _Request:
+    """Stand-in for googleapiclient's HttpRequest"""
+
+    def __init__(self, drive, fn):
+        self._drive = drive
+        self._fn = fn
+
+    def _attempt(self):
+        if self._drive.faults.hit():
+            raise _http_error(429, "Rate Limit Exceeded")
+        return self._fn()
+
+    def execute(self, num_retries=0):
+        # Same retry policy as googleapiclient: random() * 2**n seconds
+        for attempt in range(num_retries + 1):
+            try:
+                return self._attempt()
+            except HttpError:
+                if attempt == num_retries:
+                    raise
+                time.sleep(random.random() * 2 ** attempt * self._drive.backoff_scale)
+
+    def next_chunk(self, num_retries=0):
+        return None, self.execute(num_retries)
+
+
+class _Batch:
+    def __init__(self, drive, callback):
+        self._drive = drive
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None):
+        self._requests.append((request_id or str(len(self._requests)), request))
+
+    def execute(self):
+        self._drive.faults.hit()  # one round trip for the whole batch
+        for request_id, request in self._requests:
+            if self._drive.faults.error_rate and random.random() < self._drive.faults.error_rate:
+                self._callback(request_id, None, _http_error(429, "Rate Limit Exceeded"))
+            else:
+                self._callback(request_id, request._fn(), None)
+
+
+class FakeDrive:
+    """In-memory Drive folder implementing the calls the processor makes"""
+
+    def __init__(self, faults=None, backoff_scale=1.0):
+        self.faults = faults or Faults()
+        self.backoff_scale = backoff_scale
+        self._lock = threading.Lock()
+        self._files = {}  # id -> resource
+        self._ids = itertools.count(1)
+        self.bytes_uploaded = 0
+
+    def service(self):
+        """Client factory for ResumeProcessor(drive_service_factory=...)"""
+        return _DriveService(self)
+
+    def _create(self, body, media_body):
+        with self._lock:
+            file_id = f"fake{next(self._ids)}"
+            resource = {
+                "id": file_id,
+                "name": body.get("name"),
+                "parents": body.get("parents", []),
+                "properties": body.get("properties", {}),
+                "trashed": False,
+                "webViewLink": f"https://drive.example/{file_id}",
+            }
+            self._files[file_id] = resource
+            size = media_body.size() if media_body is not None else 0
+            self.bytes_uploaded += size or 0
+            return {"id": file_id, "webViewLink": resource["webViewLink"]}
+
+    def _list(self, q):
+        folder = re.search(r"'([^']+)' in parents", q or "")
+        file_hash = re.search(r"value='([^']+)'", q or "")
+        name = re.search(r"name='([^']+)'", q or "")
+        with self._lock:
+            files = [
+                dict(f) for f in self._files.values()
+                if not f["trashed"]
+                and (not folder or folder.group(1) in f["parents"])
+                and (not file_hash or f["properties"].get("file_hash") == file_hash.group(1))
+                and (not name or f["name"] == name.group(1))
+            ]
+        return {"files": files}
+
+
+class _DriveService:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def files(self):
+        return _Files(self._drive)
+
+    def changes(self):
+        return _Changes(self._drive)
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self._drive, callback)
+
+
+class _Files:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def create(self, body=None, media_body=None, fields=None, **kwargs):
+        return _Request(self._drive, lambda: self._drive._create(body or {}, media_body))
+
+    def list(self, q=None, **kwargs):
+        return _Request(self._drive, lambda: self._drive._list(q))
+
+
+class _Changes:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def getStartPageToken(self, **kwargs):
+        return _Request(self._drive, lambda: {"startPageToken": "1"})
+
+    def list(self, pageToken=None, **kwargs):
+        return _Request(self._drive, lambda: {"changes": [], "newStartPageToken": "1"})
+
+
+# -- Sheets -----------------------------------------------------------------------
+
+class _QuotaResponse:
+    status_code = 429
+    text = "Quota exceeded"
+
+    def json(self):
+        return {"error": {"code": 429, "message": "Quota exceeded for quota metric 'Write requests'",
+                          "status": "RESOURCE_EXHAUSTED"}}
+
+
+class FakeWorksheet:
+    """The gspread Worksheet calls the processor makes, on an in-memory grid
+
+    row_times records when each appended row became visible, for
+    email-to-row latency.
+    """
+
+    def __init__(self, faults=None):
+        self.faults = faults or Faults()
+        self._lock = threading.Lock()
+        self.rows = []
+        self.row_times = []
+
+    def _call(self):
+        if self.faults.hit():
+            raise APIError(_QuotaResponse())
+
+    def row_values(self, row):
+        self._call()
+        with self._lock:
+            return list(self.rows[row - 1]) if len(self.rows) >= row else []
+
+    def col_values(self, col):
+        self._call()
+        with self._lock:
+            return [row[col - 1] if len(row) >= col else "" for row in self.rows]
+
+    def get_all_values(self):
+        self._call()
+        with self._lock:
+            return [list(row) for row in self.rows]
+
+    def insert_row(self, values, index=1):
+        self._call()
+        with self._lock:
+            self.rows.insert(index - 1, list(values))
+            self.row_times.insert(index - 1, time.monotonic())
+
+    def append_rows(self, rows, **kwargs):
+        self._call()
+        now = time.monotonic()
+        with self._lock:
+            for row in rows:
+                self.rows.append(list(row))
+                self.row_times.append(now)
+
+    def append_row(self, values, **kwargs):
+        self.append_rows([values])
@@ -0,0 +1,221 @@
+"""End-to-end load test of ResumeProcessor against local fakes
+
+Seeds a local IMAP server with synthetic "Job Application" emails (one
+generated resume PDF each), then runs the real ResumeProcessor, in batch
+mode (fetch + process_resumes, as final.main does) or pipeline mode, with
+in-process Drive and Sheets stubs that add latency and quota errors. See
+fake_services.py.
+
+Reports throughput and p50/p95/p99 email-to-row latency: the time from a
+message landing in the mailbox to its applicant's row being written to the
+sheet (or to the local applicant table with --applicant-backend sqlite).
+With --rate the emails arrive over time and the processor polls
+every --poll-interval seconds; without it they all arrive at once, like a
+hiring spike.
+
+    python benchmarks/load_test.py --emails 200 --workers 8 --drive-errors 0.02
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_services import FakeDrive, FakeIMAPServer, FakeWorksheet, Faults, Mailbox  # noqa: E402
+from synthetic_corpus import make_resume, write_pdf  # noqa: E402
+
+SUBJECT = "Job Application"
+
+
+def generate_resumes(count, seed, work_dir):
+    """[(applicant email, filename, pdf bytes)] with unique applicant emails"""
+    rng = random.Random(seed)
+    resumes, seen = [], set()
+    path = os.path.join(work_dir, "resume.pdf")
+    while len(resumes) < count:
+        pages, truth = make_resume(rng, rng.choice(["single", "single", "multi"]))
+        if truth["Email"] in seen:
+            continue
+        seen.add(truth["Email"])
+        write_pdf(path, pages)
+        with open(path, "rb") as f:
+            resumes.append((truth["Email"], f"{truth['Name'].replace(' ', '_')}_CV.pdf", f.read()))
+    os.remove(path)
+    return resumes
+
+
+def seed_mailbox(mailbox, resumes, rate):
+    """Deliver every resume as an email, all at once or at rate emails/s"""
+    for i, (email, filename, content) in enumerate(resumes):
+        if rate and i:
+            time.sleep(1 / rate)
+        mailbox.add(f"{SUBJECT} - {filename}", "Please find my resume attached.",
+                    [(filename, content)], applicant_email=email)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", type=int, default=100)
+    parser.add_argument("--mode", choices=("batch", "pipeline"), default="batch")
+    parser.add_argument("--workers", type=int, default=4, help="MAX_WORKERS for the processor")
+    parser.add_argument("--rate", type=float, default=0, help="emails per second (0: all at once)")
+    parser.add_argument("--poll-interval", type=float, default=5, help="seconds between polls with --rate")
+    parser.add_argument("--drive-latency", type=float, default=0.15, help="seconds per Drive call")
+    parser.add_argument("--drive-errors", type=float, default=0.0, help="fraction of Drive calls rate-limited")
+    parser.add_argument("--sheets-latency", type=float, default=0.3, help="seconds per Sheets call")
+    parser.add_argument("--sheets-errors", type=float, default=0.0, help="fraction of Sheets calls rate-limited")
+    parser.add_argument("--backoff-scale", type=float, default=0.1,
+                        help="scale of the client retry backoff in the Drive stub (1 = real)")
+    parser.add_argument("--sheet-batch", type=int, default=50, help="SHEET_BATCH_SIZE")
+    parser.add_argument("--sheet-flush", type=float, default=2, help="SHEET_FLUSH_SECONDS")
+    parser.add_argument("--blob-backend", choices=("drive", "local"), default="drive", help="BLOB_BACKEND")
+    parser.add_argument("--applicant-backend", choices=("sheets", "sqlite", "sqlite+sheets"), default="sheets",
+                        help="APPLICANT_BACKEND")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the report here")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="resume-load-")
+    print(f"📂 Generating {args.emails} resumes in {work_dir}...")
+    resumes = generate_resumes(args.emails, args.seed, work_dir)
+
+    mailbox = Mailbox()
+    imap = FakeIMAPServer(mailbox).start()
+    drive = FakeDrive(Faults(args.drive_latency, error_rate=args.drive_errors, seed=args.seed),
+                      backoff_scale=args.backoff_scale)
+    sheet = FakeWorksheet(Faults(args.sheets_latency, error_rate=args.sheets_errors, seed=args.seed + 1))
+
+    # Point the processor at the fakes; set explicitly so a local .env can't leak in
+    os.environ.update({
+        "LOCAL_FOLDER": os.path.join(work_dir, "Resume"),
+        "DRIVE_FOLDER_ID": "load-test-folder",
+        "SHEET_ID": "load-test-sheet",
+        "IMAP_HOST": "127.0.0.1",
+        "IMAP_PORT": str(imap.port),
+        "IMAP_SSL": "false",
+        "MAX_WORKERS": str(args.workers),
+        "SHEET_BATCH_SIZE": str(args.sheet_batch),
+        "SHEET_FLUSH_SECONDS": str(args.sheet_flush),
+        "METRICS_DIR": os.path.join(work_dir, "metrics"),
+        "BLOB_BACKEND": args.blob_backend,
+        "APPLICANT_BACKEND": args.applicant_backend,
+        "STORE_DIR": os.path.join(work_dir, "store"),
+        "SHEET_MIRROR_SECONDS": str(args.sheet_flush),
+    })
+    os.makedirs(os.environ["LOCAL_FOLDER"], exist_ok=True)
+    for key in ("METRICS_PORT", "METRICS_TEXTFILE"):
+        os.environ.pop(key, None)
+
+    from final import ResumeProcessor
+    from metrics import REGISTRY
+
+    REGISTRY.start_run()
+    processor = ResumeProcessor(drive_service_factory=drive.service, sheet=sheet)
+
+    seeder = threading.Thread(target=seed_mailbox, args=(mailbox, resumes, args.rate), daemon=True)
+    seeder.start()
+    if not args.rate:
+        seeder.join()
+
+    def run_once():
+        if args.mode == "pipeline":
+            from pipeline import ResumePipeline
+            ResumePipeline(processor).run("loadtest@example.com", "secret", f'(SUBJECT "{SUBJECT}")')
+        else:
+            files = processor.fetch_email_attachments("loadtest@example.com", "secret", f'(SUBJECT "{SUBJECT}")')
+            if files:
+                processor.process_resumes(files)
+
+    start = time.monotonic()
+    try:
+        while True:
+            run_once()
+            delivered = not seeder.is_alive() and len(mailbox.messages()) == len(resumes)
+            if delivered or time.monotonic() - start > args.timeout:
+                if delivered:
+                    run_once()  # pick up anything that landed during the last poll
+                break
+            time.sleep(args.poll_interval)
+    finally:
+        try:
+            processor.close()
+        except Exception as e:
+            print(f"❌ Final sheet flush failed: {str(e)}")
+        imap.stop()
+
+    # -- report -----------------------------------------------------------------
+    landed = {}
+    if args.applicant_backend == "sqlite":
+        import sqlite3
+        clock_offset = time.time() - time.monotonic()  # created_at is wall-clock time
+        db = sqlite3.connect(os.path.join(os.environ["STORE_DIR"], "applicants.sqlite3"))
+        for email, created_at in db.execute("SELECT email, created_at FROM applicants"):
+            if email in mailbox.arrivals:
+                landed[email] = created_at - clock_offset
+        db.close()
+    else:
+        for row, row_time in zip(sheet.rows[1:], sheet.row_times[1:]):
+            if len(row) > 1 and row[1] in mailbox.arrivals:
+                landed[row[1]] = row_time
+    latencies = sorted(landed[email] - mailbox.arrivals[email] for email in landed)
+    first_arrival = min(mailbox.arrivals.values())
+    wall = (max(landed.values()) - first_arrival) if landed else float("nan")
+    summary = REGISTRY.summary()
+
+    report = {
+        "mode": args.mode,
+        "blob_backend": args.blob_backend,
+        "applicant_backend": args.applicant_backend,
+        "workers": args.workers,
+        "emails": len(resumes),
+        "rows": len(landed),
+        "missing": len(resumes) - len(landed),
+        "wall_seconds": wall,
+        "rows_per_second": len(landed) / wall if landed else 0,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "latency_max": latencies[-1] if latencies else float("nan"),
+        "drive_calls": drive.faults.calls,
+        "drive_errors": drive.faults.errors,
+        "sheets_calls": sheet.faults.calls,
+        "sheets_errors": sheet.faults.errors,
+        "events": summary["events"],
+        "stages": {stage: {"p50": s["p50"], "p95": s["p95"], "count": s["count"]}
+                   for stage, s in summary["stages"].items()},
+    }
+
+    print(f"\n📊 {report['mode']} mode, {report['workers']} workers, "
+          f"{args.blob_backend} blobs, {args.applicant_backend} applicants: "
+          f"{report['rows']}/{report['emails']} rows in {wall:.1f}s ({report['rows_per_second']:.2f} rows/s)")
+    print(f"   email-to-row latency  p50 {report['latency_p50']:.2f}s   p95 {report['latency_p95']:.2f}s   "
+          f"p99 {report['latency_p99']:.2f}s   max {report['latency_max']:.2f}s")
+    print(f"   Drive  {drive.faults.calls} calls, {drive.faults.errors} rate-limited")
+    print(f"   Sheets {sheet.faults.calls} calls, {sheet.faults.errors} rate-limited")
+    print("   stage p50 / p95 (s): " + ", ".join(
+        f"{stage} {s['p50']:.3f}/{s['p95']:.3f}" for stage, s in sorted(report["stages"].items())))
+    if report["missing"]:
+        print(f"⚠️ {report['missing']} applicants never reached the sheet")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
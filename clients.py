@@ -0,0 +1,72 @@
+"""Process-wide Google API clients, created on first use
+
+Importing this module is free: google-auth, googleapiclient and gspread are
+only imported when a client is first asked for. Each service account file
+is read once per process and its credentials (and their access tokens) are
+shared by every client built from it, so a run that finds no new mail never
+authenticates, and a long-running process authenticates once.
+"""
+import json
+import threading
+
+CREDENTIALS_FILE = "credentials.json"
+DRIVE_SCOPES = ("https://www.googleapis.com/auth/drive",)
+SHEETS_SCOPES = ("https://www.googleapis.com/auth/spreadsheets",)
+
+_lock = threading.RLock()
+_service_accounts = {}  # path -> parsed service account JSON
+_credentials = {}  # (path, scopes) -> Credentials
+_gspread_clients = {}  # (path, scopes) -> gspread.Client
+_worksheets = {}  # (path, sheet_id) -> first worksheet
+_thread_local = threading.local()  # Drive clients: httplib2 is not thread-safe
+
+
+def credentials(scopes, path=CREDENTIALS_FILE):
+    """Service account credentials for scopes, parsed from path once per process"""
+    key = (path, tuple(scopes))
+    with _lock:
+        creds = _credentials.get(key)
+        if creds is None:
+            from google.oauth2.service_account import Credentials
+
+            info = _service_accounts.get(path)
+            if info is None:
+                with open(path) as f:
+                    info = _service_accounts[path] = json.load(f)
+            creds = _credentials[key] = Credentials.from_service_account_info(info, scopes=list(scopes))
+        return creds
+
+
+def new_drive_service(path=CREDENTIALS_FILE, scopes=DRIVE_SCOPES):
+    """A new Drive v3 client (the discovery document ships with the library)"""
+    from googleapiclient.discovery import build
+
+    return build("drive", "v3", credentials=credentials(scopes, path))
+
+
+def drive_service(path=CREDENTIALS_FILE, scopes=DRIVE_SCOPES):
+    """The calling thread's Drive v3 client, built on first use"""
+    services = getattr(_thread_local, "drive", None)
+    if services is None:
+        services = _thread_local.drive = {}
+    key = (path, tuple(scopes))
+    if key not in services:
+        services[key] = new_drive_service(path, scopes)
+    return services[key]
+
+
+def worksheet(sheet_id, path=CREDENTIALS_FILE, scopes=SHEETS_SCOPES):
+    """First worksheet of the spreadsheet sheet_id, opened once per process"""
+    if not sheet_id:
+        raise ValueError("❌ Missing required environment variable: SHEET_ID")
+    with _lock:
+        sheet = _worksheets.get((path, sheet_id))
+        if sheet is None:
+            import gspread
+
+            client_key = (path, tuple(scopes))
+            client = _gspread_clients.get(client_key)
+            if client is None:
+                client = _gspread_clients[client_key] = gspread.authorize(credentials(scopes, path))
+            sheet = _worksheets[(path, sheet_id)] = client.open_by_key(sheet_id).sheet1
+        return sheet
@@ -0,0 +1,2 @@
+# Lets the tests under tests/ import the top-level modules (final, storage, ...)
+# the way the scripts themselves do: pytest puts this directory on sys.path.
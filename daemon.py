@@ -0,0 +1,193 @@
+import os
+import random
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from imap_incremental import IncrementalFetcher
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, overlapping runs are not prevented
+    fcntl = None
+
+
+class AlreadyRunning(RuntimeError):
+    """Another process holds the run lock"""
+
+
+_held_locks = set()  # paths this process already holds
+
+
+@contextmanager
+def run_lock(path):
+    """Hold an exclusive, non-blocking flock on path for the duration
+
+    Raises AlreadyRunning if another process (a daemon, or a cron tick that
+    is still busy) holds it. The kernel drops the lock if the holder dies,
+    so a crash never leaves a stale lock behind. Taking a lock this process
+    already holds (e.g. PollingDaemon.run() inside main()) is a no-op.
+    """
+    key = os.path.abspath(path)
+    if key in _held_locks:
+        yield
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handle = open(path, "a+")
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise AlreadyRunning(f"{path} is locked by another run") from None
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{os.getpid()}\n")
+        handle.flush()
+        _held_locks.add(key)
+        try:
+            yield
+        finally:
+            _held_locks.discard(key)
+    finally:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+
+class PollingDaemon:
+    """Polls the mailbox every interval (+ random jitter) with warm clients
+
+    The replacement for running final.py from cron. The process, the
+    ResumeProcessor with its local indexes and Google clients, and one
+    logged-in IMAP connection all live across cycles, so a cycle with no
+    new mail costs a NOOP and a UID SEARCH. Cycles never overlap: the next
+    one is scheduled from the start of the previous one and only begins
+    once it has finished, and run() holds a file lock so a second daemon
+    or a leftover cron job cannot process the same mail.
+
+    SIGTERM or SIGINT finishes the current cycle (queued sheet rows
+    included) and then returns; a second signal exits immediately.
+    """
+
+    def __init__(self, processor, email_address, password, search_criteria='(SUBJECT "Job Application")',
+                 mailbox="inbox", interval=300, jitter=30, lock_path=None, max_backoff=300):
+        self.processor = processor
+        self.email_address = email_address
+        self.password = password
+        self.search_criteria = search_criteria
+        self.mailbox = mailbox
+        self.interval = interval
+        self.jitter = jitter  # spreads polls from many daemons over time
+        self.lock_path = lock_path or os.path.join(processor.LOCAL_FOLDER, "processor.lock")
+        self.max_backoff = max_backoff
+
+        self.mail = None
+        self.fetcher = None
+        self.cycles = 0
+        self._stop = threading.Event()
+
+    # -- IMAP ----------------------------------------------------------------
+
+    def _connect(self):
+        self.mail = self.processor._connect_imap(self.email_address, self.password)
+        self.fetcher = IncrementalFetcher(self.mail, self.processor.imap_state, self.email_address, self.mailbox)
+        self.fetcher.select()
+
+    def _disconnect(self):
+        if self.mail is None:
+            return
+        try:
+            self.mail.logout()
+        except Exception:
+            pass
+        self.mail = None
+        self.fetcher = None
+
+    def _ensure_connected(self):
+        """Reuse the IMAP connection if it still answers, otherwise log in again"""
+        if self.mail is not None:
+            try:
+                self.mail.noop()
+                return
+            except Exception as e:
+                print(f"⚠️ IMAP connection lost ({str(e)}); reconnecting")
+                self._disconnect()
+        self._connect()
+
+    # -- cycles --------------------------------------------------------------
+
+    def cycle(self):
+        """One poll: fetch new resumes, process them and flush their rows"""
+        processor = self.processor
+        processor.metrics.start_run()
+        if processor.drive_index is not None:
+            processor.drive_index.mark_stale()  # pick up files other uploaders added
+
+        with processor.metrics.time("fetch"):
+            self._ensure_connected()
+            saved_files = processor.fetch_new_attachments(self.fetcher, self.search_criteria)
+        if saved_files:
+            processed = processor.process_resumes(saved_files)
+            processor.applicant_store.flush()
+            processor.export_metrics()
+            print(f"✨ Processed {processed}/{len(saved_files)} new resumes")
+        self.cycles += 1
+        return len(saved_files)
+
+    def _next_delay(self, started):
+        return max(0.0, started + self.interval + random.uniform(0, self.jitter) - time.monotonic())
+
+    def run(self):
+        """Poll until stop() or SIGTERM / SIGINT; raises AlreadyRunning if locked"""
+        with run_lock(self.lock_path):
+            restore = self._install_signal_handlers()
+            print(f"🕒 Polling every {self.interval}s (+ up to {self.jitter}s jitter); Ctrl+C to stop")
+            try:
+                failures = 0
+                while not self._stop.is_set():
+                    started = time.monotonic()
+                    try:
+                        self.cycle()
+                        failures = 0
+                        delay = self._next_delay(started)
+                    except Exception as e:
+                        failures += 1
+                        self._disconnect()
+                        delay = min(2 ** failures, self.max_backoff, self.interval)
+                        print(f"❌ Cycle failed: {str(e)}; retrying in {delay}s")
+                    self._stop.wait(delay)
+            finally:
+                self._disconnect()
+                restore()
+        print(f"👋 Daemon stopped after {self.cycles} cycles")
+
+    def stop(self):
+        """Ask run() to return once the current cycle is done"""
+        self._stop.set()
+
+    def _install_signal_handlers(self):
+        """Route SIGTERM / SIGINT to stop(); returns a function restoring the old handlers"""
+        if threading.current_thread() is not threading.main_thread():
+            return lambda: None
+
+        previous = {}
+
+        def handle(signum, frame):
+            print(f"\n🛑 {signal.Signals(signum).name} received; finishing the current cycle "
+                  f"(signal again to exit now)")
+            self.stop()
+            for sig in previous:
+                signal.signal(sig, signal.SIG_DFL)
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous[sig] = signal.signal(sig, handle)
+
+        def restore():
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+        return restore
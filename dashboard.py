@@ -1,9 +1,15 @@
 import os
+import time
 import streamlit as st
-import gspread
+import numpy as np
 import pandas as pd
-from google.oauth2.service_account import Credentials
 from dotenv import load_dotenv
+import clients
+from sheet_snapshot import SheetSnapshot
+from storage import SQLiteApplicantStore
+from data_refresher import ApplicantDataStore
+from table_view import order_positions, page_count, paginate, sort_order
+from exports import FORMATS as EXPORT_FORMATS, ExportCache, build_export
 
 # Page configuration
 st.set_page_config(
@@ -98,23 +104,46 @@ st.markdown("""
 load_dotenv()
 
 # Configuration
-SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_CREDENTIALS_PATH")
+SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json")
 SHEET_ID = os.getenv("SHEET_ID")
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "applicants_snapshot.sqlite3")
+REFRESH_SECONDS = int(os.getenv("DASHBOARD_REFRESH_SECONDS", "60"))
+APPLICANT_BACKEND = os.getenv("APPLICANT_BACKEND", "sheets").lower()
+STORE_DIR = os.getenv("STORE_DIR", "store")
 
-@st.cache_data(ttl=300)
+@st.cache_resource
 def initialize_google_sheets():
-    """Initialize Google Sheets connection"""
-    SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-    creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-    client = gspread.authorize(creds)
-    return client.open_by_key(SHEET_ID).sheet1
+    """Initialize Google Sheets connection (one authorized client per process)"""
+    return clients.worksheet(SHEET_ID, SERVICE_ACCOUNT_FILE)
+
+@st.cache_resource
+def get_data_store():
+    """Applicant data shared by all sessions, refreshed in the background"""
+    if APPLICANT_BACKEND.startswith("sqlite"):
+        # Read the processor's local store directly; no Sheets quota involved
+        snapshot = SQLiteApplicantStore(os.path.join(STORE_DIR, "applicants.sqlite3"))
+    else:
+        snapshot = SheetSnapshot(SNAPSHOT_PATH, initialize_google_sheets())
+    return ApplicantDataStore(snapshot, interval=REFRESH_SECONDS)
+
+@st.cache_resource
+def get_export_cache():
+    """Generated export files shared by all sessions"""
+    return ExportCache()
+
+@st.cache_resource(max_entries=8)
+def get_sort_order(version, column, ascending, _df):
+    """Full-table row order for a column, computed once per data version"""
+    return sort_order(_df, column, ascending)
 
-@st.cache_data(ttl=60)
 def fetch_data():
-    """Fetch data from Google Sheets"""
-    sheet = initialize_google_sheets()
-    data = sheet.get_all_records()
-    return pd.DataFrame(data)
+    """Current applicant dataset (DataFrame, version, search index); never waits on Google"""
+    store = get_data_store()
+    dataset = store.current(timeout=120)
+    if store.last_error is not None:
+        st.warning(f"Showing data from {time.strftime('%H:%M:%S', time.localtime(dataset.refreshed_at))}; "
+                   f"Google Sheets refresh failed: {str(store.last_error)}")
+    return dataset
 
 def make_clickable_drive_link(link):
     """Convert Google Drive link to a direct viewable link"""
@@ -144,12 +173,8 @@ def main():
     try:
         # Fetch data
         with st.spinner("Loading applicant data..."):
-            df = fetch_data()
-        
-        # Convert Google Drive Links to Clickable Buttons
-        if "Google Drive Link" in df.columns:
-            df["View Resume"] = df["Google Drive Link"].apply(make_clickable_drive_link)
-            df = df.drop(columns=["Google Drive Link"])
+            dataset = fetch_data()
+            df, data_version, search_index = dataset.df, dataset.version, dataset.search_index
         
         # Sidebar filters and search
         st.sidebar.title("🔍 Search & Filters")
@@ -158,16 +183,41 @@ def main():
         search_query = st.sidebar.text_input(
             "Search by Name, Email, or Phone:",
             placeholder="Enter search term...",
-            help="Search across all fields"
-        ).lower()
+            help='Matches any field; limit a term with name:, email: or phone: (e.g. email:gmail.com, name:"john smith")'
+        ).strip()
+        
+        # Apply filters using the prebuilt index
+        positions = search_index.search(search_query) if search_query else np.arange(len(df))
         
-        # Apply filters
-        filtered_df = df.copy()
-        if search_query:
-            mask = filtered_df.astype(str).apply(
-                lambda x: x.str.lower().str.contains(search_query, na=False)
-            ).any(axis=1)
-            filtered_df = filtered_df[mask]
+        # Sorting and paging controls
+        sortable_columns = [c for c in df.columns if c != "Google Drive Link"]
+        sort_col, dir_col, size_col = st.columns([2, 1, 1])
+        with sort_col:
+            sort_by = st.selectbox("Sort by:", ["(sheet order)"] + sortable_columns)
+        with dir_col:
+            descending = st.radio("Order:", ["Ascending", "Descending"], horizontal=True) == "Descending"
+        with size_col:
+            page_size = st.selectbox("Rows per page:", [25, 50, 100, 200], index=1)
+        
+        if sort_by != "(sheet order)":
+            positions = order_positions(positions, get_sort_order(data_version, sort_by, not descending, df), len(df))
+        elif descending:
+            positions = positions[::-1]
+        
+        pages = page_count(len(positions), page_size)
+        # Keyed on the view so changing filter, sort or page size goes back to page 1
+        page = st.number_input(
+            f"Page (of {pages}):", min_value=1, max_value=pages, value=1, step=1,
+            key=f"page:{data_version}:{search_query}:{sort_by}:{descending}:{page_size}"
+        )
+        page_positions, page_info = paginate(positions, page, page_size)
+        
+        # Only the visible page gets clickable links and HTML
+        page_df = df.iloc[page_positions]
+        if "Google Drive Link" in page_df.columns:
+            page_df = page_df.assign(
+                **{"View Resume": page_df["Google Drive Link"].apply(make_clickable_drive_link)}
+            ).drop(columns=["Google Drive Link"])
         
         # Display stats
         col1, col2 = st.columns(2)
@@ -177,7 +227,7 @@ def main():
                 <div class="stats-box">
                     <h3 style="margin-top:0">📊 Dashboard Stats</h3>
                     <p><strong>Total Applicants:</strong> {len(df)}</p>
-                    <p><strong>Filtered Results:</strong> {len(filtered_df)}</p>
+                    <p><strong>Filtered Results:</strong> {page_info["total_rows"]}</p>
                 </div>
                 """,
                 unsafe_allow_html=True
@@ -185,8 +235,12 @@ def main():
         
         # Display applicants table
         st.markdown("### 👥 Applicants List")
+        st.caption(
+            f"Showing {page_info['first_row']}–{page_info['last_row']} of {page_info['total_rows']} "
+            f"(page {page_info['page']} of {page_info['page_count']})"
+        )
         st.markdown(
-            filtered_df.to_html(
+            page_df.to_html(
                 escape=False,
                 index=False,
                 classes=['styled-table']
@@ -206,21 +260,35 @@ def main():
             )
         
         with col2:
-            if st.button("Download Data", help="Download filtered data"):
+            # Exports are built in memory and cached per view, so every user
+            # gets their own file and repeat downloads are instant
+            export_cache = get_export_cache()
+            export_key = (data_version, search_query, sort_by, descending, file_format)
+            export_data = export_cache.get(export_key)
+            
+            if export_data is None and st.button("Prepare Download", help="Build a file of the filtered data"):
                 try:
-                    # Remove HTML from View Resume column for export
-                    export_df = filtered_df.copy()
-                    if "View Resume" in export_df.columns:
-                        export_df = export_df.drop(columns=["View Resume"])
+                    # Export the filtered rows in the current sort order, without links
+                    export_df = df.iloc[positions]
+                    if "Google Drive Link" in export_df.columns:
+                        export_df = export_df.drop(columns=["Google Drive Link"])
                     
-                    if file_format == "CSV":
-                        export_df.to_csv("applicants.csv", index=False)
-                        st.success("✅ Data saved as `applicants.csv`")
-                    else:
-                        export_df.to_excel("applicants.xlsx", index=False)
-                        st.success("✅ Data saved as `applicants.xlsx`")
+                    with st.spinner(f"Building {file_format} file..."):
+                        export_data = export_cache.get_or_build(
+                            export_key, lambda: build_export(export_df, file_format)
+                        )
                 except Exception as e:
-                    st.error(f"Error saving file: {str(e)}")
+                    st.error(f"Error building file: {str(e)}")
+            
+            if export_data is not None:
+                file_name, mime = EXPORT_FORMATS[file_format]
+                st.download_button(
+                    "Download Data",
+                    data=export_data,
+                    file_name=file_name,
+                    mime=mime,
+                    help="Download filtered data"
+                )
         
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
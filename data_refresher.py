@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import namedtuple
+
+from search_index import ApplicantSearchIndex
+
+# One immutable view of the applicant data; swapped in as a whole
+Dataset = namedtuple("Dataset", ["version", "df", "search_index", "refreshed_at"])
+
+
+class ApplicantDataStore:
+    """Process-wide applicant dataset kept fresh by a background thread
+
+    A single thread syncs the local SheetSnapshot with Google every
+    interval seconds, rebuilds the DataFrame and search index when the data
+    changed, and publishes them by swapping one reference. Readers just
+    take the current Dataset, so user requests never wait on Google and
+    any number of sessions share one fetch per interval.
+    """
+
+    def __init__(self, snapshot, interval=60):
+        self.snapshot = snapshot
+        self.interval = interval
+        self.last_error = None
+
+        self._dataset = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+
+        # Serve whatever is already on disk straight away
+        if snapshot.header:
+            self._publish()
+
+        self._thread = threading.Thread(target=self._run, name="applicant-refresh", daemon=True)
+        self._thread.start()
+
+    def _publish(self):
+        df = self.snapshot.to_dataframe()
+        self._dataset = Dataset(self.snapshot.version, df, ApplicantSearchIndex(df), time.time())
+        self._ready.set()
+
+    def refresh(self):
+        """Sync with Google once; rebuilds the dataset only if the data changed"""
+        changed = self.snapshot.sync(force=True)
+        if changed or self._dataset is None:
+            self._publish()
+        else:
+            self._dataset = self._dataset._replace(refreshed_at=time.time())
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"⚠️ Applicant data refresh failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def current(self, timeout=None):
+        """The latest Dataset; blocks only until the very first load finishes"""
+        if not self._ready.wait(timeout):
+            if self.last_error is not None:
+                raise self.last_error
+            raise TimeoutError("Applicant data is still loading")
+        return self._dataset
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
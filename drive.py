@@ -1,32 +1,48 @@
 import os
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google.oauth2.service_account import Credentials
 from dotenv import load_dotenv
+import clients
+from drive_ops import batch_execute, upload_file
 
 # Load environment variables from .env file
 load_dotenv()
 
-# ✅ Step 1: Authenticate with Google Drive API
+# ✅ Step 1: Google Drive API client (authenticated on first use, see clients.py)
 SCOPES = ["https://www.googleapis.com/auth/drive.file"]
 SERVICE_ACCOUNT_FILE = os.getenv("DRIVE_CREDENTIALS", "credentials.json")  # Ensure this file exists
 
-creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-drive_service = build("drive", "v3", credentials=creds)
-
-print("✅ Google Drive API authentication successful!")
+def get_drive_service():
+    return clients.drive_service(SERVICE_ACCOUNT_FILE, SCOPES)
 
 # ✅ Step 2: Function to Check if File Already Exists in Google Drive
 def file_exists(file_name, folder_id):
     query = f"name='{file_name}' and '{folder_id}' in parents and trashed=false"
-    results = drive_service.files().list(q=query, fields="files(id)").execute()
+    results = get_drive_service().files().list(q=query, fields="files(id)").execute()
     return len(results.get("files", [])) > 0  # Returns True if file exists
 
+# Same check for many files at once, sent as batched requests
+def files_exist(file_names, folder_id):
+    drive_service = get_drive_service()
+    requests = {
+        name: drive_service.files().list(
+            q=f"name='{name}' and '{folder_id}' in parents and trashed=false", fields="files(id)"
+        )
+        for name in file_names
+    }
+    exists = {}
+    for name, result in batch_execute(drive_service, requests).items():
+        if isinstance(result, Exception):
+            exists[name] = file_exists(name, folder_id)  # fall back to a single request
+        else:
+            exists[name] = len(result.get("files", [])) > 0
+    return exists
+
 # ✅ Step 3: Function to Upload a Single File (Only if Not Duplicate)
-def upload_to_drive(file_path, folder_id):
+def upload_to_drive(file_path, folder_id, exists=None):
     file_name = os.path.basename(file_path)  # Extract filename
 
-    if file_exists(file_name, folder_id):  # Check if file exists
+    if exists is None:
+        exists = file_exists(file_name, folder_id)
+    if exists:  # Check if file exists
         print(f"⚠️ Skipping {file_name}, already uploaded.")
         return None  # Skip duplicate upload
 
@@ -35,13 +51,8 @@ def upload_to_drive(file_path, folder_id):
         "parents": [folder_id]  # Upload inside the specified folder
     }
 
-    media = MediaFileUpload(file_path, mimetype="application/pdf")
-
-    uploaded_file = drive_service.files().create(
-        body=file_metadata,
-        media_body=media,
-        fields="id"
-    ).execute()
+    # Resumable, chunked upload for large files
+    uploaded_file = upload_file(get_drive_service(), file_path, file_metadata, fields="id")
 
     file_id = uploaded_file.get("id")
     print(f"✅ Uploaded {file_name} to Google Drive with File ID: {file_id}")
@@ -63,10 +74,11 @@ def upload_all_resumes(folder_path, drive_folder_id):
 
     uploaded_count = 0
     skipped_count = 0
+    existing = files_exist(pdf_files, drive_folder_id)
 
     for file in pdf_files:
         file_path = os.path.join(folder_path, file)
-        file_id = upload_to_drive(file_path, drive_folder_id)
+        file_id = upload_to_drive(file_path, drive_folder_id, exists=existing.get(file))
         if file_id:
             uploaded_count += 1
         else:
@@ -77,7 +89,8 @@ def upload_all_resumes(folder_path, drive_folder_id):
 # ✅ Step 5: Run the Script
 FOLDER_ID = os.getenv("DRIVE_FOLDER_ID")  # Load from .env
 
-if not FOLDER_ID:
-    raise ValueError("❌ Missing required environment variable: DRIVE_FOLDER_ID")
+if __name__ == "__main__":
+    if not FOLDER_ID:
+        raise ValueError("❌ Missing required environment variable: DRIVE_FOLDER_ID")
 
-upload_all_resumes("./Resume", FOLDER_ID)  # Make sure this folder exists
+    upload_all_resumes("./Resume", FOLDER_ID)  # Make sure this folder exists
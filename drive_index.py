@@ -0,0 +1,224 @@
+import sqlite3
+import threading
+
+from drive_ops import batch_execute
+
+
+class DriveHashIndex:
+    """Persistent local index of ``file_hash`` -> Drive file for one folder
+
+    Lookups are answered from a local SQLite table. On a miss the folder is
+    asked directly with a ``properties has`` query, which Drive resolves
+    server-side, so the cost does not grow with the folder. Files added or
+    trashed by other uploaders are picked up incrementally through the Drive
+    changes feed; the folder is only listed in full (all pages) the first
+    time the index is built. lookup_many resolves a whole intake's misses
+    with batched queries instead of one request per file.
+    """
+
+    FILE_FIELDS = "id, webViewLink, parents, trashed, properties"
+
+    def __init__(self, path, folder_id, get_service, max_retries=8):
+        self.folder_id = folder_id
+        self._get_service = get_service  # returns a Drive client for the calling thread
+        self.max_retries = max_retries  # per request, for 429 / 5xx / rate-limit 403s
+        self._lock = threading.RLock()
+        self._reconciled = False
+        self._absent = set()  # hashes Drive confirmed missing since the last reconcile
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS drive_files ("
+            "file_hash TEXT PRIMARY KEY, file_id TEXT NOT NULL, web_view_link TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS drive_files_id ON drive_files (file_id)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+        # An index built for a different folder is useless; start over
+        if self._get_meta("folder_id") not in (None, folder_id):
+            self._db.execute("DELETE FROM drive_files")
+            self._db.execute("DELETE FROM meta")
+            self._db.commit()
+
+    # -- metadata ------------------------------------------------------------
+
+    def _get_meta(self, key):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # -- local index ---------------------------------------------------------
+
+    def _get_local(self, file_hash):
+        row = self._db.execute(
+            "SELECT file_id, web_view_link FROM drive_files WHERE file_hash = ?", (file_hash,)
+        ).fetchone()
+        return {"id": row[0], "webViewLink": row[1]} if row else None
+
+    def _put_local(self, file_hash, file_id, web_view_link):
+        self._db.execute(
+            "INSERT OR REPLACE INTO drive_files (file_hash, file_id, web_view_link) VALUES (?, ?, ?)",
+            (file_hash, file_id, web_view_link)
+        )
+
+    def _apply_file(self, file):
+        """Insert, update or drop one Drive file resource"""
+        file_hash = file.get("properties", {}).get("file_hash")
+        in_folder = self.folder_id in file.get("parents", [])
+        if file.get("trashed") or not in_folder:
+            self._db.execute("DELETE FROM drive_files WHERE file_id = ?", (file["id"],))
+        elif file_hash:
+            self._put_local(file_hash, file["id"], file.get("webViewLink"))
+
+    def add(self, file_hash, file_id, web_view_link):
+        """Record a file we just uploaded"""
+        with self._lock:
+            self._put_local(file_hash, file_id, web_view_link)
+            self._absent.discard(file_hash)
+            self._db.commit()
+
+    # -- reconciliation with Drive -------------------------------------------
+
+    def _full_sync(self, service):
+        """List the whole folder (every page) and remember where the changes feed starts"""
+        start_token = service.changes().getStartPageToken(supportsAllDrives=True).execute(
+            num_retries=self.max_retries
+        )["startPageToken"]
+        query = f"'{self.folder_id}' in parents and trashed=false"
+        page_token = None
+        self._db.execute("DELETE FROM drive_files")
+        while True:
+            results = service.files().list(
+                q=query,
+                fields=f"nextPageToken, files({self.FILE_FIELDS})",
+                pageSize=1000,
+                pageToken=page_token,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True
+            ).execute(num_retries=self.max_retries)
+            for file in results.get("files", []):
+                self._apply_file(file)
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+        self._set_meta("folder_id", self.folder_id)
+        self._set_meta("page_token", start_token)
+        self._db.commit()
+
+    def _apply_changes(self, service, page_token):
+        """Replay the changes feed from page_token"""
+        while page_token:
+            results = service.changes().list(
+                pageToken=page_token,
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({self.FILE_FIELDS}))",
+                pageSize=1000,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True
+            ).execute(num_retries=self.max_retries)
+            for change in results.get("changes", []):
+                if change.get("removed") or "file" not in change:
+                    self._db.execute("DELETE FROM drive_files WHERE file_id = ?", (change["fileId"],))
+                else:
+                    self._apply_file(change["file"])
+            if "newStartPageToken" in results:
+                self._set_meta("page_token", results["newStartPageToken"])
+            page_token = results.get("nextPageToken")
+        self._db.commit()
+
+    def reconcile(self):
+        """Bring the local index up to date with Drive"""
+        with self._lock:
+            service = self._get_service()
+            page_token = self._get_meta("page_token")
+            if page_token is None:
+                print("🔄 Building local Drive index...")
+                self._full_sync(service)
+            else:
+                self._apply_changes(service, page_token)
+            self._absent.clear()
+            self._reconciled = True
+
+    def mark_stale(self):
+        """Re-read the changes feed before the next lookup (for long-running processes)"""
+        with self._lock:
+            self._reconciled = False
+
+    def _hash_query(self, service, file_hash):
+        query = (
+            f"'{self.folder_id}' in parents and trashed=false and "
+            f"properties has {{key='file_hash' and value='{file_hash}'}}"
+        )
+        return service.files().list(
+            q=query,
+            fields=f"files({self.FILE_FIELDS})",
+            pageSize=1,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        )
+
+    def _query_drive(self, file_hash):
+        """Ask Drive for a file with this hash in the folder"""
+        results = self._hash_query(self._get_service(), file_hash).execute(num_retries=self.max_retries)
+        files = results.get("files", [])
+        return files[0] if files else None
+
+    def _remember(self, file_hash, file):
+        with self._lock:
+            if file is None:
+                self._absent.add(file_hash)
+                return None
+            self._apply_file(file)
+            self._db.commit()
+        return {"id": file["id"], "webViewLink": file.get("webViewLink")}
+
+    def lookup(self, file_hash):
+        """Return {"id", "webViewLink"} for a file already in the folder, or None"""
+        with self._lock:
+            if not self._reconciled:
+                self.reconcile()
+            found = self._get_local(file_hash)
+            if found or file_hash in self._absent:
+                return found
+
+        return self._remember(file_hash, self._query_drive(file_hash))
+
+    def lookup_many(self, file_hashes):
+        """lookup for many hashes at once: {file_hash: {"id", "webViewLink"} or None}
+
+        Local hits cost nothing; the remaining hashes are checked against
+        Drive in batched requests (up to 100 queries per round trip).
+        Answers are remembered, so a following lookup() for any of these
+        hashes needs no request at all.
+        """
+        found = {}
+        with self._lock:
+            if not self._reconciled:
+                self.reconcile()
+            for file_hash in set(file_hashes):
+                if file_hash in self._absent:
+                    found[file_hash] = None
+                else:
+                    local = self._get_local(file_hash)
+                    if local:
+                        found[file_hash] = local
+        missing = [file_hash for file_hash in set(file_hashes) if file_hash not in found]
+        if not missing:
+            return found
+
+        service = self._get_service()
+        responses = batch_execute(service, {h: self._hash_query(service, h) for h in missing})
+        for file_hash, response in responses.items():
+            if isinstance(response, Exception):
+                # Leave it to the per-file lookup() at upload time
+                print(f"⚠️ Drive lookup failed for {file_hash[:12]}: {str(response)}")
+                continue
+            files = response.get("files", [])
+            found[file_hash] = self._remember(file_hash, files[0] if files else None)
+        return found
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,108 @@
+import os
+import random
+import time
+
+# Drive accepts at most 100 calls per batch request
+MAX_BATCH_SIZE = 100
+
+RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+CHUNK_SIZE = 5 * 1024 * 1024  # resumable chunks must be multiples of 256 KiB
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+
+
+def _retryable(error):
+    from googleapiclient.errors import HttpError
+
+    if isinstance(error, HttpError):
+        if error.resp.status == 403:
+            # Drive reports per-user rate limits as 403 rather than 429
+            return b"rateLimitExceeded" in error.content or b"userRateLimitExceeded" in error.content
+        return error.resp.status in RETRYABLE_STATUS
+    return isinstance(error, (ConnectionError, TimeoutError, OSError))
+
+
+def _backoff(attempt, cap=32.0):
+    """Exponential backoff with jitter, in seconds"""
+    return min(cap, 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+def batch_execute(service, requests, batch_size=MAX_BATCH_SIZE, max_retries=5):
+    """Run many Drive API calls through as few HTTP round trips as possible
+
+    requests maps a key to an unexecuted request (e.g. service.files().get(...)).
+    They are sent in BatchHttpRequests of up to batch_size calls; calls that
+    fail with a rate limit or server error are retried in a later batch with
+    backoff. Returns {key: response}; calls that still fail map to the
+    exception instead, so callers decide what a failure means.
+    """
+    pending = dict(requests)
+    results = {}
+    attempt = 0
+    while pending:
+        retry = {}
+        keys = list(pending)
+        for start in range(0, len(keys), batch_size):
+            chunk = keys[start:start + batch_size]
+
+            def callback(request_id, response, exception, chunk=chunk):
+                key = chunk[int(request_id)]
+                if exception is not None and _retryable(exception) and attempt < max_retries:
+                    retry[key] = pending[key]
+                else:
+                    results[key] = exception if exception is not None else response
+
+            batch = service.new_batch_http_request(callback=callback)
+            for i, key in enumerate(chunk):
+                batch.add(pending[key], request_id=str(i))
+            batch.execute()
+
+        if retry:
+            time.sleep(_backoff(attempt))
+            attempt += 1
+        pending = retry
+    return results
+
+
+def resumable_upload(request, max_retries=8, label=None):
+    """Drive a chunked resumable upload to completion
+
+    A failed chunk is retried with backoff; the upload session carries on
+    from the last byte Drive acknowledged instead of starting over.
+    """
+    response = None
+    failures = 0
+    while response is None:
+        try:
+            status, response = request.next_chunk()
+            failures = 0
+            if status is not None and label:
+                print(f"⬆️ {label}: {int(status.progress() * 100)}%")
+        except Exception as e:
+            if not _retryable(e) or failures >= max_retries:
+                raise
+            delay = _backoff(failures)
+            failures += 1
+            print(f"⚠️ Upload interrupted ({str(e)}), resuming in {delay:.1f}s...")
+            time.sleep(delay)
+    return response
+
+
+def upload_file(service, file_path, metadata, mimetype="application/pdf", fields="id, webViewLink",
+                chunk_size=CHUNK_SIZE, resumable_threshold=RESUMABLE_THRESHOLD, max_retries=8, **kwargs):
+    """Create a Drive file from file_path and return the API response
+
+    Files above resumable_threshold go through a chunked resumable session
+    (see resumable_upload); smaller ones use a single multipart request,
+    retried whole on transient errors since they are cheap to resend.
+    """
+    from googleapiclient.http import MediaFileUpload
+
+    size = os.path.getsize(file_path)
+    if size > resumable_threshold:
+        media = MediaFileUpload(file_path, mimetype=mimetype, chunksize=chunk_size, resumable=True)
+        request = service.files().create(body=metadata, media_body=media, fields=fields, **kwargs)
+        return resumable_upload(request, max_retries=max_retries, label=os.path.basename(file_path))
+
+    media = MediaFileUpload(file_path, mimetype=mimetype)
+    request = service.files().create(body=metadata, media_body=media, fields=fields, **kwargs)
+    return request.execute(num_retries=max_retries)
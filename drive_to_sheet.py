@@ -1,41 +1,53 @@
+import hashlib
 import os
-import gspread
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google.oauth2.service_account import Credentials
-import re
 from io import BytesIO
-import pdfplumber
-from googleapiclient.http import MediaIoBaseDownload
 from dotenv import load_dotenv
+import clients
+from drive_ops import batch_execute, upload_file
+from extraction_cache import ExtractionCache, cached_extract_details, parse_pages
+from pdf_text import extract_text
+from resume_details import extract_details
 
 # Load environment variables
 load_dotenv()
 
-# ✅ Step 1: Authenticate Google Drive & Google Sheets APIs
-SCOPES_DRIVE = ["https://www.googleapis.com/auth/drive"]
-SCOPES_SHEETS = ["https://www.googleapis.com/auth/spreadsheets"]
+# ✅ Step 1: Google Drive & Google Sheets API clients (authenticated on first use, see clients.py)
+SCOPES_DRIVE = clients.DRIVE_SCOPES
+SCOPES_SHEETS = clients.SHEETS_SCOPES
 
 # Load credentials from environment variables
 DRIVE_CREDENTIALS = os.getenv("DRIVE_CREDENTIALS", "credentials.json")
 SHEETS_CREDENTIALS = os.getenv("SHEETS_CREDENTIALS", "credentials.json")
 SHEET_ID = os.getenv("SHEET_ID")
 DRIVE_FOLDER_ID = os.getenv("DRIVE_FOLDER_ID")
+LOCAL_FOLDER = os.getenv("LOCAL_FOLDER", "Resume")  # Folder where resumes are stored locally
+EXTRACTION_CACHE_MB = int(os.getenv("EXTRACTION_CACHE_MB", "256"))
 
-# Authenticate with Google Drive API
-drive_creds = Credentials.from_service_account_file(DRIVE_CREDENTIALS, scopes=SCOPES_DRIVE)
-drive_service = build("drive", "v3", credentials=drive_creds)
+FILE_FIELDS = "id, webViewLink, sha256Checksum"
 
-# Authenticate with Google Sheets API
-sheets_creds = Credentials.from_service_account_file(SHEETS_CREDENTIALS, scopes=SCOPES_SHEETS)
-client = gspread.authorize(sheets_creds)
+def get_drive_service():
+    return clients.drive_service(DRIVE_CREDENTIALS, SCOPES_DRIVE)
 
-# Open Google Sheet
-sheet = client.open_by_key(SHEET_ID).sheet1  # First sheet
+def get_sheet():
+    return clients.worksheet(SHEET_ID, SHEETS_CREDENTIALS, SCOPES_SHEETS)  # First sheet
+
+# Extraction results by resume SHA-256, shared with final.py
+_extraction_cache = None
+
+def get_extraction_cache():
+    global _extraction_cache
+    if _extraction_cache is None:
+        os.makedirs(LOCAL_FOLDER, exist_ok=True)
+        _extraction_cache = ExtractionCache(
+            os.path.join(LOCAL_FOLDER, "extraction_cache.sqlite3"),
+            max_bytes=EXTRACTION_CACHE_MB * 1024 * 1024
+        )
+    return _extraction_cache
 
 # ✅ Step 2: Ensure Headers Exist in Google Sheets
 def add_headers():
     required_headers = ["Name", "Email Address", "Phone No", "Google Drive Link"]
+    sheet = get_sheet()
     existing_headers = sheet.row_values(1)
     
     if existing_headers != required_headers:
@@ -45,28 +57,44 @@ def add_headers():
 # ✅ Step 3: Check if a File Exists in Google Drive
 def file_exists(file_name, folder_id):
     query = f"name='{file_name}' and '{folder_id}' in parents and trashed=false"
-    results = drive_service.files().list(q=query, fields="files(id, webViewLink)").execute()
+    results = get_drive_service().files().list(q=query, fields=f"files({FILE_FIELDS})").execute()
     files = results.get("files", [])
     return files[0] if files else None  # Return file details if found
 
+# Same check for many files at once, sent as batched requests
+def existing_files(file_names, folder_id):
+    drive_service = get_drive_service()
+    requests = {
+        name: drive_service.files().list(
+            q=f"name='{name}' and '{folder_id}' in parents and trashed=false", fields=f"files({FILE_FIELDS})"
+        )
+        for name in file_names
+    }
+    found = {}
+    for name, result in batch_execute(drive_service, requests).items():
+        if isinstance(result, Exception):
+            found[name] = file_exists(name, folder_id)  # fall back to a single request
+        else:
+            files = result.get("files", [])
+            found[name] = files[0] if files else None
+    return found
+
 # ✅ Step 4: Upload a Resume to Google Drive (if not already uploaded)
-def upload_to_drive(file_path, folder_id):
+def upload_to_drive(file_path, folder_id, existing_file=False):
     file_name = os.path.basename(file_path)
 
-    existing_file = file_exists(file_name, folder_id)
+    if existing_file is False:  # not looked up yet
+        existing_file = file_exists(file_name, folder_id)
     if existing_file:
         print(f"⚠️ Skipping {file_name}, already in Google Drive.")
-        return existing_file["id"], existing_file["webViewLink"]
+        return existing_file["id"], existing_file["webViewLink"], existing_file.get("sha256Checksum")
 
     file_metadata = {"name": file_name, "parents": [folder_id]}
-    media = MediaFileUpload(file_path, mimetype="application/pdf")
-
-    uploaded_file = drive_service.files().create(
-        body=file_metadata, media_body=media, fields="id, webViewLink"
-    ).execute()
+    # Resumable, chunked upload for large files
+    uploaded_file = upload_file(get_drive_service(), file_path, file_metadata, fields=FILE_FIELDS)
 
     print(f"✅ Uploaded {file_name} to Google Drive.")
-    return uploaded_file["id"], uploaded_file["webViewLink"]
+    return uploaded_file["id"], uploaded_file["webViewLink"], uploaded_file.get("sha256Checksum")
 
 # ✅ Step 5: Upload All Resumes from Local Folder to Google Drive
 def upload_all_resumes(local_folder, drive_folder_id):
@@ -83,17 +111,20 @@ def upload_all_resumes(local_folder, drive_folder_id):
     print(f"📂 Found {len(pdf_files)} resumes. Uploading to Google Drive...")
 
     drive_files = []
+    existing = existing_files(pdf_files, drive_folder_id)
     for file in pdf_files:
         file_path = os.path.join(local_folder, file)
-        file_id, file_link = upload_to_drive(file_path, drive_folder_id)
-        drive_files.append({"id": file_id, "name": file, "link": file_link})
+        file_id, file_link, file_hash = upload_to_drive(file_path, drive_folder_id, existing_file=existing.get(file))
+        drive_files.append({"id": file_id, "name": file, "link": file_link, "sha256": file_hash})
 
     print("✅ All resumes uploaded successfully!")
     return drive_files  # Return uploaded file info
 
 # ✅ Step 6: Extract Text from a Google Drive PDF
-def extract_text_from_drive(file_id):
-    request = drive_service.files().get_media(fileId=file_id)
+def download_from_drive(file_id):
+    from googleapiclient.http import MediaIoBaseDownload
+
+    request = get_drive_service().files().get_media(fileId=file_id)
     file_stream = BytesIO()
     downloader = MediaIoBaseDownload(file_stream, request)
     
@@ -101,47 +132,38 @@ def extract_text_from_drive(file_id):
     while not done:
         _, done = downloader.next_chunk()
 
-    text = ""
-    file_stream.seek(0)
-    with pdfplumber.open(file_stream) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n" if page.extract_text() else ""
-
-    return text
+    return file_stream.getvalue()
 
-# ✅ Step 7: Extract Candidate Details (Name, Email, Phone)
-def extract_details(text):
-    email_pattern = r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+"
-    phone_pattern = r"\+?\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}"
-
-    email = re.findall(email_pattern, text)
-    phone = re.findall(phone_pattern, text)
-
-    name_lines = text.split("\n")[:5]
-    name = "N/A"
-    for line in name_lines:
-        if len(line.split()) >= 2:
-            name = line.strip()
-            break
-
-    return {"Name": name, "Email": email[0] if email else "N/A", "Phone": phone[0] if phone else "N/A"}
+def extract_text_from_drive(file_id):
+    return extract_text(download_from_drive(file_id))
 
-# ✅ Step 8: Check for Duplicate Email in Google Sheets
+# ✅ Step 7: Check for Duplicate Email in Google Sheets
 def check_duplicate(email):
-    existing_emails = sheet.col_values(2)
+    existing_emails = get_sheet().col_values(2)
     return email in existing_emails
 
-# ✅ Step 9: Save Extracted Details to Google Sheets
+# ✅ Step 8: Save Extracted Details to Google Sheets
 def save_to_sheet(data):
     add_headers()
 
     if check_duplicate(data["Email"]):
         print(f"⚠️ Duplicate entry found for {data['Email']}! Skipping...")
     else:
-        sheet.append_row([data["Name"], data["Email"], data["Phone"], data["Drive Link"]])
+        get_sheet().append_row([data["Name"], data["Email"], data["Phone"], data["Drive Link"]])
         print(f"✅ Data saved: {data}")
 
-# ✅ Step 10: Process All Resumes from Google Drive
+# Details of a Drive resume, from the extraction cache when it was seen before.
+# With Drive's SHA-256 of the file a cache hit needs no download at all.
+def extract_drive_resume(cache, file):
+    def download_and_parse(file_id, extract):
+        return parse_pages(download_from_drive(file_id), extract)
+
+    if file.get("sha256"):
+        return cached_extract_details(cache, file["sha256"], file["id"], extract_details, parse=download_and_parse)
+    content = download_from_drive(file["id"])
+    return cached_extract_details(cache, hashlib.sha256(content).hexdigest(), content, extract_details)
+
+# ✅ Step 9: Process All Resumes from Google Drive
 def process_drive_resumes(uploaded_files):
     if not uploaded_files:
         print("❌ No resumes available in Google Drive!")
@@ -149,19 +171,18 @@ def process_drive_resumes(uploaded_files):
 
     print(f"📂 Extracting details from {len(uploaded_files)} resumes...")
 
+    cache = get_extraction_cache()
     for file in uploaded_files:
-        file_text = extract_text_from_drive(file["id"])
-        details = extract_details(file_text)
+        details = extract_drive_resume(cache, file)
         details["Drive Link"] = file["link"]  # Add Drive link
         save_to_sheet(details)
 
     print("✅ All resume details extracted and saved to Google Sheets!")
 
-# ✅ Step 11: Run the Complete Pipeline
-LOCAL_FOLDER = "./Resume"  # Folder where resumes are stored locally
-
-if not SHEET_ID or not DRIVE_FOLDER_ID:
-    raise ValueError("Missing required environment variables: SHEET_ID or DRIVE_FOLDER_ID")
+# ✅ Step 10: Run the Complete Pipeline
+if __name__ == "__main__":
+    if not SHEET_ID or not DRIVE_FOLDER_ID:
+        raise ValueError("Missing required environment variables: SHEET_ID or DRIVE_FOLDER_ID")
 
-uploaded_files = upload_all_resumes(LOCAL_FOLDER, DRIVE_FOLDER_ID)  # Upload resumes to Drive
-process_drive_resumes(uploaded_files)  # Extract details & save to Sheets
+    uploaded_files = upload_all_resumes(LOCAL_FOLDER, DRIVE_FOLDER_ID)  # Upload resumes to Drive
+    process_drive_resumes(uploaded_files)  # Extract details & save to Sheets
@@ -0,0 +1,59 @@
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+FORMATS = {
+    "CSV": ("applicants.csv", "text/csv"),
+    "Excel": ("applicants.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def build_export(df, file_format):
+    """Serialize df to in-memory CSV or Excel bytes"""
+    if file_format == "CSV":
+        return df.to_csv(index=False).encode("utf-8")
+    if file_format == "Excel":
+        buffer = BytesIO()
+        df.to_excel(buffer, index=False, engine="openpyxl")
+        return buffer.getvalue()
+    raise ValueError(f"Unsupported export format: {file_format}")
+
+
+class ExportCache:
+    """Process-wide LRU of generated export files, bounded by total size
+
+    Keys should identify the exact view, e.g. (data version, filter, sort,
+    format), so a cached artifact is never served for different data.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._size = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            if len(data) > self.max_bytes:
+                return  # too large to keep; still served once
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get_or_build(self, key, build):
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from pdf_text import details_settled, extract_details_from_pages, iter_page_text
+from resume_details import EXTRACTOR_VERSION
+
+# Bump when pdf_text changes how page text is produced
+PAGE_TEXT_VERSION = "1"
+
+
+class ExtractionCache:
+    """Content-addressed cache of extraction results, keyed by resume SHA-256
+
+    Each entry holds the page text read from the PDF (tagged with
+    PAGE_TEXT_VERSION) and the extract_details result (tagged with
+    EXTRACTOR_VERSION). Bumping the detail extractor version therefore
+    re-runs only the regexes over the cached page text, not pdfplumber.
+    Entries are evicted least-recently-used once the cache exceeds
+    max_bytes. A small in-memory LRU sits in front of SQLite so repeat
+    hits within a run never touch the disk.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, memory_entries=1024):
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            "file_hash TEXT NOT NULL, text_version TEXT NOT NULL, "
+            "pages TEXT NOT NULL, complete INTEGER NOT NULL, "
+            "details TEXT, details_version TEXT, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL, "
+            "PRIMARY KEY (file_hash, text_version))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS extractions_lru ON extractions (last_access)")
+        self._db.commit()
+
+    def _remember(self, file_hash, entry):
+        self._memory[file_hash] = entry
+        self._memory.move_to_end(file_hash)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, file_hash):
+        """(pages, complete, details, details_version) for a cached file, or None"""
+        with self._lock:
+            entry = self._memory.get(file_hash)
+            if entry is not None:
+                self._memory.move_to_end(file_hash)
+                return entry
+            row = self._db.execute(
+                "SELECT pages, complete, details, details_version FROM extractions "
+                "WHERE file_hash = ? AND text_version = ?",
+                (file_hash, PAGE_TEXT_VERSION)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE extractions SET last_access = ? WHERE file_hash = ? AND text_version = ?",
+                (time.time(), file_hash, PAGE_TEXT_VERSION)
+            )
+            self._db.commit()
+            entry = (json.loads(row[0]), bool(row[1]), json.loads(row[2]) if row[2] else None, row[3])
+            self._remember(file_hash, entry)
+            return entry
+
+    def put(self, file_hash, pages, complete, details, details_version=EXTRACTOR_VERSION):
+        pages_json = json.dumps(pages)
+        details_json = json.dumps(details) if details is not None else None
+        size = len(pages_json) + len(details_json or "")
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO extractions "
+                "(file_hash, text_version, pages, complete, details, details_version, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_hash, PAGE_TEXT_VERSION, pages_json, int(complete), details_json, details_version,
+                 size, time.time())
+            )
+            self._evict()
+            self._db.commit()
+            self._remember(file_hash, (pages, complete, details, details_version))
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        cursor = self._db.execute("SELECT file_hash, text_version, size FROM extractions ORDER BY last_access")
+        victims = []
+        for file_hash, text_version, size in cursor:
+            if total <= self.max_bytes:
+                break
+            victims.append((file_hash, text_version))
+            total -= size
+        self._db.executemany("DELETE FROM extractions WHERE file_hash = ? AND text_version = ?", victims)
+        for file_hash, _ in victims:
+            self._memory.pop(file_hash, None)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def parse_pages(source, extract_details):
+    """Early-exit parse of a PDF: (details, pages_read, complete)
+
+    A plain module-level function, so it can also be shipped to a process
+    pool (extract_details must then be picklable too).
+    """
+    pages_read = []
+    state = {"complete": False}
+
+    def recording_pages():
+        pages = iter_page_text(source)
+        try:
+            for page_text in pages:
+                pages_read.append(page_text)
+                yield page_text
+            state["complete"] = True
+        finally:
+            pages.close()
+
+    details, _ = extract_details_from_pages(recording_pages(), extract_details)
+    return details, pages_read, state["complete"]
+
+
+def cached_extract_details(cache, file_hash, source, extract_details, details_version=EXTRACTOR_VERSION,
+                           parse=parse_pages):
+    """extract_details for a PDF, served from cache whenever possible
+
+    Order of preference: cached details for this extractor version; the
+    extractor re-run over cached page text; a fresh (early-exit) parse of
+    source, whose pages and result are then cached. parse performs that
+    last step and can be swapped for one that runs parse_pages elsewhere.
+    """
+    cached = cache.get(file_hash) if cache is not None else None
+    if cached is not None:
+        pages, complete, details, cached_version = cached
+        if details is not None and cached_version == details_version:
+            return dict(details)  # callers add fields; keep the cached copy clean
+        details, text = extract_details_from_pages(iter(pages), extract_details)
+        if complete or details_settled(details, text):
+            cache.put(file_hash, pages, complete, dict(details), details_version)
+            return details
+
+    details, pages_read, complete = parse(source, extract_details)
+    if cache is not None:
+        cache.put(file_hash, pages_read, complete, dict(details), details_version)
+    return details
@@ -1,64 +1,175 @@
+import argparse
 import email
 import imaplib
 import os
+import sys
 import datetime
 import hashlib
 from email.header import decode_header
-import gspread
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
-from google.oauth2.service_account import Credentials
-import re
 from io import BytesIO
-import pdfplumber
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+import clients
+from hash_store import ProcessedHashStore
+from sheet_sink import BatchedSheetWriter
+from drive_index import DriveHashIndex
+from storage import DriveBlobStore, LocalBlobStore, SQLiteApplicantStore
+from metrics import REGISTRY, timed
+from daemon import AlreadyRunning, PollingDaemon, run_lock
+from imap_incremental import IncrementalFetcher, MailboxState, is_pdf
+from pdf_text import extract_text, iter_page_text
+from resume_details import extract_details
+from extraction_cache import ExtractionCache, cached_extract_details
 
 # Load environment variables
 load_dotenv()
 
+def lock_file_path():
+    """LOCK_FILE, readable before a ResumeProcessor opens any store or client"""
+    return os.getenv('LOCK_FILE', os.path.join(os.getenv('LOCAL_FOLDER', 'Resume'), 'processor.lock'))
+
 class ResumeProcessor:
-    def __init__(self):
+    def __init__(self, drive_service_factory=None, sheet=None):
+        """drive_service_factory and sheet stand in for the Google APIs when
+        given (see _init_google_apis), e.g. local fakes for load tests."""
         # Configuration from environment variables
         self.LOCAL_FOLDER = os.getenv('LOCAL_FOLDER', 'Resume')
         self.DRIVE_FOLDER_ID = os.getenv('DRIVE_FOLDER_ID')
         self.SHEET_ID = os.getenv('SHEET_ID')
+        self.CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials.json')
+        self.MAX_WORKERS = int(os.getenv('MAX_WORKERS', '4'))
+        self.EXTRACTION_CACHE_MB = int(os.getenv('EXTRACTION_CACHE_MB', '256'))
+        self.IMAP_INCREMENTAL = os.getenv('IMAP_INCREMENTAL', 'true').lower() == 'true'
+        self.IMAP_HOST = os.getenv('IMAP_HOST', 'imap.gmail.com')
+        self.IMAP_PORT = int(os.getenv('IMAP_PORT', '993'))
+        self.IMAP_SSL = os.getenv('IMAP_SSL', 'true').lower() == 'true'
+        self.IMAP_MAX_ATTEMPTS = int(os.getenv('IMAP_MAX_ATTEMPTS', '5'))  # per message, then it is skipped
+        self.OCR_FALLBACK = os.getenv('OCR_FALLBACK', 'true').lower() == 'true'  # OCR scanned pages (ocr.py)
+        self.SHEET_BATCH_SIZE = int(os.getenv('SHEET_BATCH_SIZE', '50'))
+        self.SHEET_FLUSH_SECONDS = float(os.getenv('SHEET_FLUSH_SECONDS', '10'))
+        self.DRIVE_RESUMABLE_MB = int(os.getenv('DRIVE_RESUMABLE_MB', '5'))
+        self.DRIVE_CHUNK_MB = int(os.getenv('DRIVE_CHUNK_MB', '5'))  # multiple of 0.25 MB
+        self.METRICS_PORT = os.getenv('METRICS_PORT')  # serve /metrics locally when set
+        self.METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE')  # Prometheus textfile, written on close
+        self.METRICS_DIR = os.getenv('METRICS_DIR')  # per-run JSON summaries, off unless set
+        self.METRICS_KEEP = int(os.getenv('METRICS_KEEP', '100'))  # newest summaries kept in METRICS_DIR
+        self.BLOB_BACKEND = os.getenv('BLOB_BACKEND', 'drive').lower()  # drive | local
+        self.APPLICANT_BACKEND = os.getenv('APPLICANT_BACKEND', 'sheets').lower()  # sheets | sqlite | sqlite+sheets
+        self.STORE_DIR = os.getenv('STORE_DIR', 'store')  # local blobs and applicants.sqlite3
+        self.SHEET_MIRROR_SECONDS = float(os.getenv('SHEET_MIRROR_SECONDS', '5'))
+        self.DAEMON_INTERVAL_SECONDS = float(os.getenv('DAEMON_INTERVAL_SECONDS', '300'))
+        self.DAEMON_JITTER_SECONDS = float(os.getenv('DAEMON_JITTER_SECONDS', '30'))
+        self.LOCK_FILE = lock_file_path()  # one run at a time
+        self.USE_DRIVE = self.BLOB_BACKEND == 'drive'
+        self.USE_SHEETS = self.APPLICANT_BACKEND in ('sheets', 'sqlite+sheets')
+        if self.BLOB_BACKEND not in ('drive', 'local'):
+            raise ValueError(f"Unknown BLOB_BACKEND: {self.BLOB_BACKEND}")
+        if self.APPLICANT_BACKEND not in ('sheets', 'sqlite', 'sqlite+sheets'):
+            raise ValueError(f"Unknown APPLICANT_BACKEND: {self.APPLICANT_BACKEND}")
         
         # API Scopes
-        self.SCOPES_DRIVE = ["https://www.googleapis.com/auth/drive"]
-        self.SCOPES_SHEETS = ["https://www.googleapis.com/auth/spreadsheets"]
+        self.SCOPES_DRIVE = clients.DRIVE_SCOPES
+        self.SCOPES_SHEETS = clients.SHEETS_SCOPES
+        
+        # httplib2 (used by the Drive client) is not thread-safe, so each
+        # worker thread gets its own Drive service
+        self._thread_local = threading.local()
+        self._upload_executor = None
+        self._executor_lock = threading.Lock()
+        
+        # Stage timings, counters and byte counts (see metrics.py)
+        self.metrics = REGISTRY
+        if self.METRICS_PORT:
+            self.metrics.serve(int(self.METRICS_PORT))
         
         # Initialize APIs
-        self._init_google_apis()
+        self._init_google_apis(drive_service_factory, sheet)
+        
+        # Processed-hash index (migrates the old processed_files.txt on first run)
+        self.processed_hashes = ProcessedHashStore(self.LOCAL_FOLDER)
+        
+        # Last seen IMAP UID per mailbox for incremental fetches
+        self.imap_state = MailboxState(os.path.join(self.LOCAL_FOLDER, "imap_state.json"))
+        
+        # Extracted page text and details keyed by file hash + extractor version
+        self.extraction_cache = ExtractionCache(
+            os.path.join(self.LOCAL_FOLDER, "extraction_cache.sqlite3"),
+            max_bytes=self.EXTRACTION_CACHE_MB * 1024 * 1024
+        )
         
-        # Create hash storage file if it doesn't exist
-        self.hash_file = os.path.join(self.LOCAL_FOLDER, "processed_files.txt")
-        if not os.path.exists(self.hash_file):
-            with open(self.hash_file, 'w') as f:
-                f.write('')
+        # Local file_hash -> Drive file index, kept in sync via the changes feed
+        self.drive_index = None
+        if self.USE_DRIVE:
+            self.drive_index = DriveHashIndex(
+                os.path.join(self.LOCAL_FOLDER, "drive_index.sqlite3"),
+                self.DRIVE_FOLDER_ID,
+                lambda: self.drive_service
+            )
+        
+        # Where resume files and applicant rows go (see storage.py)
+        self._init_storage()
 
-    def _init_google_apis(self):
-        """Initialize Google Drive and Sheets APIs"""
-        try:
-            # Drive API setup
-            drive_creds = Credentials.from_service_account_file(
-                "credentials.json", 
-                scopes=self.SCOPES_DRIVE
+    def _init_google_apis(self, drive_service_factory=None, sheet=None):
+        """Set up the Google Drive and Sheets clients the configured backends use
+        
+        Nothing is authenticated here: the clients are created on first use
+        (see clients.py), so a run with no new mail never talks to Google.
+        drive_service_factory is called once per thread for a Drive client;
+        sheet is the worksheet rows go to. Both default to the real APIs
+        authenticated with credentials.json.
+        """
+        self._drive_service_factory = None
+        self.sheet_writer = None
+        
+        if self.USE_DRIVE:
+            if drive_service_factory is None:
+                drive_service_factory = lambda: clients.drive_service(self.CREDENTIALS_FILE, self.SCOPES_DRIVE)
+            self._drive_service_factory = drive_service_factory
+        
+        if self.USE_SHEETS:
+            if sheet is None:
+                sheet = lambda: clients.worksheet(self.SHEET_ID, self.CREDENTIALS_FILE, self.SCOPES_SHEETS)
+            self.sheet_writer = BatchedSheetWriter(
+                sheet,
+                batch_size=self.SHEET_BATCH_SIZE,
+                flush_interval=self.SHEET_FLUSH_SECONDS
             )
-            self.drive_service = build("drive", "v3", credentials=drive_creds)
-            
-            # Sheets API setup
-            sheets_creds = Credentials.from_service_account_file(
-                "credentials.json", 
-                scopes=self.SCOPES_SHEETS
+
+    def _init_storage(self):
+        """Pick the blob and applicant stores configured by BLOB_BACKEND / APPLICANT_BACKEND"""
+        if self.USE_DRIVE:
+            self.blob_store = DriveBlobStore(
+                lambda: self.drive_service,
+                self.drive_index,
+                self.DRIVE_FOLDER_ID,
+                chunk_size=self.DRIVE_CHUNK_MB * 1024 * 1024,
+                resumable_threshold=self.DRIVE_RESUMABLE_MB * 1024 * 1024
+            )
+        else:
+            self.blob_store = LocalBlobStore(os.path.join(self.STORE_DIR, "resumes"))
+        
+        if self.APPLICANT_BACKEND == 'sheets':
+            self.applicant_store = self.sheet_writer
+        else:
+            # SQLite is the system of record; with sqlite+sheets it also
+            # mirrors every row to the sheet in the background
+            os.makedirs(self.STORE_DIR, exist_ok=True)
+            self.applicant_store = SQLiteApplicantStore(
+                os.path.join(self.STORE_DIR, "applicants.sqlite3"),
+                mirror=self.sheet_writer,
+                mirror_interval=self.SHEET_MIRROR_SECONDS
             )
-            client = gspread.authorize(sheets_creds)
-            self.sheet = client.open_by_key(self.SHEET_ID).sheet1
-            
-            print("✅ Google APIs initialized successfully")
-        except Exception as e:
-            print(f"❌ Failed to initialize Google APIs: {str(e)}")
-            raise
+
+    @property
+    def drive_service(self):
+        """Drive API client for the calling thread"""
+        service = getattr(self._thread_local, "drive_service", None)
+        if service is None:
+            service = self._drive_service_factory()
+            self._thread_local.drive_service = service
+        return service
 
     def _calculate_file_hash(self, file_content):
         """Calculate SHA-256 hash of file content"""
@@ -66,85 +177,172 @@ class ResumeProcessor:
 
     def _is_file_processed(self, file_hash):
         """Check if file hash exists in processed files"""
-        with open(self.hash_file, 'r') as f:
-            processed_hashes = f.read().splitlines()
-        return file_hash in processed_hashes
+        return file_hash in self.processed_hashes
 
     def _mark_file_processed(self, file_hash):
         """Add file hash to processed files"""
-        with open(self.hash_file, 'a') as f:
-            f.write(f"{file_hash}\n")
+        self.processed_hashes.add(file_hash)
 
     def _is_duplicate_in_sheets(self, email):
-        """Check if email already exists in Google Sheets"""
-        existing_emails = self.sheet.col_values(2)[1:]  # Skip header
-        return email in existing_emails
+        """Check if email is already among the stored applicants"""
+        return self.applicant_store.contains_email(email)
+
+    def _save_attachment(self, filename, content, file_hash=None):
+        """Save a PDF attachment unless its hash was already processed"""
+        if file_hash is None:
+            file_hash = self._calculate_file_hash(content)
+        
+        # Check if file was already processed
+        if self._is_file_processed(file_hash):
+            print(f"ℹ️ Skipping duplicate file: {filename}")
+            self.metrics.inc("duplicate_attachments")
+            return None
+        
+        # Save new file
+        filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.'))
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        new_filename = f"{timestamp}_{file_hash[:8]}_{filename}"  # same name, same second: still distinct
+        filepath = os.path.join(self.LOCAL_FOLDER, new_filename)
+        
+        with open(filepath, "wb") as f:
+            f.write(content)
+        
+        # Mark file as processed
+        self._mark_file_processed(file_hash)
+        self.metrics.inc("attachments_saved")
+        self.metrics.add_bytes("fetched", len(content))
+        print(f"✅ Saved new file: {new_filename}")
+        return filepath
+
+    def _iter_message_pdfs(self, mail, search_criteria):
+        """Yield (filename, content) for PDF attachments of every matching message"""
+        mail.select("inbox")
+        status, message_numbers = mail.search(None, search_criteria)
+        
+        if status != 'OK' or not message_numbers[0]:
+            print("ℹ️ No matching emails found")
+            return
+        
+        print(f"📥 Found {len(message_numbers[0].split())} matching emails")
+        
+        for num in message_numbers[0].split():
+            try:
+                _, msg_data = mail.fetch(num, "(RFC822)")
+                email_message = email.message_from_bytes(msg_data[0][1])
+                
+                subject = decode_header(email_message["subject"])[0][0]
+                if isinstance(subject, bytes):
+                    subject = subject.decode()
+                
+                sender = email_message.get("from")
+                print(f"\n📨 Processing email from: {sender}")
+                
+                pdfs = []
+                for part in email_message.walk():
+                    if part.get_content_maintype() == "multipart" or part.get("Content-Disposition") is None:
+                        continue
+                    
+                    filename = part.get_filename()
+                    if filename and filename.lower().endswith('.pdf'):
+                        pdfs.append((filename, part.get_payload(decode=True)))
+            
+            except Exception as e:
+                print(f"⚠️ Error processing email: {str(e)}")
+                continue
+            
+            yield from pdfs
+
+    def _fetch_full_messages(self, mail, search_criteria):
+        """Download every matching message in full and save its PDF attachments"""
+        saved_files = []
+        for filename, content in self._iter_message_pdfs(mail, search_criteria):
+            filepath = self._save_attachment(filename, content)
+            if filepath:
+                saved_files.append(filepath)
+        return saved_files
+
+    def _iter_pdf_parts(self, fetcher, uid):
+        """Yield (filename, content) for the PDF parts of one message"""
+        for section, filename, encoding, size in fetcher.attachment_parts(uid):
+            if not is_pdf(filename):
+                continue
+            yield filename, fetcher.fetch_part(uid, section, encoding)
+
+    def fetch_new_attachments(self, fetcher, search_criteria):
+        """Save PDF parts of messages newer than the fetcher's last seen UID"""
+        saved_files = []
+        uids = fetcher.new_uids(search_criteria)
+        if not uids:
+            print("ℹ️ No new matching emails")
+            return saved_files
+        
+        print(f"📥 Found {len(uids)} new matching emails")
+        
+        for uid in uids:
+            try:
+                for filename, content in self._iter_pdf_parts(fetcher, uid):
+                    filepath = self._save_attachment(filename, content)
+                    if filepath:
+                        saved_files.append(filepath)
+            except Exception as e:
+                if self._retry_message_later(fetcher, uid, e):
+                    break
+            self.imap_state.update(fetcher.key, fetcher.uidvalidity, uid)
+        
+        return saved_files
+
+    def _retry_message_later(self, fetcher, uid, error):
+        """Whether a failed message should hold the watermark for another poll
+
+        The last seen UID stays before the message, so the next poll retries
+        it (and everything after it; saved parts are deduped). After
+        IMAP_MAX_ATTEMPTS failures it is skipped instead, so one message
+        that can never be read doesn't stop intake for good.
+        """
+        attempts = self.imap_state.record_failure(fetcher.key, fetcher.uidvalidity, uid)
+        if attempts < self.IMAP_MAX_ATTEMPTS:
+            print(f"⚠️ Error processing email UID {uid}, will retry next poll "
+                  f"(attempt {attempts}/{self.IMAP_MAX_ATTEMPTS}): {str(error)}")
+            return True
+        self.metrics.inc("skipped_messages")
+        print(f"❌ Skipping email UID {uid} after {attempts} failed attempts: {str(error)}")
+        return False
+
+    def _connect_imap(self, email_address, password):
+        """Logged-in IMAP connection to Gmail (or IMAP_HOST)"""
+        print("📧 Connecting to Gmail...")
+        if self.IMAP_SSL:
+            mail = imaplib.IMAP4_SSL(self.IMAP_HOST, self.IMAP_PORT)
+        else:
+            mail = imaplib.IMAP4(self.IMAP_HOST, self.IMAP_PORT)
+        mail.login(email_address, password)
+        print("✅ Gmail login successful")
+        return mail
 
-    def fetch_email_attachments(self, email_address, password, search_criteria='(SUBJECT "Job Application")'):
-        """Fetch attachments from Gmail"""
+    @timed("fetch")
+    def fetch_email_attachments(self, email_address, password, search_criteria='(SUBJECT "Job Application")',
+                                incremental=None):
+        """Fetch attachments from Gmail
+        
+        In incremental mode (the default, see IMAP_INCREMENTAL) only messages
+        with a UID above the last one seen are looked at, and only their PDF
+        parts are downloaded.
+        """
+        if incremental is None:
+            incremental = self.IMAP_INCREMENTAL
         if not os.path.exists(self.LOCAL_FOLDER):
             os.makedirs(self.LOCAL_FOLDER)
         
         saved_files = []
         try:
-            print("📧 Connecting to Gmail...")
-            mail = imaplib.IMAP4_SSL("imap.gmail.com")
-            mail.login(email_address, password)
-            print("✅ Gmail login successful")
-            
-            mail.select("inbox")
-            status, message_numbers = mail.search(None, search_criteria)
-            
-            if status != 'OK' or not message_numbers[0]:
-                print("ℹ️ No matching emails found")
-                return saved_files
+            mail = self._connect_imap(email_address, password)
             
-            print(f"📥 Found {len(message_numbers[0].split())} matching emails")
-            
-            for num in message_numbers[0].split():
-                try:
-                    _, msg_data = mail.fetch(num, "(RFC822)")
-                    email_message = email.message_from_bytes(msg_data[0][1])
-                    
-                    subject = decode_header(email_message["subject"])[0][0]
-                    if isinstance(subject, bytes):
-                        subject = subject.decode()
-                    
-                    sender = email_message.get("from")
-                    print(f"\n📨 Processing email from: {sender}")
-                    
-                    for part in email_message.walk():
-                        if part.get_content_maintype() == "multipart" or part.get("Content-Disposition") is None:
-                            continue
-                        
-                        filename = part.get_filename()
-                        if filename and filename.lower().endswith('.pdf'):
-                            # Get file content and calculate hash
-                            content = part.get_payload(decode=True)
-                            file_hash = self._calculate_file_hash(content)
-                            
-                            # Check if file was already processed
-                            if self._is_file_processed(file_hash):
-                                print(f"ℹ️ Skipping duplicate file: {filename}")
-                                continue
-                            
-                            # Save new file
-                            filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.'))
-                            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                            new_filename = f"{timestamp}_{filename}"
-                            filepath = os.path.join(self.LOCAL_FOLDER, new_filename)
-                            
-                            with open(filepath, "wb") as f:
-                                f.write(content)
-                            
-                            # Mark file as processed
-                            self._mark_file_processed(file_hash)
-                            saved_files.append(filepath)
-                            print(f"✅ Saved new file: {new_filename}")
-                
-                except Exception as e:
-                    print(f"⚠️ Error processing email: {str(e)}")
-                    continue
+            if incremental:
+                fetcher = IncrementalFetcher(mail, self.imap_state, email_address, mailbox="inbox")
+                fetcher.select()
+                saved_files = self.fetch_new_attachments(fetcher, search_criteria)
+            else:
+                saved_files = self._fetch_full_messages(mail, search_criteria)
             
             mail.close()
             mail.logout()
@@ -162,52 +360,35 @@ class ResumeProcessor:
         return saved_files
 
     def _file_exists_in_drive(self, file_hash):
-        """Check if file exists in Google Drive using custom properties"""
-        query = f"'{self.DRIVE_FOLDER_ID}' in parents and trashed=false"
-        results = self.drive_service.files().list(
-            q=query,
-            fields="files(id, name, properties)",
-            supportsAllDrives=True
-        ).execute()
-        
-        for file in results.get('files', []):
-            if file.get('properties', {}).get('file_hash') == file_hash:
-                return file
-        return None
-
-    def upload_to_drive(self, file_path):
-        """Upload a single file to Google Drive"""
+        """Check if file is already stored (Drive: by its file_hash property)"""
+        return self.blob_store.lookup(file_hash)
+
+    @timed("upload")
+    def upload_to_drive(self, file_path, file_hash=None):
+        """Store a single file in the blob store (Google Drive by default)"""
         # Calculate file hash
-        with open(file_path, 'rb') as f:
-            file_hash = self._calculate_file_hash(f.read())
+        if file_hash is None:
+            with open(file_path, 'rb') as f:
+                file_hash = self._calculate_file_hash(f.read())
         
-        # Check for duplicate in Drive
+        # Check for duplicate in the blob store
         existing_file = self._file_exists_in_drive(file_hash)
         if existing_file:
-            print(f"ℹ️ File already exists in Drive")
+            print(f"ℹ️ File already exists in {self.blob_store.name}")
+            self.metrics.inc("drive_duplicates")
             return existing_file["id"], existing_file.get("webViewLink")
         
-        # Prepare file metadata with hash property
-        file_name = os.path.basename(file_path)
-        file_metadata = {
-            "name": file_name,
-            "parents": [self.DRIVE_FOLDER_ID],
-            "properties": {"file_hash": file_hash}
-        }
-        
-        media = MediaFileUpload(file_path, mimetype="application/pdf")
-        uploaded_file = self.drive_service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields="id, webViewLink",
-            supportsAllDrives=True
-        ).execute()
-        
-        print(f"✅ Uploaded new file to Drive: {file_name}")
+        uploaded_file = self.blob_store.put(file_path, file_hash)
+        self.metrics.add_bytes("uploaded", os.path.getsize(file_path))
+        
+        print(f"✅ Uploaded new file to {self.blob_store.name}: {os.path.basename(file_path)}")
         return uploaded_file["id"], uploaded_file["webViewLink"]
 
+    @timed("extract_text")
     def extract_text_from_pdf(self, file_id):
-        """Extract text from PDF in Google Drive"""
+        """Extract text from PDF in Google Drive (for files with no local copy)"""
+        from googleapiclient.http import MediaIoBaseDownload
+        
         request = self.drive_service.files().get_media(fileId=file_id)
         file_stream = BytesIO()
         downloader = MediaIoBaseDownload(file_stream, request)
@@ -216,56 +397,115 @@ class ResumeProcessor:
         while not done:
             _, done = downloader.next_chunk()
         
-        text = ""
-        file_stream.seek(0)
-        with pdfplumber.open(file_stream) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n" if page.extract_text() else ""
-        
-        return text
+        self.metrics.add_bytes("downloaded", file_stream.tell())
+        return self.extract_text_from_bytes(file_stream.getvalue())
+
+    def extract_text_from_bytes(self, content):
+        """Extract text from PDF bytes already held in memory"""
+        return extract_text(content)
 
     def extract_details(self, text):
         """Extract candidate details from text"""
-        email_pattern = r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+"
-        phone_pattern = r"\+?\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}"
-        
-        email = re.findall(email_pattern, text)
-        phone = re.findall(phone_pattern, text)
-        
-        # Try to find name in first few lines
-        name_lines = text.split("\n")[:5]
-        name = "N/A"
-        for line in name_lines:
-            if len(line.split()) >= 2:
-                name = line.strip()
-                break
-        
-        return {
-            "Name": name,
-            "Email": email[0] if email else "N/A",
-            "Phone": phone[0] if phone else "N/A"
-        }
+        return extract_details(text)
 
+    @timed("save")
     def save_to_sheet(self, data):
-        """Save data to Google Sheets"""
-        # Ensure headers exist
-        headers = ["Name", "Email Address", "Phone No", "Google Drive Link"]
-        if not self.sheet.row_values(1):
-            self.sheet.insert_row(headers, 1)
-        
-        # Check for duplicates
-        if self._is_duplicate_in_sheets(data["Email"]):
+        """Queue data for the applicant store (Sheets rows are written in batches)"""
+        row = [data["Name"], data["Email"], data["Phone"], data["Drive Link"]]
+        if not self.applicant_store.add(row):
             print(f"ℹ️ Entry already exists for {data['Email']}")
+            self.metrics.inc("sheet_duplicates")
             return False
-        
-        self.sheet.append_row([
-            data["Name"],
-            data["Email"],
-            data["Phone"],
-            data["Drive Link"]
-        ])
         return True
 
+    def listen(self, email_address, password, search_criteria='(SUBJECT "Job Application")'):
+        """Hold one IMAP connection in IDLE and process new resumes as they arrive"""
+        from idle_listener import IdleListener
+        
+        listener = IdleListener(self, email_address, password, search_criteria=search_criteria,
+                                host=self.IMAP_HOST, port=self.IMAP_PORT, use_ssl=self.IMAP_SSL)
+        try:
+            listener.run()
+        except KeyboardInterrupt:
+            listener.stop()
+        return listener
+
+    def run_daemon(self, email_address, password, search_criteria='(SUBJECT "Job Application")'):
+        """Poll every DAEMON_INTERVAL_SECONDS (+ jitter) in this process until SIGTERM / Ctrl+C"""
+        daemon = PollingDaemon(
+            self, email_address, password,
+            search_criteria=search_criteria,
+            interval=self.DAEMON_INTERVAL_SECONDS,
+            jitter=self.DAEMON_JITTER_SECONDS,
+            lock_path=self.LOCK_FILE
+        )
+        daemon.run()
+        return daemon
+
+    def _get_upload_executor(self):
+        """Thread pool for Drive uploads that overlap with text extraction"""
+        with self._executor_lock:
+            if self._upload_executor is None:
+                self._upload_executor = ThreadPoolExecutor(
+                    max_workers=max(self.MAX_WORKERS, 1),
+                    thread_name_prefix="upload"
+                )
+            return self._upload_executor
+
+    def close(self):
+        """Flush queued applicant rows and close the stores and local indexes"""
+        if self._upload_executor is not None:
+            self._upload_executor.shutdown(wait=True)
+            self._upload_executor = None
+        self.applicant_store.close()
+        self.blob_store.close()
+        self.extraction_cache.close()
+        self.processed_hashes.close()
+        if "ocr" in sys.modules:  # the OCR fallback started worker processes
+            sys.modules["ocr"].shutdown_pool()
+        self.export_metrics()
+
+    def export_metrics(self):
+        """Write the Prometheus textfile and this run's JSON summary, if configured"""
+        try:
+            if self.METRICS_TEXTFILE:
+                self.metrics.write_textfile(self.METRICS_TEXTFILE)
+            if self.METRICS_DIR:
+                path = self.metrics.write_summary(self.METRICS_DIR, keep=self.METRICS_KEEP)
+                print(f"📈 Run metrics written to {path}")
+        except OSError as e:
+            print(f"⚠️ Could not write metrics: {str(e)}")
+
+    def ocr_fallback(self, file_path, file_hash, details):
+        """Details from OCR'd text for a resume with scanned pages and no email
+        
+        Only pages without a text layer are OCR'd. Their text layers come
+        from the extraction cache (a resume without an email was read to
+        the end), so the PDF is not parsed again. Needs pytesseract,
+        pdf2image and the tesseract / poppler binaries; without them, or
+        with OCR_FALLBACK=false, the text-layer details are kept.
+        """
+        if not self.OCR_FALLBACK or details.get("Email") != "N/A":
+            return details
+        cached = self.extraction_cache.get(file_hash)
+        page_texts = cached[0] if cached is not None and cached[1] else list(iter_page_text(file_path))
+        if all(text.strip() for text in page_texts):
+            return details  # a text PDF that just has no email
+        try:
+            import ocr
+            text = ocr.ocr_extract_text(file_path, page_texts=page_texts, file_hash=file_hash,
+                                        cache=ocr.OCRCache(os.path.join(self.LOCAL_FOLDER, ".ocr_cache")))
+        except ImportError:
+            print("⚠️ OCR fallback unavailable: pytesseract / pdf2image not installed (set OCR_FALLBACK=false)")
+            self.OCR_FALLBACK = False
+            return details
+        except Exception as e:
+            print(f"⚠️ OCR fallback failed for {os.path.basename(file_path)}: {str(e)}")
+            return details
+        ocr_details = self.extract_details(text)
+        return ocr_details if ocr_details["Email"] != "N/A" else details
+
+    @timed("resume")
     def process_resume(self, file_path):
         """Process a single resume"""
         try:
@@ -274,14 +514,14 @@ class ResumeProcessor:
                 content = f.read()
                 file_hash = self._calculate_file_hash(content)
             
-            # Upload to Drive (handles duplicates internally)
-            file_id, drive_link = self.upload_to_drive(file_path)
-            
-            # Extract text
-            text = self.extract_text_from_pdf(file_id)
-            
-            # Extract details
-            details = self.extract_details(text)
+            # Upload to Drive (handles duplicates internally) while the
+            # details are extracted from the bytes we already have (or
+            # served from the extraction cache for a resume seen before)
+            upload = self._get_upload_executor().submit(self.upload_to_drive, file_path, file_hash)
+            with self.metrics.time("extract_details"):
+                details = cached_extract_details(self.extraction_cache, file_hash, content, self.extract_details)
+                details = self.ocr_fallback(file_path, file_hash, details)
+            file_id, drive_link = upload.result()
             details["Drive Link"] = drive_link
             
             # Save to sheet (handles duplicates internally)
@@ -292,12 +532,68 @@ class ResumeProcessor:
             os.remove(file_path)
             print(f"✅ Removed local file: {os.path.basename(file_path)}")
             
+            self.metrics.inc("processed")
             return True
         except Exception as e:
             print(f"❌ Error processing resume {file_path}: {str(e)}")
+            self.metrics.inc("failures")
             return False
 
+    def prefetch_drive_lookups(self, file_paths):
+        """Resolve blob store duplicates for a whole intake in batched requests
+        
+        With Drive, upload_to_drive then finds every answer in the local
+        index instead of querying Drive once per file.
+        """
+        hashes = []
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'rb') as f:
+                    hashes.append(self._calculate_file_hash(f.read()))
+            except OSError:
+                continue  # process_resume reports it
+        try:
+            self.blob_store.lookup_many(hashes)
+        except Exception as e:
+            print(f"⚠️ Batched Drive lookup failed, checking files one by one: {str(e)}")
+
+    def process_resumes(self, file_paths, max_workers=None):
+        """Process many resumes concurrently with a bounded worker pool
+        
+        Each resume goes through process_resume, so a failure in one file
+        never affects the others. Returns the number of resumes processed
+        successfully.
+        """
+        max_workers = max_workers or self.MAX_WORKERS
+        if len(file_paths) > 1:
+            self.prefetch_drive_lookups(file_paths)
+        
+        if max_workers <= 1:
+            processed = 0
+            for file_path in file_paths:
+                if self.process_resume(file_path):
+                    processed += 1
+                time.sleep(1)  # Avoid API rate limits
+            return processed
+        
+        processed = 0
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resume") as executor:
+            futures = [executor.submit(self.process_resume, path) for path in file_paths]
+            for future in as_completed(futures):
+                if future.result():
+                    processed += 1
+        return processed
+
 def main():
+    parser = argparse.ArgumentParser(description="Fetch resumes from email and store them in Drive and Sheets")
+    parser.add_argument("--listen", action="store_true",
+                        help="stay connected and process new mail as it arrives (IMAP IDLE)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run fetch, upload, extraction and sheet writes as overlapping asyncio stages")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running, polling every DAEMON_INTERVAL_SECONDS with warm clients")
+    args = parser.parse_args()
+    
     # Get credentials from environment variables
     EMAIL = os.getenv('EMAIL')
     PASSWORD = os.getenv('PASSWORD')
@@ -305,24 +601,63 @@ def main():
     if not all([EMAIL, PASSWORD]):
         raise ValueError("Missing required environment variables. Please check your .env file.")
     
-    # Initialize processor
-    processor = ResumeProcessor()
-    
-    # Fetch new resumes from email
-    print("\n1️⃣ Fetching resumes from email...")
-    saved_files = processor.fetch_email_attachments(EMAIL, PASSWORD)
+    # Take the lock before building the processor, so a run that is skipped
+    # never opens the stores, the Google clients or METRICS_PORT
+    try:
+        with run_lock(lock_file_path()):
+            processor = ResumeProcessor()
+            if args.daemon:
+                try:
+                    processor.run_daemon(EMAIL, PASSWORD)  # re-enters the lock held here
+                finally:
+                    processor.close()
+            else:
+                run_once(processor, args, EMAIL, PASSWORD)
+    except AlreadyRunning as e:
+        print(f"⏭️ {'Not starting' if args.daemon else 'Skipping this run'}: {str(e)}")
+
+def run_once(processor, args, EMAIL, PASSWORD):
+    """One --listen, --pipeline or batch run; closes the processor"""
+    if args.listen:
+        print("\n👂 Listening for new resumes (Ctrl+C to stop)...")
+        try:
+            processor.listen(EMAIL, PASSWORD)
+        finally:
+            processor.close()
+        return
     
-    if not saved_files:
-        print("ℹ️ No new resumes to process")
+    if args.pipeline:
+        from notifier import NotificationDispatcher
+        from pipeline import ResumePipeline
+        
+        print("\n🚰 Running staged pipeline...")
+        notifier = NotificationDispatcher.from_env()
+        try:
+            stats = ResumePipeline.from_env(processor, notifier=notifier).run(EMAIL, PASSWORD)
+        finally:
+            processor.close()
+            if notifier is not None:
+                notifier.close()
+        print(f"\n✨ Resume processing complete! {stats['saved']} saved, "
+              f"{stats['duplicates']} duplicates, {stats['failed']} failed")
         return
     
-    # Process each resume
-    print("\n2️⃣ Processing resumes...")
-    for file_path in saved_files:
-        processor.process_resume(file_path)
-        time.sleep(1)  # Avoid API rate limits
+    try:
+        # Fetch new resumes from email
+        print("\n1️⃣ Fetching resumes from email...")
+        saved_files = processor.fetch_email_attachments(EMAIL, PASSWORD)
+        
+        if not saved_files:
+            print("ℹ️ No new resumes to process")
+            return
+        
+        # Process resumes with a bounded worker pool
+        print(f"\n2️⃣ Processing resumes ({processor.MAX_WORKERS} workers)...")
+        processed = processor.process_resumes(saved_files)
+    finally:
+        processor.close()
     
-    print("\n✨ Resume processing complete!")
+    print(f"\n✨ Resume processing complete! {processed}/{len(saved_files)} succeeded")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
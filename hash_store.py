@@ -0,0 +1,303 @@
+import mmap
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+
+
+DIGEST_SIZE = 32  # SHA-256
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter for SHA-256 digests
+
+    The digests are already uniformly distributed, so the bit positions are
+    taken straight from slices of the digest instead of re-hashing it.
+    """
+
+    HEADER_SIZE = 12  # 8-byte item count + 4-byte hash count
+
+    def __init__(self, capacity, bits_per_item=10, num_hashes=7, bits=None):
+        self.capacity = max(int(capacity), 1024)
+        self.num_hashes = num_hashes
+        self.num_bits = self.capacity * bits_per_item
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.num_bits = len(self.bits) * 8
+
+    def _positions(self, digest):
+        for i in range(self.num_hashes):
+            yield int.from_bytes(digest[i * 4:(i + 1) * 4], "big") % self.num_bits
+
+    def add(self, digest):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+    def to_bytes(self, count):
+        return count.to_bytes(8, "big") + self.num_hashes.to_bytes(4, "big") + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Return (filter, item_count) from a serialized filter"""
+        count = int.from_bytes(data[:8], "big")
+        num_hashes = int.from_bytes(data[8:12], "big")
+        bits = bytearray(data[cls.HEADER_SIZE:])
+        bloom = cls(capacity=len(bits) * 8, num_hashes=num_hashes, bits=bits)
+        return bloom, count
+
+
+class ProcessedHashStore:
+    """Persistent set of processed file hashes
+
+    Layout inside ``folder``:
+      <name>.idx    sorted binary SHA-256 digests, memory-mapped, binary searched
+      <name>.bloom  Bloom filter over the .idx digests, checked before the index
+      <name>.log    append-only journal of digests added since the last compaction
+      <name>.lock   advisory lock file shared by all writers
+
+    Additions go to the journal under an exclusive lock, so several
+    processes can record hashes at once. The journal is merged into the
+    sorted index once it grows past ``compact_threshold`` entries. A legacy
+    ``processed_files.txt`` (one hex digest per line) is migrated on first use.
+    """
+
+    def __init__(self, folder, name="processed_hashes", legacy_file="processed_files.txt",
+                 compact_threshold=4096):
+        os.makedirs(folder, exist_ok=True)
+        self.index_path = os.path.join(folder, f"{name}.idx")
+        self.bloom_path = os.path.join(folder, f"{name}.bloom")
+        self.journal_path = os.path.join(folder, f"{name}.log")
+        self.lock_path = os.path.join(folder, f"{name}.lock")
+        self.legacy_path = os.path.join(folder, legacy_file) if legacy_file else None
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._mmap = None
+        self._index_file = None
+        self._index_count = 0
+        self._index_ino = None
+        self._bloom = None
+        self._pending = set()
+        self._journal_offset = 0
+
+        self._migrate_legacy_file()
+        self._load()
+
+    # -- locking -------------------------------------------------------------
+
+    def _flock(self, exclusive):
+        handle = open(self.lock_path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return handle
+
+    @staticmethod
+    def _funlock(handle):
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    # -- loading -------------------------------------------------------------
+
+    def _close_index(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        self._index_count = 0
+        self._index_ino = None
+
+    def _load(self):
+        """(Re)load the index, Bloom filter and journal from disk"""
+        lock = self._flock(exclusive=False)
+        try:
+            self._close_index()
+            self._pending = set()
+            self._journal_offset = 0
+
+            if os.path.exists(self.index_path):
+                self._index_file = open(self.index_path, "rb")
+                self._index_ino = os.fstat(self._index_file.fileno()).st_ino
+                if os.fstat(self._index_file.fileno()).st_size:
+                    self._mmap = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._index_count = len(self._mmap) // DIGEST_SIZE
+
+            self._bloom = None
+            if os.path.exists(self.bloom_path):
+                with open(self.bloom_path, "rb") as f:
+                    bloom, count = BloomFilter.from_bytes(f.read())
+                if count == self._index_count:
+                    self._bloom = bloom
+            if self._bloom is None:
+                # Missing or stale filter: rebuild it from the index
+                self._bloom = BloomFilter(capacity=self._index_count * 2)
+                for i in range(self._index_count):
+                    self._bloom.add(self._mmap[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE])
+
+            self._read_journal()
+        finally:
+            self._funlock(lock)
+
+    def _read_journal(self):
+        """Pick up journal entries appended since the last read"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            data = f.read()
+        usable = len(data) - len(data) % DIGEST_SIZE  # ignore a partially written tail
+        for i in range(0, usable, DIGEST_SIZE):
+            self._pending.add(data[i:i + DIGEST_SIZE])
+        self._journal_offset += usable
+
+    def _refresh(self):
+        """Catch up with writes made by other processes since we loaded"""
+        try:
+            index_ino = os.stat(self.index_path).st_ino
+        except FileNotFoundError:
+            index_ino = None
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            journal_size = 0
+
+        if index_ino != self._index_ino or journal_size < self._journal_offset:
+            self._load()  # another process compacted the store
+        elif journal_size > self._journal_offset:
+            self._read_journal()
+
+    # -- lookups -------------------------------------------------------------
+
+    def _index_contains(self, digest):
+        if not self._index_count or digest not in self._bloom:
+            return False
+        mm = self._mmap
+        lo, hi = 0, self._index_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = mm[mid * DIGEST_SIZE:(mid + 1) * DIGEST_SIZE]
+            if probe == digest:
+                return True
+            if probe < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+    def __contains__(self, file_hash):
+        digest = bytes.fromhex(file_hash)
+        with self._lock:
+            if digest in self._pending or self._index_contains(digest):
+                return True
+            self._refresh()
+            return digest in self._pending or self._index_contains(digest)
+
+    def __len__(self):
+        with self._lock:
+            return self._index_count + len(self._pending)
+
+    # -- writes --------------------------------------------------------------
+
+    def add(self, file_hash):
+        """Record a processed file hash"""
+        digest = bytes.fromhex(file_hash)
+        with self._lock:
+            if digest in self._pending or self._index_contains(digest):
+                return
+            lock = self._flock(exclusive=True)
+            try:
+                self._refresh_journal_locked()
+                if digest not in self._pending:
+                    fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    try:
+                        os.write(fd, digest)
+                    finally:
+                        os.close(fd)
+                    self._pending.add(digest)
+                    self._journal_offset += DIGEST_SIZE
+            finally:
+                self._funlock(lock)
+
+            if len(self._pending) >= self.compact_threshold:
+                self.compact()
+
+    def _refresh_journal_locked(self):
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            journal_size = 0
+        if journal_size > self._journal_offset:
+            self._read_journal()
+
+    def compact(self):
+        """Merge the journal into the sorted index and rewrite the Bloom filter"""
+        with self._lock:
+            lock = self._flock(exclusive=True)
+            try:
+                digests = set()
+                if os.path.exists(self.index_path):
+                    with open(self.index_path, "rb") as f:
+                        data = f.read()
+                    digests.update(data[i:i + DIGEST_SIZE] for i in range(0, len(data), DIGEST_SIZE))
+                if os.path.exists(self.journal_path):
+                    with open(self.journal_path, "rb") as f:
+                        data = f.read()
+                    usable = len(data) - len(data) % DIGEST_SIZE
+                    digests.update(data[i:i + DIGEST_SIZE] for i in range(0, usable, DIGEST_SIZE))
+
+                ordered = sorted(digests)
+                bloom = BloomFilter(capacity=len(ordered) * 2)
+                for digest in ordered:
+                    bloom.add(digest)
+
+                self._write_atomic(self.index_path, b"".join(ordered))
+                self._write_atomic(self.bloom_path, bloom.to_bytes(len(ordered)))
+                with open(self.journal_path, "wb"):
+                    pass
+            finally:
+                self._funlock(lock)
+            self._load()
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _migrate_legacy_file(self):
+        """Import hashes from the old processed_files.txt, then retire it"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        lock = self._flock(exclusive=True)
+        try:
+            if not os.path.exists(self.legacy_path):
+                return  # another process migrated it first
+            with open(self.legacy_path, "r") as f:
+                hashes = [line.strip() for line in f if line.strip()]
+            with open(self.journal_path, "ab") as journal:
+                for file_hash in hashes:
+                    try:
+                        digest = bytes.fromhex(file_hash)
+                    except ValueError:
+                        continue  # not a hex digest
+                    if len(digest) == DIGEST_SIZE:
+                        journal.write(digest)
+            os.replace(self.legacy_path, f"{self.legacy_path}.migrated")
+            print(f"✅ Migrated {len(hashes)} hashes from {os.path.basename(self.legacy_path)}")
+        finally:
+            self._funlock(lock)
+        self.compact()
+
+    def close(self):
+        with self._lock:
+            self._close_index()
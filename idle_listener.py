@@ -0,0 +1,97 @@
+import threading
+
+import imaplib2
+
+from imap_incremental import IncrementalFetcher
+
+
+class IdleListener:
+    """Long-running IMAP IDLE listener that feeds new mail into a ResumeProcessor
+
+    One authenticated connection is held open and parked in IDLE, so the
+    server pushes new-message notifications instead of us polling. Each
+    wake-up runs an incremental UID fetch on the same connection and sends
+    the saved resumes straight to the processor. Dropped connections are
+    re-established with exponential backoff; because the last seen UID is
+    persisted, nothing that arrived while disconnected is missed.
+    """
+
+    def __init__(self, processor, email_address, password, search_criteria='(SUBJECT "Job Application")',
+                 mailbox="inbox", host="imap.gmail.com", port=993, use_ssl=True, idle_timeout=25 * 60,
+                 max_backoff=300):
+        self.processor = processor
+        self.email_address = email_address
+        self.password = password
+        self.search_criteria = search_criteria
+        self.mailbox = mailbox
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl  # False for a plain-text server such as a local test one
+        self.idle_timeout = idle_timeout  # Gmail ends IDLE after ~29 minutes
+        self.max_backoff = max_backoff
+
+        self.mail = None
+        self.fetcher = None
+        self._stop = threading.Event()
+
+    def _connect(self):
+        print("📧 Connecting to IMAP for IDLE...")
+        if self.use_ssl:
+            self.mail = imaplib2.IMAP4_SSL(self.host, self.port)
+        else:
+            self.mail = imaplib2.IMAP4(self.host, self.port)
+        self.mail.login(self.email_address, self.password)
+        self.fetcher = IncrementalFetcher(self.mail, self.processor.imap_state, self.email_address, self.mailbox)
+        self.fetcher.select()
+        print("✅ IMAP connection ready, waiting for new mail")
+
+    def _disconnect(self):
+        if self.mail is None:
+            return
+        try:
+            self.mail.logout()
+        except Exception:
+            pass
+        self.mail = None
+        self.fetcher = None
+
+    def _drain(self):
+        """Process everything that arrived since the last seen UID"""
+        saved_files = self.processor.fetch_new_attachments(self.fetcher, self.search_criteria)
+        if saved_files:
+            processed = self.processor.process_resumes(saved_files)
+            self.processor.applicant_store.flush()
+            print(f"✨ Processed {processed}/{len(saved_files)} new resumes")
+
+    def run(self):
+        """Block, processing new mail as it arrives, until stop() is called"""
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                if self.mail is None:
+                    self._connect()
+                    self._drain()  # catch up on anything missed while offline
+                backoff = 1
+
+                self.mail.idle(timeout=self.idle_timeout)
+                if self._stop.is_set():
+                    break
+                self._drain()
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                print(f"⚠️ IMAP listener error: {str(e)}; reconnecting in {backoff}s")
+                self._disconnect()
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+        self._disconnect()
+        print("👋 IMAP listener stopped")
+
+    def stop(self):
+        """Ask run() to return; interrupts a pending IDLE"""
+        self._stop.set()
+        if self.mail is not None:
+            try:
+                self.mail.noop()  # any command ends the current IDLE
+            except Exception:
+                pass
@@ -0,0 +1,265 @@
+import base64
+import json
+import os
+import quopri
+import re
+import threading
+from email.header import decode_header, make_header
+from email.utils import collapse_rfc2231_value, decode_rfc2231
+
+
+# -- BODYSTRUCTURE parsing ----------------------------------------------------
+
+_TOKEN_RE = re.compile(rb'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|\{(\d+)\}\r\n|([^\s()"{]+))', re.S)
+
+
+def _join_response(data):
+    """Flatten an imaplib FETCH response, putting literals back in place"""
+    raw = b""
+    for item in data:
+        if isinstance(item, tuple):
+            raw += item[0] + b"\r\n" + item[1]
+        elif item:
+            raw += item
+    return raw
+
+
+def parse_sexp(raw):
+    """Parse an IMAP parenthesized list into nested Python lists
+
+    Strings come back as ``str``, numbers as ``int`` and NIL as ``None``.
+    """
+    stack = [[]]
+    pos = 0
+    while pos < len(raw):
+        match = _TOKEN_RE.match(raw, pos)
+        if not match or match.end() == pos:
+            break
+        pos = match.end()
+        open_paren, close_paren, quoted, literal_len, atom = match.groups()
+        if open_paren:
+            stack.append([])
+        elif close_paren:
+            if len(stack) == 1:
+                break
+            done = stack.pop()
+            stack[-1].append(done)
+        elif quoted is not None:
+            stack[-1].append(re.sub(rb"\\(.)", rb"\1", quoted).decode("utf-8", "replace"))
+        elif literal_len is not None:
+            size = int(literal_len)
+            stack[-1].append(raw[pos:pos + size].decode("utf-8", "replace"))
+            pos += size
+        else:
+            text = atom.decode("ascii", "replace")
+            if text.upper() == "NIL":
+                stack[-1].append(None)
+            elif text.isdigit():
+                stack[-1].append(int(text))
+            else:
+                stack[-1].append(text)
+    while len(stack) > 1:  # tolerate a truncated response
+        done = stack.pop()
+        stack[-1].append(done)
+    return stack[0]
+
+
+def _fetch_item(fields, name):
+    """Return the value following ``name`` in a FETCH attribute list"""
+    for i in range(0, len(fields) - 1):
+        if isinstance(fields[i], str) and fields[i].upper() == name:
+            return fields[i + 1]
+    return None
+
+
+def _params(value):
+    """Turn an IMAP (key value key value) list into a lower-cased dict"""
+    if not isinstance(value, list):
+        return {}
+    return {str(value[i]).lower(): value[i + 1] for i in range(0, len(value) - 1, 2)}
+
+
+def _decode_filename(params):
+    if "filename*" in params:
+        return collapse_rfc2231_value(decode_rfc2231(params["filename*"]))
+    for key in ("filename", "name"):
+        if params.get(key):
+            try:
+                return str(make_header(decode_header(params[key])))
+            except Exception:
+                return params[key]
+    return None
+
+
+def iter_attachment_parts(structure, section=""):
+    """Yield (section, filename, encoding, size) for every named leaf part"""
+    if not structure:
+        return
+    if isinstance(structure[0], list):
+        # multipart: children first, then the subtype and extension data
+        index = 0
+        for child in structure:
+            if not isinstance(child, list):
+                break
+            index += 1
+            child_section = f"{section}.{index}" if section else str(index)
+            yield from iter_attachment_parts(child, child_section)
+        return
+
+    section = section or "1"
+    main_type = str(structure[0]).lower()
+    params = _params(structure[2]) if len(structure) > 2 else {}
+    encoding = str(structure[5]).lower() if len(structure) > 5 and structure[5] else "7bit"
+    size = structure[6] if len(structure) > 6 and isinstance(structure[6], int) else 0
+
+    # Extension data sits after the fixed fields; text/* carries an extra
+    # line count and message/rfc822 an envelope, body and line count
+    ext_start = 7
+    if main_type == "text":
+        ext_start = 8
+    elif main_type == "message" and str(structure[1]).lower() == "rfc822":
+        ext_start = 10
+    disposition = structure[ext_start + 1] if len(structure) > ext_start + 1 else None
+    if isinstance(disposition, list) and len(disposition) > 1:
+        params = {**params, **_params(disposition[1])}
+
+    filename = _decode_filename(params)
+    if filename:
+        yield section, filename, encoding, size
+
+
+def decode_part(data, encoding):
+    """Undo the Content-Transfer-Encoding of a fetched body part"""
+    if encoding == "base64":
+        return base64.b64decode(data)
+    if encoding == "quoted-printable":
+        return quopri.decodestring(data)
+    return data
+
+
+# -- per-mailbox UID state ----------------------------------------------------
+
+class MailboxState:
+    """UIDVALIDITY, last-seen UID and failed attempts per mailbox, persisted as JSON"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self._state = json.load(f)
+
+    def _entry(self, key, uidvalidity):
+        entry = self._state.get(key)
+        if not entry or entry.get("uidvalidity") != uidvalidity:
+            return None
+        return entry
+
+    def get(self, key, uidvalidity):
+        """Last seen UID for key, or 0 if unknown or the mailbox was rebuilt"""
+        with self._lock:
+            entry = self._entry(key, uidvalidity)
+            return entry.get("last_uid", 0) if entry else 0
+
+    def update(self, key, uidvalidity, last_uid):
+        with self._lock:
+            entry = self._entry(key, uidvalidity) or {}
+            # Failures at or below the new watermark can't come up again
+            failures = {uid: count for uid, count in entry.get("failures", {}).items() if int(uid) > last_uid}
+            self._state[key] = {"uidvalidity": uidvalidity, "last_uid": last_uid}
+            if failures:
+                self._state[key]["failures"] = failures
+            self._save()
+
+    def record_failure(self, key, uidvalidity, uid):
+        """Count a failed attempt at message uid; returns the attempts so far"""
+        with self._lock:
+            entry = self._entry(key, uidvalidity)
+            if entry is None:
+                entry = self._state[key] = {"uidvalidity": uidvalidity, "last_uid": 0}
+            failures = entry.setdefault("failures", {})
+            failures[str(uid)] = failures.get(str(uid), 0) + 1
+            self._save()
+            return failures[str(uid)]
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.path)
+
+
+# -- incremental fetcher ------------------------------------------------------
+
+class IncrementalFetcher:
+    """Fetch only messages newer than the last seen UID, and only their attachments
+
+    Works on an already logged-in ``imaplib`` (or ``imaplib2``) connection.
+    Each message costs one BODYSTRUCTURE fetch plus one ``BODY.PEEK[n]``
+    per wanted part, so a poll is proportional to new mail rather than to
+    the size of the mailbox.
+    """
+
+    def __init__(self, mail, state, account, mailbox="inbox"):
+        self.mail = mail
+        self.state = state
+        self.mailbox = mailbox
+        self.key = f"{account}/{mailbox}"
+        self.uidvalidity = None
+
+    def select(self):
+        status, _ = self.mail.select(self.mailbox)
+        if status != "OK":
+            raise RuntimeError(f"Could not select mailbox {self.mailbox}")
+        _, data = self.mail.response("UIDVALIDITY")
+        self.uidvalidity = int(data[0]) if data and data[0] else 0
+        return self.uidvalidity
+
+    def new_uids(self, search_criteria):
+        """UIDs matching search_criteria that arrived since the last poll"""
+        if self.uidvalidity is None:
+            self.select()
+        last_uid = self.state.get(self.key, self.uidvalidity)
+        status, data = self.mail.uid("SEARCH", None, f"UID {last_uid + 1}:*", search_criteria)
+        if status != "OK" or not data or not data[0]:
+            return []
+        # "n:*" always matches the newest message, even if it is older than n
+        return sorted(uid for uid in map(int, data[0].split()) if uid > last_uid)
+
+    def attachment_parts(self, uid):
+        """(section, filename, encoding, size) for each named part of a message"""
+        status, data = self.mail.uid("FETCH", str(uid), "(BODYSTRUCTURE)")
+        if status != "OK" or not data or data[0] is None:
+            return []
+        parsed = parse_sexp(_join_response(data))
+        fields = next((item for item in parsed if isinstance(item, list)), [])
+        structure = _fetch_item(fields, "BODYSTRUCTURE")
+        return list(iter_attachment_parts(structure)) if structure else []
+
+    def fetch_part(self, uid, section, encoding):
+        """Download and decode one body part without setting \\Seen"""
+        status, data = self.mail.uid("FETCH", str(uid), f"(BODY.PEEK[{section}])")
+        if status != "OK":
+            raise RuntimeError(f"Failed to fetch part {section} of UID {uid}")
+        for item in data:
+            if isinstance(item, tuple):
+                return decode_part(item[1], encoding)
+        return b""
+
+    def iter_attachments(self, search_criteria, predicate=None):
+        """Yield (uid, filename, content) for new messages' wanted attachments
+
+        The last-seen UID is advanced after each message has been fully
+        yielded, so an interrupted poll resumes where it stopped.
+        """
+        for uid in self.new_uids(search_criteria):
+            for section, filename, encoding, size in self.attachment_parts(uid):
+                if predicate and not predicate(filename, size):
+                    continue
+                yield uid, filename, self.fetch_part(uid, section, encoding)
+            self.state.update(self.key, self.uidvalidity, uid)
+
+
+def is_pdf(filename, size=None):
+    return filename.lower().endswith(".pdf")
@@ -0,0 +1,234 @@
+import datetime
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Latency samples kept per stage and run for the JSON percentiles
+RESERVOIR_SIZE = 10000
+
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return None
+    index = min(int(q * len(sorted_samples)), len(sorted_samples) - 1)
+    return sorted_samples[index]
+
+
+class _Histogram:
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+class Metrics:
+    """Per-stage latency histograms, event counters and byte counters
+
+    Cumulative values (since start-up) are exported in Prometheus text
+    format, either as a file for node_exporter's textfile collector or from
+    a small local HTTP endpoint. Each run additionally gets a JSON summary
+    with p50/p95/p99 per stage; start_run() begins a new one.
+    """
+
+    def __init__(self, prefix="resume"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._events = {}
+        self._bytes = {}
+        self._server = None
+        self.start_run()
+
+    # -- recording -----------------------------------------------------------
+
+    def start_run(self):
+        """Reset the per-run figures used by summary()"""
+        with self._lock:
+            self._run_started = time.time()
+            self._run_samples = {}
+            self._run_seen = {}
+            self._run_events = {}
+            self._run_bytes = {}
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = _Histogram()
+            histogram.observe(seconds)
+
+            # Reservoir sampling keeps the percentiles honest on long runs
+            samples = self._run_samples.setdefault(stage, [])
+            seen = self._run_seen.get(stage, 0) + 1
+            self._run_seen[stage] = seen
+            if len(samples) < RESERVOIR_SIZE:
+                samples.append(seconds)
+            else:
+                slot = random.randrange(seen)
+                if slot < RESERVOIR_SIZE:
+                    samples[slot] = seconds
+
+    @contextmanager
+    def time(self, stage):
+        """Time the enclosed block as one observation of stage (failures included)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, event, amount=1):
+        with self._lock:
+            self._events[event] = self._events.get(event, 0) + amount
+            self._run_events[event] = self._run_events.get(event, 0) + amount
+
+    def add_bytes(self, kind, amount):
+        with self._lock:
+            self._bytes[kind] = self._bytes.get(kind, 0) + amount
+            self._run_bytes[kind] = self._run_bytes.get(kind, 0) + amount
+
+    # -- Prometheus exposition -----------------------------------------------
+
+    def render(self):
+        """All metrics in Prometheus text exposition format"""
+        p = self.prefix
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {p}_stage_seconds Time spent in each processing stage")
+            lines.append(f"# TYPE {p}_stage_seconds histogram")
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            lines.append(f"# HELP {p}_events_total Resumes processed, duplicates, failures and fallbacks")
+            lines.append(f"# TYPE {p}_events_total counter")
+            for event, value in sorted(self._events.items()):
+                lines.append(f'{p}_events_total{{event="{event}"}} {value}')
+
+            lines.append(f"# HELP {p}_bytes_total Bytes moved, by kind")
+            lines.append(f"# TYPE {p}_bytes_total counter")
+            for kind, value in sorted(self._bytes.items()):
+                lines.append(f'{p}_bytes_total{{kind="{kind}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Write render() atomically, for node_exporter's textfile collector"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve render() at http://host:port/metrics from a daemon thread"""
+        if self._server is not None:
+            return self._server
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep scrapes out of the console
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"📈 Metrics available at http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server
+
+    def stop_server(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # -- per-run summary -----------------------------------------------------
+
+    def summary(self):
+        """Figures for the current run: counts, bytes and latency percentiles per stage"""
+        with self._lock:
+            stages = {}
+            for stage, samples in self._run_samples.items():
+                ordered = sorted(samples)
+                stages[stage] = {
+                    "count": self._run_seen[stage],
+                    "mean": sum(ordered) / len(ordered),
+                    "p50": _percentile(ordered, 0.50),
+                    "p95": _percentile(ordered, 0.95),
+                    "p99": _percentile(ordered, 0.99),
+                    "max": ordered[-1],
+                }
+            finished = time.time()
+            return {
+                "started_at": datetime.datetime.fromtimestamp(self._run_started).isoformat(timespec="seconds"),
+                "finished_at": datetime.datetime.fromtimestamp(finished).isoformat(timespec="seconds"),
+                "duration_seconds": round(finished - self._run_started, 3),
+                "events": dict(self._run_events),
+                "bytes": dict(self._run_bytes),
+                "stages": stages,
+            }
+
+    def write_summary(self, directory, keep=None):
+        """Write summary() to directory/run-<timestamp>.json and return its path
+
+        With keep, only the newest keep summaries are left in directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        summary = self.summary()
+        timestamp = datetime.datetime.fromtimestamp(self._run_started).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"run-{timestamp}.json")
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+        if keep:
+            runs = sorted(name for name in os.listdir(directory) if name.startswith("run-") and name.endswith(".json"))
+            for name in runs[:-keep]:
+                os.remove(os.path.join(directory, name))
+        return path
+
+
+# Shared by everything in the process, so helpers such as ocr.py can count
+# into the same figures the processor exports
+REGISTRY = Metrics()
+
+
+def timed(stage):
+    """Decorator timing a method as stage on self.metrics"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.time(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
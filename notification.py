@@ -1,67 +1,49 @@
-import gspread
-import smtplib
-import pdfplumber
-import re
 import os
-from email.mime.text import MIMEText
-from google.oauth2.service_account import Credentials
 from dotenv import load_dotenv
+import clients
+from pdf_text import extract_details_from_pages, extract_text, iter_page_text
+import resume_details
+from resume_details import PHONE_AREA_CODE_RE
+from notifier import NotificationDispatcher
 
 # Load environment variables (Ensure you have a .env file)
 load_dotenv()
 
-# ✅ Step 1: Set Up Google Sheets API
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-SERVICE_ACCOUNT_FILE = "credentials.json"  # Ensure this file exists
+# ✅ Step 1: Google Sheets API client (authenticated on first use, see clients.py)
+SCOPES = clients.SHEETS_SCOPES
+SERVICE_ACCOUNT_FILE = os.getenv("SHEETS_CREDENTIALS", "credentials.json")  # Ensure this file exists
+SHEET_ID = os.getenv("SHEET_ID")
 
-# Authenticate Google Sheets API
-creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-client = gspread.authorize(creds)
-
-# Open your Google Sheet
-SHEET_ID = "1Mx674i2GPSTl2LK280ou4yyfgBHcmg42bV76YJ6iYTQ"  # Replace with actual Sheet ID
-sheet = client.open_by_key(SHEET_ID).sheet1
-
-print("✅ Google Sheets API authentication successful!")
+def get_sheet():
+    return clients.worksheet(SHEET_ID, SERVICE_ACCOUNT_FILE, SCOPES)
 
 # ✅ Step 2: Email Notification Setup (Now using Environment Variables)
 HR_EMAIL = os.getenv("HR_EMAIL")  # HR Email
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")  # Your Gmail
 SENDER_PASSWORD = os.getenv("SENDER_PASSWORD")  # Secure App Password
 
+# One reused SMTP session, sending from a background queue so ingestion
+# never waits on the mail server. Set NOTIFY_DIGEST_SECONDS to batch every
+# applicant from that interval into a single HR email instead. Started by
+# the first notification.
+dispatcher = None
+
 # Function to send an email notification
 def send_email_notification(applicant):
-    if not SENDER_EMAIL or not SENDER_PASSWORD:
+    global dispatcher
+    if not (SENDER_EMAIL and SENDER_PASSWORD):
         print("⚠️ Email credentials missing! Skipping email notification.")
         return
-
-    subject = f"New Job Application: {applicant['Name']}"
-    body = f"""
-    A new job application has been received.
-    
-    📌 **Applicant Details:**
-    - **Name:** {applicant['Name']}
-    - **Email:** {applicant['Email']}
-    - **Phone:** {applicant['Phone']}
-    
-    Please review the application in Google Sheets.
-    """
-
-    msg = MIMEText(body, "plain")
-    msg["Subject"] = subject
-    msg["From"] = SENDER_EMAIL
-    msg["To"] = HR_EMAIL
-
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.sendmail(SENDER_EMAIL, HR_EMAIL, msg.as_string())
-        print(f"📧 Email notification sent to HR for {applicant['Name']}")
-    except Exception as e:
-        print(f"❌ Error sending email: {e}")
+    if dispatcher is None:
+        dispatcher = NotificationDispatcher.from_env()
+        if dispatcher is None:  # HR_EMAIL not set: nowhere to send it
+            print("❌ Error sending email: HR_EMAIL is not set")
+            return
+    dispatcher.notify(applicant)
 
 # ✅ Step 3: Function to Check & Add Headers in Google Sheets
 def add_headers():
+    sheet = get_sheet()
     existing_headers = sheet.row_values(1)
     required_headers = ["Name", "Email Address", "Phone No"]
     if existing_headers != required_headers:
@@ -72,39 +54,21 @@ def add_headers():
 
 # ✅ Step 4: Function to Check for Duplicate Entries
 def check_duplicate(email):
-    existing_emails = sheet.col_values(2)  # Get all emails from column 2
+    existing_emails = get_sheet().col_values(2)  # Get all emails from column 2
     return email in existing_emails
 
 # ✅ Step 5: Function to Extract Text from PDFs
 def extract_text_from_pdf(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n" if page.extract_text() else ""
-    return text
+    return extract_text(pdf_path)
 
 # ✅ Step 6: Function to Extract Name, Email, Phone from Text
+# Improved Name Extraction: capitalised words only, skipping "Resume" headings
 def extract_details(text):
-    email_pattern = r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+"
-    phone_pattern = r"\+?\d{1,3}[-.\s]?\(?\d{2,5}\)?[-.\s]?\d{3,4}[-.\s]?\d{3,4}"
-
-    email = re.findall(email_pattern, text)
-    phone = re.findall(phone_pattern, text)
-
-    # Improved Name Extraction
-    name = "N/A"
-    name_lines = text.split("\n")[:5]
-    for line in name_lines:
-        words = line.strip().split()
-        if len(words) >= 2 and all(w[0].isupper() for w in words if w.isalpha()):
-            if "Resume" not in line and "Curriculum Vitae" not in line:
-                name = line.strip()
-                break
-
-    return {"Name": name, "Email": email[0] if email else "N/A", "Phone": phone[0] if phone else "N/A"}
+    return resume_details.extract_details(text, phone_re=PHONE_AREA_CODE_RE, strict_name=True)
 
 # ✅ Step 7: Function to Process Resumes & Store Data
 def extract_and_store_details(folder_path):
+    global dispatcher
     if not os.path.exists(folder_path):
         print(f"❌ Folder '{folder_path}' does not exist!")
         return
@@ -120,20 +84,26 @@ def extract_and_store_details(folder_path):
 
     for file in pdf_files:
         file_path = os.path.join(folder_path, file)
-        pdf_text = extract_text_from_pdf(file_path)
-        details = extract_details(pdf_text)
+        details, _ = extract_details_from_pages(iter_page_text(file_path), extract_details)
         
         # Save extracted details to Google Sheets
         if check_duplicate(details["Email"]):
             print(f"⚠️ Duplicate entry found for {details['Email']}! Skipping...")
         else:
-            sheet.append_row([details["Name"], details["Email"], details["Phone"]])
+            get_sheet().append_row([details["Name"], details["Email"], details["Phone"]])
             print(f"✅ Data saved: {details}")
 
             # Send Email Notification
             send_email_notification(details)
 
+    if dispatcher is not None:
+        dispatcher.close()  # deliver anything still queued
+        dispatcher = None
     print("✅ All details extracted and saved to Google Sheets!")
 
 # ✅ Step 8: Run the Pipeline
-extract_and_store_details("./Resume")  # Folder containing all resumes
\ No newline at end of file
+if __name__ == "__main__":
+    if not SHEET_ID:
+        raise ValueError("❌ Missing required environment variable: SHEET_ID")
+
+    extract_and_store_details("./Resume")  # Folder containing all resumes
\ No newline at end of file
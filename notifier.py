@@ -0,0 +1,196 @@
+import os
+import queue
+import smtplib
+import threading
+import time
+from email.mime.text import MIMEText
+
+
+def format_applicant_email(applicant):
+    """(subject, body) for a single new application"""
+    subject = f"New Job Application: {applicant['Name']}"
+    body = f"""
+    A new job application has been received.
+
+    📌 **Applicant Details:**
+    - **Name:** {applicant['Name']}
+    - **Email:** {applicant['Email']}
+    - **Phone:** {applicant['Phone']}
+
+    Please review the application in Google Sheets.
+    """
+    return subject, body
+
+
+def format_digest_email(applicants):
+    """(subject, body) summarising several applications in one email"""
+    subject = f"{len(applicants)} New Job Applications"
+    lines = [
+        f"    {i}. {a['Name']} | {a['Email']} | {a['Phone']}"
+        for i, a in enumerate(applicants, 1)
+    ]
+    body = "\n".join([
+        "",
+        f"    {len(applicants)} new job applications have been received.",
+        "",
+        "    📌 **Applicants:**",
+        *lines,
+        "",
+        "    Please review the applications in Google Sheets.",
+        "",
+    ])
+    return subject, body
+
+
+class NotificationDispatcher:
+    """Sends HR notifications from a background queue over one SMTP session
+
+    notify() only enqueues, so ingestion never waits on SMTP. The worker
+    keeps a single authenticated connection open, reconnecting when the
+    server drops it, and closes it after idle_timeout seconds without mail.
+    With digest_interval set, applicants are collected and sent as one
+    email per interval instead of one email each.
+
+    use_ssl=False and password=None talk plain, unauthenticated SMTP, which
+    is what a local stand-in such as aiosmtpd expects.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sender, password, recipient, host="smtp.gmail.com", port=465, use_ssl=True,
+                 digest_interval=None, idle_timeout=240, max_queue=10000):
+        self.sender = sender
+        self.password = password
+        self.recipient = recipient
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.digest_interval = digest_interval
+        self.idle_timeout = idle_timeout
+
+        self.sent = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._server = None
+        self._last_used = 0.0
+        self._thread = threading.Thread(target=self._run, name="smtp-notify", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls):
+        """Build a dispatcher from .env settings, or None if credentials are missing"""
+        sender = os.getenv("SENDER_EMAIL")
+        password = os.getenv("SENDER_PASSWORD")
+        recipient = os.getenv("HR_EMAIL")
+        if not sender or not recipient:
+            return None
+        digest = os.getenv("NOTIFY_DIGEST_SECONDS")
+        return cls(
+            sender, password, recipient,
+            host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+            port=int(os.getenv("SMTP_PORT", "465")),
+            use_ssl=os.getenv("SMTP_SSL", "true").lower() == "true",
+            digest_interval=float(digest) if digest else None
+        )
+
+    # -- public API ----------------------------------------------------------
+
+    def notify(self, applicant):
+        """Queue a notification for one applicant"""
+        self._queue.put(dict(applicant))
+
+    def close(self, timeout=None):
+        """Send everything still queued, then shut the session down"""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    # -- SMTP session --------------------------------------------------------
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=30)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.password:
+            server.login(self.sender, self.password)
+        return server
+
+    def _disconnect(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    def _send(self, subject, body):
+        msg = MIMEText(body, "plain")
+        msg["Subject"] = subject
+        msg["From"] = self.sender
+        msg["To"] = self.recipient
+
+        for attempt in range(2):
+            try:
+                if self._server is None:
+                    self._server = self._connect()
+                self._server.sendmail(self.sender, self.recipient, msg.as_string())
+                self._last_used = time.monotonic()
+                return
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError):
+                # Stale session: drop it and retry once on a fresh connection
+                self._server = None
+                if attempt:
+                    raise
+
+    def _deliver(self, applicants):
+        if not applicants:
+            return
+        if len(applicants) == 1:
+            subject, body = format_applicant_email(applicants[0])
+        else:
+            subject, body = format_digest_email(applicants)
+        try:
+            self._send(subject, body)
+            self.sent += len(applicants)
+            names = ", ".join(a["Name"] for a in applicants)
+            print(f"📧 Email notification sent to HR for {names}")
+        except Exception as e:
+            self.failed += len(applicants)
+            print(f"❌ Error sending email: {e}")
+
+    # -- worker --------------------------------------------------------------
+
+    def _run(self):
+        pending = []
+        digest_due = None
+        while True:
+            if digest_due is not None:
+                timeout = max(digest_due - time.monotonic(), 0)
+            else:
+                timeout = self.idle_timeout
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._deliver(pending)
+                self._disconnect()
+                return
+
+            if item is not None:
+                if self.digest_interval:
+                    pending.append(item)
+                    if digest_due is None:
+                        digest_due = time.monotonic() + self.digest_interval
+                else:
+                    self._deliver([item])
+
+            if digest_due is not None and time.monotonic() >= digest_due:
+                self._deliver(pending)
+                pending, digest_due = [], None
+
+            if self._server is not None and time.monotonic() - self._last_used >= self.idle_timeout:
+                self._disconnect()
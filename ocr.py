@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytesseract
+from dotenv import load_dotenv
+from pdf2image import convert_from_path
+
+from metrics import REGISTRY
+from pdf_text import iter_page_text
+
+load_dotenv()
+
+# OCR settings (override in .env)
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", os.path.join(os.getenv("LOCAL_FOLDER", "Resume"), ".ocr_cache"))
+
+_pools = {}  # max_workers -> ProcessPoolExecutor
+_pools_lock = threading.Lock()
+
+
+def _ocr_page(pdf_path, page_number, dpi, lang):
+    """Rasterize and OCR one page (1-based); runs inside a worker process"""
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    try:
+        return pytesseract.image_to_string(images[0], lang=lang) if images else ""
+    finally:
+        for image in images:
+            image.close()
+
+
+def _get_pool(max_workers):
+    """The process-wide OCR pool, started on first use and reused by every PDF"""
+    with _pools_lock:
+        pool = _pools.get(max_workers)
+        if pool is None:
+            pool = _pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+        return pool
+
+
+def shutdown_pool():
+    """Stop the OCR worker processes (they are started again when needed)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+class OCRCache:
+    """OCR results on disk, one JSON file per (file hash, dpi, lang)"""
+
+    def __init__(self, cache_dir=OCR_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, file_hash, dpi, lang):
+        return os.path.join(self.cache_dir, f"{file_hash}-{dpi}-{lang}.json")
+
+    def get(self, file_hash, dpi, lang):
+        """{page_number: text} for pages OCR'd before, or an empty dict"""
+        try:
+            with open(self._path(file_hash, dpi, lang), "r") as f:
+                return {int(page): text for page, text in json.load(f).items()}
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def put(self, file_hash, dpi, lang, pages):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(file_hash, dpi, lang)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({str(page): text for page, text in pages.items()}, f)
+        os.replace(tmp_path, path)
+
+
+def ocr_pages(pdf_path, page_numbers, dpi=OCR_DPI, lang=OCR_LANG, max_workers=OCR_WORKERS):
+    """OCR the given 1-based pages, spread across the shared process pool
+
+    Each worker rasterizes a single page at a time, so peak memory is one
+    page image per worker instead of the whole document. The pool outlives
+    the call, so a batch of scanned PDFs starts its workers only once.
+    """
+    page_numbers = list(page_numbers)
+    if not page_numbers:
+        return {}
+    if max_workers <= 1 or len(page_numbers) == 1:
+        return {page: _ocr_page(pdf_path, page, dpi, lang) for page in page_numbers}
+
+    executor = _get_pool(max_workers)
+    futures = {page: executor.submit(_ocr_page, pdf_path, page, dpi, lang) for page in page_numbers}
+    return {page: future.result() for page, future in futures.items()}
+
+
+def ocr_extract_text(pdf_path, page_texts=None, dpi=OCR_DPI, lang=OCR_LANG, max_workers=OCR_WORKERS, cache=None,
+                     file_hash=None):
+    """Text of a PDF, OCR'ing only the pages that have no text layer
+
+    page_texts is the text layer per page and file_hash the PDF's SHA-256,
+    if the caller already has them. OCR output is cached by file hash, so a
+    scanned PDF is only OCR'd once.
+    """
+    if page_texts is None:
+        page_texts = list(iter_page_text(pdf_path))
+    cache = cache or OCRCache()
+
+    blank_pages = [i + 1 for i, text in enumerate(page_texts) if not text.strip()]
+    if blank_pages:
+        REGISTRY.inc("ocr_fallbacks")
+        REGISTRY.inc("ocr_fallback_pages", len(blank_pages))
+        if file_hash is None:
+            with open(pdf_path, "rb") as f:
+                file_hash = hashlib.sha256(f.read()).hexdigest()
+        ocr_text = cache.get(file_hash, dpi, lang)
+        missing = [page for page in blank_pages if page not in ocr_text]
+        if missing:
+            with REGISTRY.time("ocr"):
+                ocr_text.update(ocr_pages(pdf_path, missing, dpi=dpi, lang=lang, max_workers=max_workers))
+            cache.put(file_hash, dpi, lang, ocr_text)
+        page_texts = [ocr_text.get(i + 1, text) if not text.strip() else text for i, text in enumerate(page_texts)]
+
+    return "".join(text + "\n" for text in page_texts if text)
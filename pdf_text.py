@@ -0,0 +1,76 @@
+from io import BytesIO
+
+
+def iter_page_text(source):
+    """Yield the text of each PDF page lazily, one page at a time
+
+    source can be a file path, raw PDF bytes or a binary file object. Pages
+    with no text layer yield an empty string. Each page's parsed objects are
+    released once its text has been taken, so memory stays flat on long CVs.
+    """
+    import pdfplumber  # heavy; only paid for by runs that actually parse a PDF
+
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    with pdfplumber.open(source) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()  # once per page; it is the expensive call
+            page.flush_cache()
+            yield text or ""
+
+
+def extract_text(source):
+    """Full text of a PDF, one line break after every non-empty page"""
+    return "".join(text + "\n" for text in iter_page_text(source) if text)
+
+
+def details_settled(details, text, name_lines=5):
+    """True once reading more text cannot change the extracted details"""
+    name_settled = details["Name"] != "N/A" or text.count("\n") >= name_lines
+    return name_settled and details["Email"] != "N/A" and details["Phone"] != "N/A"
+
+
+def extract_details_from_pages(pages, extract_details, name_lines=5, overlap=100):
+    """Run extract_details over pages, stopping once the answer can't change
+
+    Returns (details, text_read). Pages are consumed only until email and
+    phone have both been matched and the name is settled, i.e. found or
+    ruled out because the first name_lines lines have been seen. Since the
+    detail extractors keep the first match, later pages cannot change the
+    result.
+
+    Each page is searched on its own, together with the last overlap
+    characters of the page before (so an email or phone number split
+    across pages still matches), and only for the fields still missing.
+    The work is linear in the text read. The name comes from the opening
+    lines only, so it is looked for while fewer than name_lines lines have
+    been read.
+    """
+    page_texts = []
+    lines = 0
+    tail = ""
+    details = extract_details("")
+    try:
+        for page_text in pages:
+            if not page_text:
+                continue
+            page_texts.append(page_text)
+            # Still within the opening lines without a name: those lines may
+            # span pages, so search everything read so far (a page or two)
+            in_head = details["Name"] == "N/A" and lines < name_lines
+            lines += page_text.count("\n") + 1
+            if in_head or details["Email"] == "N/A" or details["Phone"] == "N/A":
+                searched = "".join(text + "\n" for text in page_texts) if in_head else tail + page_text + "\n"
+                found = extract_details(searched)
+                for field in ("Name", "Email", "Phone") if in_head else ("Email", "Phone"):
+                    if details[field] == "N/A":
+                        details[field] = found[field]
+            tail = (tail + page_text + "\n")[-overlap:] if overlap else ""
+            if details["Name"] != "N/A" or lines >= name_lines:
+                if details["Email"] != "N/A" and details["Phone"] != "N/A":
+                    break
+    finally:
+        close = getattr(pages, "close", None)
+        if close:
+            close()  # closes the PDF if we stopped early
+    return details, "".join(text + "\n" for text in page_texts)
@@ -0,0 +1,279 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+
+from extraction_cache import cached_extract_details, parse_pages
+from imap_incremental import IncrementalFetcher
+from resume_details import extract_details
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+
+class PipelineStopped(Exception):
+    """Raised in the fetch thread when the pipeline is shutting down"""
+
+
+class ResumePipeline:
+    """Staged asyncio pipeline over a ResumeProcessor
+
+    fetch -> hash/dedup -> upload -> extract -> sheet write -> notify
+
+    Every stage is its own task (or group of tasks), connected to the next
+    by a bounded asyncio.Queue. Stages overlap, so the first resume can be
+    in the sheet while later emails are still downloading. When a stage
+    falls behind, its input queue fills and the stage before it waits,
+    which keeps at most a few queue_size resumes in memory at a time.
+
+    Blocking work never runs on the event loop: IMAP runs in its own
+    thread, Drive, Sheets and disk calls in an I/O thread pool, and PDF
+    parsing in a process pool (extract_processes=0 keeps it in threads).
+    """
+
+    def __init__(self, processor, notifier=None, queue_size=8, upload_workers=None,
+                 extract_workers=None, extract_processes=None):
+        self.processor = processor
+        self.notifier = notifier
+        self.queue_size = queue_size
+        self.upload_workers = upload_workers or processor.MAX_WORKERS
+        self.extract_workers = extract_workers or processor.MAX_WORKERS
+        self.extract_processes = self.extract_workers if extract_processes is None else extract_processes
+
+        self.stats = {"fetched": 0, "duplicates": 0, "uploaded": 0, "extracted": 0,
+                      "saved": 0, "notified": 0, "failed": 0}
+        self._stopping = threading.Event()
+        self._loop = None
+        self._io_pool = None
+        self._extract_pool = None
+        self._cpu_pool = None
+
+    @classmethod
+    def from_env(cls, processor, notifier=None):
+        extract_processes = os.getenv("PIPELINE_EXTRACT_PROCESSES")
+        return cls(
+            processor,
+            notifier=notifier,
+            queue_size=int(os.getenv("PIPELINE_QUEUE_SIZE", "8")),
+            extract_processes=int(extract_processes) if extract_processes else None
+        )
+
+    # -- plumbing ------------------------------------------------------------
+
+    async def _call(self, pool, fn, *args):
+        return await self._loop.run_in_executor(pool, fn, *args)
+
+    def _put_from_thread(self, queue, item):
+        """queue.put from a worker thread, blocking while the queue is full"""
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), self._loop)
+        while True:
+            try:
+                return future.result(timeout=1)
+            except FutureTimeout:
+                if self._stopping.is_set():
+                    future.cancel()
+                    raise PipelineStopped()
+
+    async def _stage(self, count, inbox, outbox, handle):
+        """Run count workers applying handle to inbox items, forwarding results
+
+        A failing item is counted and skipped. Workers put the end-of-stream
+        marker back for their siblings, and the stage passes one on once all
+        of them are done.
+        """
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE)
+                    return
+                try:
+                    result = await handle(item)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    self.processor.metrics.inc("failures")
+                    print(f"❌ Pipeline error: {str(e)}")
+                    continue
+                await outbox.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(count)))
+        await outbox.put(_DONE)
+
+    def _parse_in_process(self, source, extract):
+        return self._cpu_pool.submit(parse_pages, source, extract).result()
+
+    # -- stages --------------------------------------------------------------
+
+    def _fetch(self, email_address, password, search_criteria, incremental, outbox):
+        """IMAP stage (runs in its own thread): queue ("part", filename, content)
+
+        In incremental mode a ("uid", fetcher, uid) marker follows each message's
+        parts, so its UID is recorded only once those parts are saved.
+        """
+        processor = self.processor
+        mail = None
+        try:
+            mail = processor._connect_imap(email_address, password)
+            if incremental:
+                fetcher = IncrementalFetcher(mail, processor.imap_state, email_address, mailbox="inbox")
+                fetcher.select()
+                uids = fetcher.new_uids(search_criteria)
+                print(f"📥 Found {len(uids)} new matching emails")
+                for uid in uids:
+                    try:
+                        for filename, content in processor._iter_pdf_parts(fetcher, uid):
+                            self._put_from_thread(outbox, ("part", filename, content))
+                    except PipelineStopped:
+                        raise
+                    except Exception as e:
+                        # No UID marker: the next poll retries from this message,
+                        # unless it has failed too often and is skipped
+                        if processor._retry_message_later(fetcher, uid, e):
+                            break
+                    self._put_from_thread(outbox, ("uid", fetcher, uid))
+            else:
+                for filename, content in processor._iter_message_pdfs(mail, search_criteria):
+                    self._put_from_thread(outbox, ("part", filename, content))
+        except PipelineStopped:
+            pass
+        except Exception as e:
+            print(f"❌ Email error: {str(e)}")
+        finally:
+            if mail is not None:
+                try:
+                    mail.close()
+                    mail.logout()
+                except Exception:
+                    pass
+
+    async def _dedup(self, inbox, outbox):
+        """Hash each attachment, drop ones seen before, save the rest locally"""
+        processor = self.processor
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            if item[0] == "uid":
+                _, fetcher, uid = item
+                processor.imap_state.update(fetcher.key, fetcher.uidvalidity, uid)
+                continue
+            _, filename, content = item
+            self.stats["fetched"] += 1
+            try:
+                file_hash = await self._call(self._io_pool, processor._calculate_file_hash, content)
+                file_path = await self._call(self._io_pool, processor._save_attachment,
+                                             filename, content, file_hash)
+            except Exception as e:
+                self.stats["failed"] += 1
+                self.processor.metrics.inc("failures")
+                print(f"❌ Error saving {filename}: {str(e)}")
+                continue
+            if file_path is None:
+                self.stats["duplicates"] += 1
+                continue
+            await outbox.put((file_path, content, file_hash))
+        await outbox.put(_DONE)
+
+    async def _upload(self, inbox, outbox):
+        async def handle(item):
+            file_path, content, file_hash = item
+            _, drive_link = await self._call(self._io_pool, self.processor.upload_to_drive,
+                                             file_path, file_hash)
+            self.stats["uploaded"] += 1
+            return file_path, content, file_hash, drive_link
+        await self._stage(self.upload_workers, inbox, outbox, handle)
+
+    async def _extract(self, inbox, outbox):
+        # resume_details.extract_details rather than the processor's bound
+        # method, so the parse can be pickled over to the process pool
+        parse = self._parse_in_process if self._cpu_pool is not None else parse_pages
+        extract = partial(cached_extract_details, self.processor.extraction_cache,
+                          extract_details=extract_details, parse=parse)
+
+        async def handle(item):
+            file_path, content, file_hash, drive_link = item
+            with self.processor.metrics.time("extract_details"):
+                details = await self._call(self._extract_pool, extract, file_hash, content)
+                if details["Email"] == "N/A":  # maybe scanned pages: OCR just those
+                    details = await self._call(self._io_pool, self.processor.ocr_fallback,
+                                               file_path, file_hash, details)
+            details["Drive Link"] = drive_link
+            self.stats["extracted"] += 1
+            return file_path, details  # the PDF bytes are released here
+        await self._stage(self.extract_workers, inbox, outbox, handle)
+
+    async def _save(self, inbox, outbox):
+        """Queue rows on the batched sheet writer and clean up local files"""
+        processor = self.processor
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            file_path, details = item
+            try:
+                saved = await self._call(self._io_pool, processor.save_to_sheet, details)
+                await self._call(self._io_pool, os.remove, file_path)
+            except Exception as e:
+                self.stats["failed"] += 1
+                self.processor.metrics.inc("failures")
+                print(f"❌ Error processing resume {file_path}: {str(e)}")
+                continue
+            self.processor.metrics.inc("processed")
+            if saved:
+                self.stats["saved"] += 1
+                print(f"✅ Processed new resume for {details['Name']}")
+                await outbox.put(details)
+        await outbox.put(_DONE)
+
+    async def _notify(self, inbox):
+        while True:
+            details = await inbox.get()
+            if details is _DONE:
+                break
+            if self.notifier is not None:
+                self.notifier.notify(details)  # only enqueues; sending is in the background
+                self.stats["notified"] += 1
+
+    # -- entry points --------------------------------------------------------
+
+    async def run_async(self, email_address, password, search_criteria='(SUBJECT "Job Application")',
+                        incremental=None):
+        """Run every stage to completion and return the stats dict"""
+        if incremental is None:
+            incremental = self.processor.IMAP_INCREMENTAL
+        os.makedirs(self.processor.LOCAL_FOLDER, exist_ok=True)
+
+        self._loop = asyncio.get_running_loop()
+        self._stopping.clear()
+        self._io_pool = ThreadPoolExecutor(max_workers=self.upload_workers + 2, thread_name_prefix="pipeline-io")
+        self._extract_pool = ThreadPoolExecutor(max_workers=self.extract_workers, thread_name_prefix="pipeline-extract")
+        self._cpu_pool = ProcessPoolExecutor(self.extract_processes) if self.extract_processes > 0 else None
+        fetch_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-fetch")
+
+        fetched, unique, uploaded, extracted, saved = (asyncio.Queue(self.queue_size) for _ in range(5))
+
+        async def fetch():
+            await self._loop.run_in_executor(
+                fetch_thread, self._fetch, email_address, password, search_criteria, incremental, fetched)
+            await fetched.put(_DONE)
+
+        try:
+            await asyncio.gather(
+                fetch(),
+                self._dedup(fetched, unique),
+                self._upload(unique, uploaded),
+                self._extract(uploaded, extracted),
+                self._save(extracted, saved),
+                self._notify(saved),
+            )
+        finally:
+            self._stopping.set()
+            fetch_thread.shutdown(wait=True)
+            for pool in (self._io_pool, self._extract_pool, self._cpu_pool):
+                if pool is not None:
+                    pool.shutdown(wait=True)
+        return self.stats
+
+    def run(self, email_address, password, search_criteria='(SUBJECT "Job Application")', incremental=None):
+        return asyncio.run(self.run_async(email_address, password, search_criteria, incremental))
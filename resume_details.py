@@ -0,0 +1,61 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# Bump whenever the patterns or the name heuristic change, so cached
+# extraction results from an older version are not reused
+EXTRACTOR_VERSION = "1"
+
+EMAIL_RE = re.compile(r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+")
+PHONE_RE = re.compile(r"\+?\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}")
+# Also accepts a bracketed area code, e.g. +1 (555) 123 4567
+PHONE_AREA_CODE_RE = re.compile(r"\+?\d{1,3}[-.\s]?\(?\d{2,5}\)?[-.\s]?\d{3,4}[-.\s]?\d{3,4}")
+
+NAME_LINES = 5
+_NAME_STOPWORDS = ("Resume", "Curriculum Vitae")
+
+
+def _find_name(text, strict_name):
+    """First of the opening NAME_LINES lines that looks like a name"""
+    for line in text.split("\n", NAME_LINES)[:NAME_LINES]:
+        words = line.split()
+        if len(words) < 2:
+            continue
+        if strict_name:
+            if not all(w[0].isupper() for w in words if w.isalpha()):
+                continue
+            if any(stopword in line for stopword in _NAME_STOPWORDS):
+                continue
+        return line.strip()
+    return "N/A"
+
+
+def extract_details(text, phone_re=PHONE_RE, strict_name=False):
+    """Extract Name, Email and Phone from resume text
+
+    Each pattern is a precompiled search that stops at its first match, and
+    only the opening lines are split for the name, so the cost depends on
+    where the details appear rather than on the length of the resume.
+    strict_name requires capitalised words and skips "Resume" headings.
+    """
+    email = EMAIL_RE.search(text)
+    phone = phone_re.search(text)
+    return {
+        "Name": _find_name(text, strict_name),
+        "Email": email.group(0) if email else "N/A",
+        "Phone": phone.group(0) if phone else "N/A"
+    }
+
+
+def extract_details_batch(texts, max_workers=None, chunksize=256, **options):
+    """extract_details for many texts, results in input order
+
+    With max_workers > 1 the texts are spread over a process pool in chunks
+    of chunksize; otherwise they are handled in-process, which is faster for
+    small batches. options are passed through to extract_details.
+    """
+    extract = partial(extract_details, **options) if options else extract_details
+    if not max_workers or max_workers <= 1:
+        return [extract(text) for text in texts]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(extract, texts, chunksize=chunksize))
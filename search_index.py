@@ -0,0 +1,207 @@
+import re
+import shlex
+import threading
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+# Search field -> sheet column
+FIELDS = {
+    "name": "Name",
+    "email": "Email Address",
+    "phone": "Phone No",
+}
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def _normalize(field, value):
+    value = "" if value is None else str(value)
+    if field == "phone":
+        return _NON_DIGITS.sub("", value)
+    return value.lower()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _grams(text):
+    """Every substring of 1 to 3 characters"""
+    return {text[i:i + n] for i in range(len(text)) for n in (1, 2, 3) if i + n <= len(text)}
+
+
+class ApplicantSearchIndex:
+    """Substring search over name, email and phone, built once per data refresh
+
+    Values are normalised once (lower-case; phone numbers reduced to
+    digits) and every field gets an index mapping each substring of up to
+    3 characters to the sorted row positions containing it. Terms of up to
+    3 characters are answered by a single posting list; longer terms by
+    intersecting the posting lists of their trigrams and confirming the
+    few surviving candidates. Refining a query (typing one more character)
+    only re-checks the rows that matched the previous one, when those are
+    fewer than the trigram candidates. The result
+    cache is shared by every dashboard session, so it is guarded by a lock.
+
+    Query syntax: whitespace-separated terms, all of which must match.
+    ``field:value`` limits a term to one of name, email or phone (e.g.
+    ``email:gmail.com``); bare terms match any field. Quote values that
+    contain spaces: ``name:"john smith"``.
+    """
+
+    def __init__(self, df, cache_size=256):
+        self.size = len(df)
+        self.values = {}
+        self.postings = {}
+        for field, column in FIELDS.items():
+            if column in df.columns:
+                values = [_normalize(field, value) for value in df[column].tolist()]
+            else:
+                values = [""] * self.size
+            self.values[field] = values
+            self.postings[field] = self._build_postings(values)
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_size = cache_size
+
+    @staticmethod
+    def _build_postings(values):
+        postings = defaultdict(list)
+        for row, value in enumerate(values):
+            for gram in _grams(value):
+                postings[gram].append(row)  # rows arrive in order, so lists stay sorted
+        return {gram: np.asarray(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    # -- single-term lookups -------------------------------------------------
+
+    def _candidates(self, field, term):
+        """Rows that could contain term (4+ characters), before verification
+
+        The rarest few trigram posting lists are intersected. A cached
+        result for a shorter term contained in this one (usually the query
+        before the user typed one more character) narrows that further,
+        but only when it is the smaller set; a cached "a" matches most rows
+        and would send nearly the whole table to verification.
+        """
+        postings = self.postings[field]
+        lists = []
+        for gram in _trigrams(term):
+            rows = postings.get(gram)
+            if rows is None:
+                return np.empty(0, dtype=np.int32)
+            lists.append(rows)
+        # The rarest few trigrams narrow things down enough; verification
+        # in _search_field takes care of the rest
+        lists.sort(key=len)
+        candidates = lists[0]
+        for rows in lists[1:4]:
+            if not len(candidates):
+                return candidates
+            candidates = self._intersect(candidates, rows)
+
+        with self._cache_lock:
+            cached = list(self._cache.items())
+        for (cached_field, cached_term), rows in cached:
+            if cached_field == field and cached_term in term and len(rows) < len(candidates):
+                candidates = self._intersect(rows, candidates)
+        return candidates
+
+    @staticmethod
+    def _intersect(a, b):
+        """Sorted intersection of two sorted row arrays
+
+        Binary-searches each row of the shorter array in the longer one:
+        O(len(a) * log(len(b))) with a the shorter, independent of the
+        table size.
+        """
+        if len(a) > len(b):
+            a, b = b, a
+        if not len(a):
+            return a
+        positions = np.searchsorted(b, a)
+        positions[positions == len(b)] = 0
+        return a[b[positions] == a]
+
+    def _cached(self, key):
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _search_field(self, field, term):
+        key = (field, term)
+        result = self._cached(key)
+        if result is not None:
+            return result
+
+        if len(term) <= 3:
+            # Posting lists of substrings up to 3 characters are exact answers
+            result = self.postings[field].get(term, np.empty(0, dtype=np.int32))
+        else:
+            values = self.values[field]
+            candidates = self._candidates(field, term)
+            result = np.asarray([row for row in candidates.tolist() if term in values[row]], dtype=np.int32)
+        self._remember(key, result)
+        return result
+
+    def _remember(self, key, result):
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _search_term(self, field, term):
+        if field is not None:
+            term = _normalize(field, term)
+            if not term:
+                return np.empty(0, dtype=np.int32)
+            return self._search_field(field, term)
+
+        key = (None, term)
+        result = self._cached(key)
+        if result is not None:
+            return result
+        mask = np.zeros(self.size, dtype=bool)
+        for name in FIELDS:
+            normalized = _normalize(name, term)
+            if normalized:
+                mask[self._search_field(name, normalized)] = True
+        result = np.flatnonzero(mask).astype(np.int32)
+        self._remember(key, result)
+        return result
+
+    # -- queries -------------------------------------------------------------
+
+    @staticmethod
+    def parse(query):
+        """[(field or None, term)] for a query string"""
+        try:
+            tokens = shlex.split(query)
+        except ValueError:  # unbalanced quote while the user is still typing
+            tokens = query.replace('"', " ").split()
+        terms = []
+        for token in tokens:
+            field, sep, term = token.partition(":")
+            if sep and field.lower() in FIELDS:
+                if term:
+                    terms.append((field.lower(), term))
+            else:
+                terms.append((None, token))
+        return terms
+
+    def search(self, query):
+        """Sorted row positions matching every term of query"""
+        terms = self.parse(query)
+        if not terms:
+            return np.arange(self.size, dtype=np.int32)
+        result = None
+        for field, term in terms:
+            rows = self._search_term(field, term)
+            result = rows if result is None else self._intersect(result, rows)
+            if not len(result):
+                break
+        return result
@@ -0,0 +1,106 @@
+import threading
+
+
+class BatchedSheetWriter:
+    """Buffered, de-duplicating writer for the applicant worksheet
+
+    The header row and the email column are read once, on first use. After
+    that duplicate checks are answered from an in-memory set that is kept in
+    step with queued rows, and rows are written with a single ``append_rows``
+    call whenever ``batch_size`` rows are queued or ``flush_interval``
+    seconds have passed since the last write.
+
+    sheet may also be a function returning the worksheet; it is then only
+    opened when the writer is first used.
+    """
+
+    HEADERS = ["Name", "Email Address", "Phone No", "Google Drive Link"]
+
+    def __init__(self, sheet, batch_size=50, flush_interval=10.0, email_column=2):
+        self._sheet = sheet
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.email_column = email_column
+
+        self._lock = threading.RLock()
+        self._pending = []
+        self._emails = None
+        self._stop = threading.Event()
+        self._timer = None
+
+    @property
+    def sheet(self):
+        with self._lock:
+            if callable(self._sheet):
+                self._sheet = self._sheet()
+            return self._sheet
+
+    def _ensure_loaded(self):
+        """Read the header row and existing emails once per writer"""
+        if self._emails is not None:
+            return
+        if not self.sheet.row_values(1):
+            self.sheet.insert_row(self.HEADERS, 1)
+        self._emails = set(self.sheet.col_values(self.email_column)[1:])  # Skip header
+
+        if self.flush_interval:
+            self._timer = threading.Thread(target=self._flush_periodically, name="sheet-flush", daemon=True)
+            self._timer.start()
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Periodic sheet flush failed, will retry: {str(e)}")
+
+    def contains_email(self, email):
+        """Check if email is already in the sheet or queued for it"""
+        with self._lock:
+            self._ensure_loaded()
+            return email in self._emails
+
+    def emails(self):
+        """Every email in the sheet or queued for it"""
+        with self._lock:
+            self._ensure_loaded()
+            return set(self._emails)
+
+    def add(self, row):
+        """Queue a row unless its email is already present; returns True if queued"""
+        email = row[self.email_column - 1]
+        with self._lock:
+            self._ensure_loaded()
+            if email in self._emails:
+                return False
+            self._emails.add(email)
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # The row stays queued; the timer or close() retries it
+                    print(f"⚠️ Sheet flush failed, {len(self._pending)} rows queued for retry: {str(e)}")
+            return True
+
+    def flush(self):
+        """Write all queued rows in one request"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            rows, self._pending = self._pending, []
+            try:
+                self.sheet.append_rows(rows)
+            except Exception:
+                self._pending = rows + self._pending  # keep them for the next attempt
+                raise
+            print(f"✅ Wrote {len(rows)} rows to Google Sheets")
+            return len(rows)
+
+    def close(self):
+        """Stop the periodic flusher and write anything still queued"""
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        self.flush()
@@ -0,0 +1,143 @@
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+
+class SheetSnapshot:
+    """Local SQLite copy of the applicant worksheet, synced incrementally
+
+    The sheet is append-only in normal operation, so a sync asks Google
+    only for the header row and the rows below the last one we already
+    hold, in a single batch_get call. Every full_refresh_interval seconds
+    the whole sheet is re-read to pick up edits and deletions. Readers
+    always get the local copy, so a page load does not depend on sheet
+    size or Google latency.
+    """
+
+    def __init__(self, path, sheet, min_sync_interval=30, full_refresh_interval=3600):
+        self.sheet = sheet
+        self.min_sync_interval = min_sync_interval
+        self.full_refresh_interval = full_refresh_interval
+        self._lock = threading.RLock()
+        self._last_sync = 0.0
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+    # -- metadata ------------------------------------------------------------
+
+    def _get_meta(self, key, default=None):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def header(self):
+        header = self._get_meta("header")
+        return header.split("\x1f") if header else []
+
+    @property
+    def row_count(self):
+        """Sheet rows below the header consumed so far (blank rows included)"""
+        return int(self._get_meta("row_count", 0))
+
+    @property
+    def version(self):
+        """Increments whenever the local data changes"""
+        return int(self._get_meta("version", 0))
+
+    # -- writes --------------------------------------------------------------
+
+    def _replace_all(self, header, rows):
+        # Positional column names: sheet headers may repeat or contain quotes
+        self._db.execute("DROP TABLE IF EXISTS applicants")
+        columns = "".join(f", c{i} TEXT" for i in range(len(header)))
+        self._db.execute(f"CREATE TABLE applicants (row_number INTEGER PRIMARY KEY{columns})")
+        self._set_meta("header", "\x1f".join(header))
+        self._set_meta("row_count", 0)
+        self._append(header, rows)
+        self._set_meta("full_refresh_at", time.time())
+
+    def _append(self, header, rows):
+        """Store rows that follow the ones already consumed, skipping blank rows"""
+        start = self.row_count
+        width = len(header)
+        records = [
+            (start + i + 2, *(list(row[:width]) + [""] * (width - len(row))))
+            for i, row in enumerate(rows)
+            if any(row)
+        ]
+        placeholders = ", ".join("?" * (width + 1))
+        self._db.executemany(f"INSERT INTO applicants VALUES ({placeholders})", records)
+        self._set_meta("row_count", start + len(rows))
+        return len(records)
+
+    # -- sync ----------------------------------------------------------------
+
+    @staticmethod
+    def _trim(row):
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        return row
+
+    def full_refresh(self):
+        """Re-read the whole sheet"""
+        with self._lock:
+            values = self.sheet.get_all_values()
+            header, rows = (self._trim(values[0]), values[1:]) if values else ([], [])
+            self._replace_all(header, rows)
+            self._set_meta("version", self.version + 1)
+            self._db.commit()
+            self._last_sync = time.time()
+            return True
+
+    def sync(self, force=False):
+        """Fetch rows appended since the last sync; returns True if data changed"""
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_sync < self.min_sync_interval:
+                return False
+            full_refresh_at = float(self._get_meta("full_refresh_at", 0))
+            if not self.header or now - full_refresh_at >= self.full_refresh_interval:
+                return self.full_refresh()
+
+            header = self.header
+            first_new = self.row_count + 2  # 1-based, after the header
+            last_column = rowcol_to_a1(1, len(header)).rstrip("0123456789")
+            header_range, new_rows = self.sheet.batch_get(["1:1", f"A{first_new}:{last_column}"])
+            self._last_sync = now
+
+            if self._trim(header_range[0] if header_range else []) != header:
+                return self.full_refresh()  # columns changed under us
+            if not new_rows:
+                return False
+            added = self._append(header, new_rows)
+            if added:
+                self._set_meta("version", self.version + 1)
+            self._db.commit()
+            return bool(added)
+
+    # -- reads ---------------------------------------------------------------
+
+    def to_dataframe(self):
+        """The snapshot as a DataFrame with the sheet's column names"""
+        with self._lock:
+            header = self.header
+            if not header:
+                return pd.DataFrame()
+            columns = ", ".join(f"c{i}" for i in range(len(header)))
+            df = pd.read_sql_query(f"SELECT {columns} FROM applicants ORDER BY row_number", self._db)
+            df.columns = header
+            return df
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,294 @@
+"""Where resumes and applicant records are stored
+
+Two small interfaces, each with a Google implementation and a local one:
+
+    blob stores       lookup(file_hash), lookup_many(hashes), put(path, file_hash), close()
+                      DriveBlobStore (Google Drive folder), LocalBlobStore (filesystem)
+    applicant stores  contains_email(email), add(row), flush(), close()
+                      sheet_sink.BatchedSheetWriter (Google Sheets), SQLiteApplicantStore
+
+Stored files are returned as {"id", "webViewLink"}; applicant rows are
+[Name, Email Address, Phone No, Google Drive Link], i.e. HEADERS.
+"""
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from sheet_sink import BatchedSheetWriter
+
+HEADERS = BatchedSheetWriter.HEADERS
+
+
+class DriveBlobStore:
+    """Resumes in one Google Drive folder, de-duplicated through a DriveHashIndex"""
+
+    name = "Drive"
+
+    def __init__(self, get_service, index, folder_id, chunk_size, resumable_threshold):
+        self._get_service = get_service  # returns a Drive client for the calling thread
+        self.index = index
+        self.folder_id = folder_id
+        self.chunk_size = chunk_size
+        self.resumable_threshold = resumable_threshold
+
+    def lookup(self, file_hash):
+        return self.index.lookup(file_hash)
+
+    def lookup_many(self, file_hashes):
+        return self.index.lookup_many(file_hashes)
+
+    def put(self, file_path, file_hash):
+        from drive_ops import upload_file
+
+        file_metadata = {
+            "name": os.path.basename(file_path),
+            "parents": [self.folder_id],
+            "properties": {"file_hash": file_hash}
+        }
+        # Large files go up in resumable chunks that survive transient failures
+        uploaded_file = upload_file(
+            self._get_service(),
+            file_path,
+            file_metadata,
+            fields="id, webViewLink",
+            chunk_size=self.chunk_size,
+            resumable_threshold=self.resumable_threshold,
+            supportsAllDrives=True
+        )
+        self.index.add(file_hash, uploaded_file["id"], uploaded_file["webViewLink"])
+        return uploaded_file
+
+    def close(self):
+        self.index.close()
+
+
+class LocalBlobStore:
+    """Content-addressed resume files on the local filesystem
+
+    A file lives at root/<hash[:2]>/<hash>.pdf, so lookups are a single
+    stat and storing the same resume twice is a no-op. The link handed out
+    is a file:// URI.
+    """
+
+    name = "local store"
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, file_hash):
+        return self.root / file_hash[:2] / f"{file_hash}.pdf"
+
+    def _resource(self, file_hash):
+        return {"id": file_hash, "webViewLink": self._path(file_hash).as_uri()}
+
+    def lookup(self, file_hash):
+        return self._resource(file_hash) if self._path(file_hash).exists() else None
+
+    def lookup_many(self, file_hashes):
+        return {file_hash: self.lookup(file_hash) for file_hash in set(file_hashes)}
+
+    def put(self, file_path, file_hash):
+        target = self._path(file_hash)
+        target.parent.mkdir(exist_ok=True)
+        tmp_path = target.with_suffix(f".{threading.get_ident()}.tmp")
+        shutil.copyfile(file_path, tmp_path)
+        os.replace(tmp_path, target)  # readers never see a partial file
+        return self._resource(file_hash)
+
+    def close(self):
+        pass
+
+
+class SQLiteApplicantStore:
+    """Applicant records in an indexed SQLite table
+
+    On its own this is the system of record: inserts are local and never
+    wait on Google quotas. Given a mirror (a BatchedSheetWriter), it acts
+    as a write-ahead buffer instead. Rows are committed locally first, and
+    a background thread copies them to Sheets in batches, marking each
+    batch once Google accepted it. Mirroring survives restarts and quota
+    errors, since unmirrored rows simply wait in the table, and the
+    mirror's own email check keeps a retried batch from being written twice.
+
+    Duplicate checks never touch Google. The emails already in the sheet
+    are copied into a local table once, by the mirror thread, and rows
+    added to the sheet elsewhere after that are caught by the mirror.
+
+    It also offers the header / version / sync / to_dataframe interface of
+    SheetSnapshot, so the dashboard can read straight from it.
+    """
+
+    def __init__(self, path, mirror=None, mirror_interval=5.0, mirror_batch=500):
+        self.path = path
+        self.mirror = mirror
+        self.mirror_interval = mirror_interval
+        self.mirror_batch = mirror_batch
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS applicants ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "name TEXT, email TEXT NOT NULL, phone TEXT, drive_link TEXT, "
+            "created_at REAL NOT NULL, mirrored INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE UNIQUE INDEX IF NOT EXISTS applicants_email ON applicants (email)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS applicants_unmirrored ON applicants (id) WHERE mirrored = 0")
+        self._db.execute("CREATE TABLE IF NOT EXISTS sheet_emails (email TEXT PRIMARY KEY)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+        self._data_version = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._mirror_thread = None
+        if mirror is not None:
+            self._mirror_thread = threading.Thread(target=self._mirror_loop, name="sheet-mirror", daemon=True)
+            self._mirror_thread.start()
+
+    # -- applicant store -----------------------------------------------------
+
+    def _contains(self, email):
+        return self._db.execute(
+            "SELECT 1 FROM applicants WHERE email = ? UNION ALL SELECT 1 FROM sheet_emails WHERE email = ?",
+            (email, email)
+        ).fetchone() is not None
+
+    def contains_email(self, email):
+        with self._lock:
+            return self._contains(email)
+
+    def add(self, row):
+        """Insert a row unless its email is already known; returns True if inserted"""
+        name, email, phone, drive_link = (list(row) + [""] * 4)[:4]
+        with self._lock:
+            if self._contains(email):
+                return False
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO applicants (name, email, phone, drive_link, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (name, email, phone, drive_link, time.time())
+            )
+            self._db.commit()
+        return cursor.rowcount == 1
+
+    def flush(self):
+        """Mirror everything pending now (a no-op without a mirror)"""
+        if self.mirror is None:
+            return 0
+        mirrored = 0
+        while True:
+            count = self._mirror_once()
+            mirrored += count
+            if count < self.mirror_batch:
+                return mirrored
+
+    def pending(self):
+        """Rows not yet mirrored to the sheet"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM applicants WHERE mirrored = 0").fetchone()[0]
+
+    # -- mirroring -----------------------------------------------------------
+
+    @property
+    def seeded(self):
+        """Whether the sheet's existing emails were copied into sheet_emails"""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone() is not None
+
+    def _seed_from_mirror(self):
+        """Copy the emails already in the sheet, once per store"""
+        if self.seeded:
+            return
+        emails = self.mirror.emails()  # one read of the email column
+        with self._lock:
+            self._db.executemany("INSERT OR IGNORE INTO sheet_emails (email) VALUES (?)",
+                                 [(email,) for email in emails if email])
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seeded', ?)", (str(time.time()),))
+            self._db.commit()
+        print(f"✅ Seeded {len(emails)} existing applicant emails from Google Sheets")
+
+    def _mirror_once(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, name, email, phone, drive_link FROM applicants "
+                "WHERE mirrored = 0 ORDER BY id LIMIT ?",
+                (self.mirror_batch,)
+            ).fetchall()
+        if not rows:
+            return 0
+        for _, name, email, phone, drive_link in rows:
+            self.mirror.add([name, email, phone, drive_link])  # skips emails already in the sheet
+        self.mirror.flush()
+        with self._lock:
+            self._db.executemany("UPDATE applicants SET mirrored = 1 WHERE id = ?", [(row[0],) for row in rows])
+            self._db.commit()
+        return len(rows)
+
+    def _mirror_loop(self):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                self._seed_from_mirror()
+                self.flush()
+                failures = 0
+                delay = self.mirror_interval
+            except Exception as e:
+                failures += 1
+                delay = min(self.mirror_interval * 2 ** failures, 300)
+                print(f"⚠️ Sheet mirror failed, retrying in {delay:.0f}s: {str(e)}")
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    # -- SheetSnapshot-compatible reads --------------------------------------
+
+    @property
+    def header(self):
+        return list(HEADERS)
+
+    @property
+    def version(self):
+        """Grows whenever rows are added (rows are never updated or removed)"""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(id), 0) FROM applicants").fetchone()[0]
+
+    def sync(self, force=False):
+        """True if rows were added (by any process) since the last call"""
+        with self._lock:
+            version = self.version
+            changed = version != self._data_version
+            self._data_version = version
+            return changed
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        with self._lock:
+            df = pd.read_sql_query(
+                "SELECT name, email, phone, drive_link FROM applicants ORDER BY id", self._db
+            )
+        df.columns = HEADERS
+        return df
+
+    def close(self):
+        if self._mirror_thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._mirror_thread.join()
+            self._mirror_thread = None
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ {self.pending()} rows not yet mirrored to Sheets; they will be sent next run ({str(e)})")
+            try:
+                self.mirror.close()
+            except Exception:
+                pass  # whatever it still queues is unmirrored here too
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+
+
+def sort_order(df, column, ascending=True):
+    """Row positions of df ordered by column (case-insensitive, stable)
+
+    Meant to be computed once per data version and column, then reused for
+    every filter via order_positions.
+    """
+    keys = df[column].astype(str).str.lower().to_numpy()
+    order = np.argsort(keys, kind="stable")
+    return order if ascending else order[::-1]
+
+
+def order_positions(positions, order, size):
+    """The subset positions rearranged to follow a precomputed full-table order"""
+    if order is None:
+        return positions
+    mask = np.zeros(size, dtype=bool)
+    mask[positions] = True
+    return order[mask[order]]
+
+
+def page_count(total_rows, page_size):
+    return max(math.ceil(total_rows / page_size), 1)
+
+
+def paginate(positions, page, page_size):
+    """Slice one page out of ordered row positions
+
+    Returns (page_positions, info); info carries page, page_count,
+    page_size, total_rows and the 1-based first/last row shown.
+    """
+    total_rows = len(positions)
+    pages = page_count(total_rows, page_size)
+    page = min(max(int(page), 1), pages)
+    start = (page - 1) * page_size
+    end = min(start + page_size, total_rows)
+    info = {
+        "page": page,
+        "page_count": pages,
+        "page_size": page_size,
+        "total_rows": total_rows,
+        "first_row": start + 1 if total_rows else 0,
+        "last_row": end,
+    }
+    return positions[start:end], info
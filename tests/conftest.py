@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def make_processor(tmp_path, monkeypatch):
+    """Build ResumeProcessors on local storage under tmp_path (no Google, no IMAP)"""
+    monkeypatch.setenv("LOCAL_FOLDER", str(tmp_path / "Resume"))
+    monkeypatch.setenv("STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setenv("BLOB_BACKEND", "local")
+    monkeypatch.setenv("APPLICANT_BACKEND", "sqlite")
+    monkeypatch.setenv("METRICS_DIR", "")
+    monkeypatch.delenv("METRICS_PORT", raising=False)
+    monkeypatch.delenv("METRICS_TEXTFILE", raising=False)
+    os.makedirs(tmp_path / "Resume", exist_ok=True)
+    processors = []
+
+    def make():
+        from final import ResumeProcessor
+
+        processor = ResumeProcessor()
+        processors.append(processor)
+        return processor
+
+    yield make
+    for processor in processors:
+        processor.close()
+
+
+class FakeSheet:
+    """The worksheet calls BatchedSheetWriter makes, on a list of rows
+
+    Set fail to an exception to make append_rows raise it.
+    """
+
+    def __init__(self, rows=None):
+        self.rows = [list(row) for row in rows or []]
+        self.fail = None
+        self.reads = 0
+
+    def row_values(self, row):
+        self.reads += 1
+        return list(self.rows[row - 1]) if len(self.rows) >= row else []
+
+    def col_values(self, col):
+        self.reads += 1
+        return [row[col - 1] if len(row) >= col else "" for row in self.rows]
+
+    def insert_row(self, values, index=1):
+        self.rows.insert(index - 1, list(values))
+
+    def append_rows(self, rows, **kwargs):
+        if self.fail is not None:
+            raise self.fail
+        self.rows.extend(list(row) for row in rows)
+
+
+@pytest.fixture
+def fake_sheet():
+    return FakeSheet()
@@ -0,0 +1,118 @@
+import fcntl
+import sys
+import threading
+
+import pytest
+
+from benchmarks.synthetic_corpus import write_pdf
+from daemon import AlreadyRunning, PollingDaemon, run_lock
+
+
+class Mailbox:
+    """Stands in for IncrementalFetcher over a list of (uid, filename, pdf bytes)"""
+
+    key = "hr@example.com/inbox"
+    uidvalidity = 7
+
+    def __init__(self, state):
+        self.state = state
+        self.messages = []
+
+    def new_uids(self, search_criteria):
+        last_uid = self.state.get(self.key, self.uidvalidity)
+        return [uid for uid, _, _ in self.messages if uid > last_uid]
+
+    def parts(self, fetcher, uid):
+        for message_uid, filename, content in self.messages:
+            if message_uid == uid:
+                yield filename, content
+
+
+def resume_pdf(tmp_path, i):
+    path = tmp_path / f"source_{i}.pdf"
+    write_pdf(str(path), [[f"Applicant Number{i}", f"applicant{i}@example.com", "+1 555 010 0000"]])
+    return path.read_bytes()
+
+
+@pytest.fixture
+def polling(make_processor, tmp_path):
+    processor = make_processor()
+    mailbox = Mailbox(processor.imap_state)
+    processor._iter_pdf_parts = mailbox.parts
+    daemon = PollingDaemon(processor, "hr@example.com", "secret", interval=60, jitter=0,
+                           lock_path=str(tmp_path / "processor.lock"))
+
+    def connect():
+        daemon.fetcher = mailbox
+
+    daemon._ensure_connected = connect
+    return daemon, mailbox
+
+
+def hold_from_another_process(path):
+    """An flock on a separate open file, as another process would take it"""
+    handle = open(path, "a+")
+    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return handle
+
+
+def test_run_lock_refuses_a_second_holder(tmp_path):
+    path = str(tmp_path / "locks" / "processor.lock")
+    with run_lock(path):
+        with run_lock(path):  # the same process may take it again
+            pass
+        with pytest.raises(BlockingIOError):
+            hold_from_another_process(path)
+
+    handle = hold_from_another_process(path)
+    with pytest.raises(AlreadyRunning):
+        with run_lock(path):
+            pass
+    handle.close()
+    with run_lock(path):  # released with its holder
+        pass
+
+
+def test_skipped_run_never_builds_a_processor(tmp_path, monkeypatch, capsys):
+    import final
+
+    lock = str(tmp_path / "processor.lock")
+    monkeypatch.setenv("LOCK_FILE", lock)
+    monkeypatch.setenv("EMAIL", "hr@example.com")
+    monkeypatch.setenv("PASSWORD", "secret")
+    monkeypatch.setattr(sys, "argv", ["final.py", "--daemon"])
+
+    def build(*args, **kwargs):
+        raise AssertionError("ResumeProcessor built while another run holds the lock")
+
+    monkeypatch.setattr(final, "ResumeProcessor", build)
+    handle = hold_from_another_process(lock)
+    final.main()
+    handle.close()
+    assert "Not starting" in capsys.readouterr().out
+
+
+def test_cycle_processes_new_mail_and_advances(polling, tmp_path):
+    daemon, mailbox = polling
+    mailbox.messages = [(uid, f"resume_{uid}.pdf", resume_pdf(tmp_path, uid)) for uid in (3, 4)]
+
+    assert daemon.cycle() == 2
+    assert daemon.processor.applicant_store.contains_email("applicant3@example.com")
+    assert daemon.processor.applicant_store.contains_email("applicant4@example.com")
+    assert daemon.cycle() == 0  # nothing new above the watermark
+
+    mailbox.messages.append((5, "resume_5.pdf", resume_pdf(tmp_path, 5)))
+    assert daemon.cycle() == 1
+    assert daemon.cycles == 3
+
+
+def test_stop_ends_run_after_the_current_cycle(polling):
+    daemon, _ = polling
+    thread = threading.Thread(target=daemon.run)
+    thread.start()
+    while daemon.cycles == 0 and thread.is_alive():
+        thread.join(0.01)
+    daemon.stop()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert daemon.cycles == 1
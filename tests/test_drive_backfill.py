@@ -0,0 +1,37 @@
+import hashlib
+
+import drive_to_sheet
+from benchmarks.synthetic_corpus import write_pdf
+from extraction_cache import ExtractionCache
+
+
+def make_pdf(tmp_path):
+    path = tmp_path / "resume.pdf"
+    write_pdf(str(path), [["Jane Doe", "jane@example.com", "+1 555 123 4567"]])
+    return path.read_bytes()
+
+
+def test_backfill_downloads_a_resume_only_once(tmp_path, monkeypatch):
+    content = make_pdf(tmp_path)
+    downloads = []
+    monkeypatch.setattr(drive_to_sheet, "download_from_drive", lambda file_id: downloads.append(file_id) or content)
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"))
+    file = {"id": "drive-1", "link": "https://drive.example/1", "sha256": hashlib.sha256(content).hexdigest()}
+
+    first = drive_to_sheet.extract_drive_resume(cache, file)
+    second = drive_to_sheet.extract_drive_resume(cache, file)
+    assert first == second
+    assert first["Email"] == "jane@example.com"
+    assert downloads == ["drive-1"]  # the second run is a cache hit on Drive's checksum
+    cache.close()
+
+
+def test_backfill_without_a_drive_checksum_hashes_the_download(tmp_path, monkeypatch):
+    content = make_pdf(tmp_path)
+    monkeypatch.setattr(drive_to_sheet, "download_from_drive", lambda file_id: content)
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"))
+
+    details = drive_to_sheet.extract_drive_resume(cache, {"id": "drive-1", "link": ""})
+    assert details["Phone"] == "+1 555 123 4567"
+    assert cache.get(hashlib.sha256(content).hexdigest()) is not None
+    cache.close()
@@ -0,0 +1,100 @@
+import pytest
+
+from benchmarks import fake_services
+from benchmarks.fake_services import Faults, FakeDrive
+from drive_index import DriveHashIndex
+
+FOLDER = "folder-1"
+
+
+@pytest.fixture
+def drive():
+    return FakeDrive(Faults(latency=0), backoff_scale=0)
+
+
+def upload(drive, file_hash, folder=FOLDER):
+    return drive._create({"name": f"{file_hash}.pdf", "parents": [folder],
+                          "properties": {"file_hash": file_hash}}, None)
+
+
+def make_index(tmp_path, drive, folder=FOLDER, **kwargs):
+    return DriveHashIndex(str(tmp_path / "drive_index.sqlite3"), folder, drive.service, **kwargs)
+
+
+def test_first_lookup_lists_the_folder_then_answers_locally(tmp_path, drive):
+    existing = upload(drive, "aaa")
+    upload(drive, "bbb", folder="elsewhere")
+    index = make_index(tmp_path, drive)
+
+    assert index.lookup("aaa") == existing
+    calls = drive.faults.calls
+    assert index.lookup("aaa") == existing
+    assert drive.faults.calls == calls  # served from SQLite
+    index.close()
+
+
+def test_confirmed_misses_are_remembered_until_added(tmp_path, drive):
+    index = make_index(tmp_path, drive)
+    assert index.lookup("ccc") is None
+    calls = drive.faults.calls
+    assert index.lookup("ccc") is None
+    assert drive.faults.calls == calls
+
+    index.add("ccc", "id-ccc", "https://drive.example/id-ccc")
+    assert index.lookup("ccc") == {"id": "id-ccc", "webViewLink": "https://drive.example/id-ccc"}
+    index.close()
+
+
+def test_lookup_many_resolves_misses_in_one_batch(tmp_path, drive):
+    uploaded = {h: upload(drive, h) for h in ("h1", "h2")}
+    index = make_index(tmp_path, drive)
+    index.reconcile()
+    upload_after = upload(drive, "h3")  # not in the local index yet
+
+    calls = drive.faults.calls
+    found = index.lookup_many(["h1", "h2", "h3", "h4"])
+    assert found == {"h1": uploaded["h1"], "h2": uploaded["h2"], "h3": upload_after, "h4": None}
+    assert drive.faults.calls == calls + 1
+    index.close()
+
+
+def test_rate_limited_requests_are_retried(tmp_path):
+    drive = FakeDrive(Faults(latency=0, error_rate=0.5, seed=3), backoff_scale=0)
+    existing = upload(drive, "aaa")
+    index = make_index(tmp_path, drive, max_retries=8)
+
+    assert index.lookup("aaa") == existing
+    assert index.lookup("zzz") is None
+    assert drive.faults.errors > 0
+    index.close()
+
+
+def test_changes_feed_drops_trashed_files(tmp_path, drive, monkeypatch):
+    existing = upload(drive, "aaa")
+    index = make_index(tmp_path, drive)
+    assert index.lookup("aaa") == existing
+
+    drive._files[existing["id"]]["trashed"] = True
+    change = {"fileId": existing["id"], "file": dict(drive._files[existing["id"]])}
+
+    def list_changes(self, pageToken=None, **kwargs):
+        return fake_services._Request(self._drive, lambda: {"changes": [change], "newStartPageToken": "2"})
+
+    monkeypatch.setattr(fake_services._Changes, "list", list_changes)
+    index.mark_stale()
+    assert index.lookup("aaa") is None
+    index.close()
+
+
+def test_index_for_another_folder_is_discarded(tmp_path, drive):
+    index = make_index(tmp_path, drive)
+    index.reconcile()
+    index.add("aaa", "id-aaa", "link")
+    index.close()
+    same = make_index(tmp_path, drive)
+    assert same._get_local("aaa") is not None
+    same.close()
+
+    other = make_index(tmp_path, drive, folder="folder-2")
+    assert other._get_local("aaa") is None
+    other.close()
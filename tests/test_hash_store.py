@@ -0,0 +1,86 @@
+import hashlib
+import os
+
+from hash_store import BloomFilter, ProcessedHashStore
+
+
+def digest_hex(i):
+    return hashlib.sha256(f"resume {i}".encode()).hexdigest()
+
+
+def test_added_hashes_survive_a_reopen(tmp_path):
+    store = ProcessedHashStore(str(tmp_path))
+    store.add(digest_hex(1))
+    store.add(digest_hex(1))  # duplicates are not journaled twice
+    assert digest_hex(1) in store
+    assert digest_hex(2) not in store
+    store.close()
+
+    reopened = ProcessedHashStore(str(tmp_path))
+    assert digest_hex(1) in reopened
+    assert len(reopened) == 1
+    reopened.close()
+
+
+def test_journal_entries_from_another_writer_are_seen(tmp_path):
+    reader = ProcessedHashStore(str(tmp_path))
+    writer = ProcessedHashStore(str(tmp_path))
+    writer.add(digest_hex(7))
+    # The reader picks up the journal on a miss, without reopening
+    assert digest_hex(7) in reader
+    reader.close()
+    writer.close()
+
+
+def test_journal_is_compacted_into_the_sorted_index(tmp_path):
+    store = ProcessedHashStore(str(tmp_path), compact_threshold=50)
+    for i in range(120):
+        store.add(digest_hex(i))
+
+    assert len(store) == 120
+    assert all(digest_hex(i) in store for i in range(120))
+    assert digest_hex(500) not in store
+    with open(store.index_path, "rb") as f:
+        data = f.read()
+    digests = [data[i:i + 32] for i in range(0, len(data), 32)]
+    assert digests == sorted(digests)
+    assert len(digests) + os.path.getsize(store.journal_path) // 32 == 120
+    store.close()
+
+
+def test_stale_bloom_filter_is_rebuilt_from_the_index(tmp_path):
+    store = ProcessedHashStore(str(tmp_path), compact_threshold=10)
+    for i in range(10):
+        store.add(digest_hex(i))
+    store.close()
+    with open(store.bloom_path, "wb") as f:
+        f.write(BloomFilter(capacity=1024).to_bytes(0))  # wrong item count
+
+    reopened = ProcessedHashStore(str(tmp_path))
+    assert all(digest_hex(i) in reopened for i in range(10))
+    reopened.close()
+
+
+def test_legacy_processed_files_txt_is_migrated(tmp_path):
+    legacy = tmp_path / "processed_files.txt"
+    legacy.write_text(f"{digest_hex(1)}\nnot-a-hash\n{digest_hex(2)}\n")
+
+    store = ProcessedHashStore(str(tmp_path))
+    assert digest_hex(1) in store and digest_hex(2) in store
+    assert len(store) == 2
+    assert not legacy.exists()
+    assert (tmp_path / "processed_files.txt.migrated").exists()
+    store.close()
+
+
+def test_bloom_filter_round_trip_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    digests = [bytes.fromhex(digest_hex(i)) for i in range(1000)]
+    for digest in digests:
+        bloom.add(digest)
+
+    restored, count = BloomFilter.from_bytes(bloom.to_bytes(len(digests)))
+    assert count == 1000
+    assert all(digest in restored for digest in digests)
+    misses = sum(bytes.fromhex(digest_hex(i)) in restored for i in range(1000, 11000))
+    assert misses < 200  # ~1% expected at 10 bits per item
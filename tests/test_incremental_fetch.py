@@ -0,0 +1,73 @@
+class StubFetcher:
+    """Stands in for IncrementalFetcher: serves UIDs above the saved watermark"""
+
+    key = "hr@example.com/inbox"
+    uidvalidity = 7
+
+    def __init__(self, state, uids):
+        self.state = state
+        self.uids = uids
+
+    def new_uids(self, search_criteria):
+        last_uid = self.state.get(self.key, self.uidvalidity)
+        return [uid for uid in self.uids if uid > last_uid]
+
+
+def test_failed_message_is_retried_on_next_poll(make_processor):
+    processor = make_processor()
+    fetcher = StubFetcher(processor.imap_state, [11, 12, 13])
+    broken = {12}
+
+    def iter_pdf_parts(fetcher, uid):
+        if uid in broken:
+            raise ConnectionError("FETCH timed out")
+        yield f"resume_{uid}.pdf", f"%PDF-1.4 resume {uid}".encode()
+
+    processor._iter_pdf_parts = iter_pdf_parts
+    saved = processor.fetch_new_attachments(fetcher, "ALL")
+    assert [path.endswith("_resume_11.pdf") for path in saved] == [True]
+    # The watermark stops before the failed message, not after the batch
+    assert processor.imap_state.get(fetcher.key, fetcher.uidvalidity) == 11
+
+    broken.clear()
+    saved = processor.fetch_new_attachments(fetcher, "ALL")
+    assert [path.endswith(("_resume_12.pdf", "_resume_13.pdf")) for path in saved] == [True, True]
+    assert processor.imap_state.get(fetcher.key, fetcher.uidvalidity) == 13
+
+
+def test_message_that_always_fails_is_skipped_after_max_attempts(make_processor, monkeypatch):
+    monkeypatch.setenv("IMAP_MAX_ATTEMPTS", "3")
+    processor = make_processor()
+    fetcher = StubFetcher(processor.imap_state, [11, 12, 13])
+
+    def iter_pdf_parts(fetcher, uid):
+        if uid == 12:
+            raise ValueError("malformed BODYSTRUCTURE")
+        yield f"resume_{uid}.pdf", f"%PDF-1.4 resume {uid}".encode()
+
+    processor._iter_pdf_parts = iter_pdf_parts
+    for _ in range(2):
+        processor.fetch_new_attachments(fetcher, "ALL")
+        assert processor.imap_state.get(fetcher.key, fetcher.uidvalidity) == 11
+
+    # Third failure: logged and skipped, and the messages after it go through
+    saved = processor.fetch_new_attachments(fetcher, "ALL")
+    assert [path.endswith("_resume_13.pdf") for path in saved] == [True]
+    assert processor.imap_state.get(fetcher.key, fetcher.uidvalidity) == 13
+
+
+def test_failure_counts_survive_a_restart_and_clear_once_passed(tmp_path):
+    from imap_incremental import MailboxState
+
+    path = str(tmp_path / "imap_state.json")
+    state = MailboxState(path)
+    state.update("box", 7, 10)
+    assert state.record_failure("box", 7, 11) == 1
+    assert MailboxState(path).record_failure("box", 7, 11) == 2
+    state = MailboxState(path)
+    assert state.get("box", 7) == 10
+
+    state.update("box", 7, 11)
+    assert state.record_failure("box", 7, 11) == 1  # count restarted
+    assert state.record_failure("box", 8, 11) == 1  # new UIDVALIDITY, new mailbox
+    assert state.get("box", 8) == 0
@@ -0,0 +1,88 @@
+import socket
+import time
+
+import pytest
+
+from notifier import NotificationDispatcher
+
+
+class Inbox:
+    """aiosmtpd handler that keeps every delivered message"""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp():
+    aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+    inbox = Inbox()
+    controller = aiosmtpd_controller.Controller(inbox, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield inbox, controller.port
+    controller.stop()
+
+
+def applicant(i):
+    return {"Name": f"Applicant {i}", "Email": f"applicant{i}@example.com", "Phone": "555-0100"}
+
+
+def make_dispatcher(port, **kwargs):
+    return NotificationDispatcher("hr-bot@example.com", None, "hr@example.com", host="127.0.0.1",
+                                  port=port, use_ssl=False, **kwargs)
+
+
+def test_each_applicant_is_sent_over_one_session(smtp):
+    inbox, port = smtp
+    dispatcher = make_dispatcher(port)
+    for i in range(3):
+        dispatcher.notify(applicant(i))
+    dispatcher.close(timeout=10)
+
+    assert dispatcher.sent == 3 and dispatcher.failed == 0
+    assert len(inbox.messages) == 3
+    assert len(inbox.sessions) == 1
+    assert all(m.rcpt_tos == ["hr@example.com"] for m in inbox.messages)
+    assert b"Subject: New Job Application: Applicant 0" in inbox.messages[0].content
+
+
+def test_digest_batches_an_interval_into_one_email(smtp):
+    inbox, port = smtp
+    dispatcher = make_dispatcher(port, digest_interval=0.3)
+    for i in range(3):
+        dispatcher.notify(applicant(i))
+    deadline = time.monotonic() + 10
+    while not inbox.messages and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert len(inbox.messages) == 1
+    assert b"Subject: 3 New Job Applications" in inbox.messages[0].content
+    dispatcher.notify(applicant(3))
+    dispatcher.close(timeout=10)  # flushes the open digest
+    assert len(inbox.messages) == 2
+    assert dispatcher.sent == 4
+
+
+def test_missing_hr_email_skips_the_notification(monkeypatch, capsys):
+    import notification
+
+    monkeypatch.setattr(notification, "SENDER_EMAIL", "hr-bot@example.com")
+    monkeypatch.setattr(notification, "SENDER_PASSWORD", "secret")
+    monkeypatch.setattr(notification, "dispatcher", None)
+    monkeypatch.delenv("HR_EMAIL", raising=False)
+    monkeypatch.setenv("SENDER_EMAIL", "hr-bot@example.com")
+
+    notification.send_email_notification(applicant(1))
+    assert "HR_EMAIL is not set" in capsys.readouterr().out
@@ -0,0 +1,51 @@
+import hashlib
+import sys
+import types
+
+import pytest
+
+from benchmarks.synthetic_corpus import write_pdf
+from extraction_cache import cached_extract_details
+
+
+@pytest.fixture
+def ocr_calls(monkeypatch):
+    """Replace the ocr module (pytesseract / tesseract aren't needed) and record its calls"""
+    calls = []
+
+    def ocr_extract_text(pdf_path, page_texts=None, file_hash=None, cache=None):
+        calls.append({"page_texts": page_texts, "file_hash": file_hash})
+        return "".join((text or "OCR Jane\njane@example.com\n+1 555 123 4567") + "\n" for text in page_texts)
+
+    fake = types.SimpleNamespace(ocr_extract_text=ocr_extract_text, OCRCache=lambda cache_dir: None,
+                                 shutdown_pool=lambda: None)
+    monkeypatch.setitem(sys.modules, "ocr", fake)
+    return calls
+
+
+def extract(processor, tmp_path, pages):
+    path = str(tmp_path / "resume.pdf")
+    write_pdf(path, pages)
+    with open(path, "rb") as f:
+        content = f.read()
+    file_hash = hashlib.sha256(content).hexdigest()
+    details = cached_extract_details(processor.extraction_cache, file_hash, content, processor.extract_details)
+    return processor.ocr_fallback(path, file_hash, details), file_hash
+
+
+def test_scanned_pages_are_ocrd_from_the_cached_page_texts(make_processor, tmp_path, ocr_calls):
+    processor = make_processor()
+    details, file_hash = extract(processor, tmp_path, [["Jane Doe", "Software Engineer"], []])
+
+    assert details["Email"] == "jane@example.com"
+    assert len(ocr_calls) == 1
+    assert ocr_calls[0]["file_hash"] == file_hash
+    assert ocr_calls[0]["page_texts"][1] == ""  # only this page needs OCR
+
+
+def test_text_pdf_without_an_email_is_not_ocrd(make_processor, tmp_path, ocr_calls):
+    processor = make_processor()
+    details, _ = extract(processor, tmp_path, [["Jane Doe", "Software Engineer"], ["Experience"]])
+
+    assert details["Email"] == "N/A"
+    assert ocr_calls == []
@@ -0,0 +1,23 @@
+import random
+
+from pdf_text import extract_details_from_pages
+from resume_details import extract_details
+
+
+def test_phone_split_across_pages_is_found():
+    pages = ["Jane Doe\nSoftware Engineer\njane@example.com\nCall me on +1 555",
+             "123 4567 any time\nExperience"]
+    details, text = extract_details_from_pages(iter(pages), extract_details)
+    assert details == extract_details(text)
+    assert details["Phone"] == "+1 555\n123 4567"
+
+
+def test_page_by_page_matches_a_search_of_the_text_read():
+    rng = random.Random(7)
+    snippets = ["John Smith", "Resume", "contact: a.b@example.org", "+44 20", "7946 0958",
+                "Skills", "x", "", "2019 - 2023", "phone 555.123.4567"]
+    for _ in range(3000):
+        pages = ["\n".join(rng.choice(snippets) for _ in range(rng.randint(0, 3)))
+                 for _ in range(rng.randint(1, 6))]
+        details, text = extract_details_from_pages(iter(pages), extract_details)
+        assert details == extract_details(text), pages
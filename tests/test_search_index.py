@@ -0,0 +1,76 @@
+import random
+import threading
+
+import pandas as pd
+import pytest
+
+from search_index import ApplicantSearchIndex, _normalize
+
+NAMES = ["john", "jane", "ananya", "patel", "smith", "maria", "garcia", "li", "wei", "chen"]
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = random.Random(5)
+    n = 3000
+    return pd.DataFrame({
+        "Name": [f"{rng.choice(NAMES).title()} {rng.choice(NAMES).title()}" for _ in range(n)],
+        "Email Address": [f"{rng.choice(NAMES)}.{rng.randint(0, 999)}@{rng.choice(['gmail.com', 'corp.io'])}"
+                          for _ in range(n)],
+        "Phone No": [f"+1 ({rng.randint(200, 999)}) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+                     for _ in range(n)],
+    })
+
+
+def brute_force(index, query):
+    result = None
+    for field, term in index.parse(query):
+        rows = set()
+        for name in [field] if field else ["name", "email", "phone"]:
+            normalized = _normalize(name, term)
+            if normalized:
+                rows |= {i for i, value in enumerate(index.values[name]) if normalized in value}
+        result = rows if result is None else result & rows
+    return sorted(result)
+
+
+@pytest.mark.parametrize("query", ["a", "an", "ana", "anan", "ananya", "GARCIA", "email:gmail", "name:li",
+                                   "phone:555", "(2", "smith jane", 'name:"maria chen"', "zzz", "li 12"])
+def test_search_matches_brute_force(df, query):
+    index = ApplicantSearchIndex(df)
+    assert index.search(query).tolist() == brute_force(index, query)
+
+
+def test_typing_a_query_one_character_at_a_time(df):
+    index = ApplicantSearchIndex(df)
+    for word in ["ananya", "gmail.com", "garcia", "5551"]:
+        for i in range(1, len(word) + 1):
+            assert index.search(word[:i]).tolist() == brute_force(index, word[:i])
+
+
+def test_short_cached_terms_do_not_widen_refinement(df):
+    index = ApplicantSearchIndex(df)
+    index.search("name:a")  # matches most rows
+    trigram_only = ApplicantSearchIndex(df)._candidates("name", "anan")
+    assert len(index._candidates("name", "anan")) <= len(trigram_only)
+
+
+def test_concurrent_sessions_share_the_cache_safely(df):
+    index = ApplicantSearchIndex(df, cache_size=8)
+    errors = []
+
+    def hammer(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(300):
+                word = rng.choice(NAMES)
+                index.search(word[:rng.randint(1, len(word))])
+        except Exception as e:  # e.g. "OrderedDict mutated during iteration"
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,27 @@
+from sheet_sink import BatchedSheetWriter
+
+
+def row(i):
+    return [f"Applicant {i}", f"applicant{i}@example.com", "555-0100", ""]
+
+
+def test_rows_are_written_in_batches_without_duplicates(fake_sheet):
+    writer = BatchedSheetWriter(fake_sheet, batch_size=2, flush_interval=0)
+    assert writer.add(row(1)) is True
+    assert writer.add(row(1)) is False
+    assert fake_sheet.rows == [BatchedSheetWriter.HEADERS]
+    assert writer.add(row(2)) is True
+    assert fake_sheet.rows[1:] == [row(1), row(2)]
+    writer.close()
+
+
+def test_failed_batch_flush_keeps_the_row_queued(fake_sheet):
+    writer = BatchedSheetWriter(fake_sheet, batch_size=1, flush_interval=0)
+    fake_sheet.fail = ConnectionError("quota exceeded")
+    # The row was queued, so add() reports success even though the write failed
+    assert writer.add(row(1)) is True
+    assert fake_sheet.rows == [BatchedSheetWriter.HEADERS]
+
+    fake_sheet.fail = None
+    writer.close()
+    assert fake_sheet.rows[1:] == [row(1)]
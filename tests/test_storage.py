@@ -0,0 +1,98 @@
+import time
+
+from sheet_sink import BatchedSheetWriter
+from storage import HEADERS, LocalBlobStore, SQLiteApplicantStore
+
+
+def row(i):
+    return [f"Applicant {i}", f"applicant{i}@example.com", "555-0100", f"https://drive.example/{i}"]
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_local_store_dedupes_by_email(tmp_path):
+    store = SQLiteApplicantStore(str(tmp_path / "applicants.sqlite3"))
+    assert store.add(row(1))
+    assert not store.add(["Someone Else", "applicant1@example.com", "", ""])
+    assert store.contains_email("applicant1@example.com")
+    assert not store.contains_email("applicant2@example.com")
+    assert store.to_dataframe().values.tolist() == [row(1)]
+    store.close()
+
+
+def test_version_and_sync_track_inserts(tmp_path):
+    store = SQLiteApplicantStore(str(tmp_path / "applicants.sqlite3"))
+    assert store.sync()
+    assert not store.sync()
+    store.add(row(1))
+    assert store.sync()
+    assert store.version == 1
+    store.close()
+
+
+def test_adds_and_lookups_never_read_the_sheet(tmp_path, fake_sheet):
+    fake_sheet.rows = [list(HEADERS), row(0)]
+    mirror = BatchedSheetWriter(fake_sheet, flush_interval=0)
+    store = SQLiteApplicantStore(str(tmp_path / "applicants.sqlite3"), mirror=mirror, mirror_interval=60)
+    assert wait_for(lambda: store.seeded)
+    reads = fake_sheet.reads
+
+    assert store.contains_email("applicant0@example.com")  # seeded from the sheet
+    assert not store.add(row(0))
+    for i in range(1, 20):
+        assert store.add(row(i))
+        assert store.contains_email(f"applicant{i}@example.com")
+    assert fake_sheet.reads == reads
+    store.close()
+
+    assert [r[1] for r in fake_sheet.rows[1:]] == [f"applicant{i}@example.com" for i in range(20)]
+
+
+def test_seeding_happens_once_per_store(tmp_path, fake_sheet):
+    path = str(tmp_path / "applicants.sqlite3")
+    fake_sheet.rows = [list(HEADERS), row(0)]
+    store = SQLiteApplicantStore(path, mirror=BatchedSheetWriter(fake_sheet, flush_interval=0))
+    assert wait_for(lambda: store.seeded)
+    store.close()
+
+    fake_sheet.reads = 0
+    reopened = SQLiteApplicantStore(path, mirror=BatchedSheetWriter(fake_sheet, flush_interval=0), mirror_interval=60)
+    assert reopened.contains_email("applicant0@example.com")
+    reopened.close()
+    assert fake_sheet.reads == 0  # nothing pending, so the mirror never opened the sheet
+
+
+def test_intake_continues_while_sheets_is_down(tmp_path, fake_sheet):
+    fake_sheet.fail = RuntimeError("429 quota exceeded")
+    store = SQLiteApplicantStore(str(tmp_path / "applicants.sqlite3"),
+                                 mirror=BatchedSheetWriter(fake_sheet, flush_interval=0), mirror_interval=60)
+    for i in range(5):
+        assert store.add(row(i))
+    assert store.pending() == 5
+    store.close()  # the final mirror attempt fails, rows stay pending
+    assert fake_sheet.rows[1:] == []
+
+    fake_sheet.fail = None
+    reopened = SQLiteApplicantStore(str(tmp_path / "applicants.sqlite3"),
+                                    mirror=BatchedSheetWriter(fake_sheet, flush_interval=0), mirror_interval=60)
+    assert wait_for(lambda: reopened.pending() == 0)
+    reopened.close()
+    assert len(fake_sheet.rows) == 6
+
+
+def test_local_blob_store_is_content_addressed(tmp_path):
+    source = tmp_path / "resume.pdf"
+    source.write_bytes(b"%PDF-1.4 resume")
+    store = LocalBlobStore(tmp_path / "blobs")
+
+    assert store.lookup("ab" * 32) is None
+    stored = store.put(str(source), "ab" * 32)
+    assert stored == store.lookup("ab" * 32)
+    assert stored["webViewLink"].startswith("file://")
+    assert (tmp_path / "blobs" / "ab" / f"{'ab' * 32}.pdf").read_bytes() == b"%PDF-1.4 resume"
+    assert store.lookup_many(["ab" * 32, "cd" * 32]) == {"ab" * 32: stored, "cd" * 32: None}